@@ -0,0 +1,197 @@
+# admission.py
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, g, jsonify, request, session
+
+
+# =============================================================================
+# ADMISSION CONTROL FOR EXPENSIVE ENDPOINTS
+# =============================================================================
+# A few endpoints can hold a worker thread for a long time: the estimator
+# (scoring every sold property, and possibly a rate-limited Nominatim lookup)
+# and the owner's property list (one query per property and interested
+# developer). A burst on them would take every thread of a worker and make
+# cheap requests such as /api/property/<id> wait behind them.
+#
+# Each endpoint in ADMISSION_POLICIES gets two limits:
+# - Rate limit per session (or per client address when not logged in): a
+#   token bucket refilled at `rate` requests per second, holding at most
+#   `burst`. Requests without a token are answered 429.
+# - Concurrency limit per worker process: at most `concurrency` requests of
+#   the endpoint run at the same time. Up to `queue` more wait for a slot
+#   for at most `queue_timeout` seconds. When the queue is full, or a slot
+#   does not come free in time, the request is answered 503.
+# Both responses carry a Retry-After header. The remaining threads always
+# stay available to the other routes.
+#
+# Set ADMISSION=off to disable the limits (e.g. for load tests of the
+# endpoints themselves).
+
+ADMISSION_POLICIES = {
+    'routes.api_estimate_price': {
+        'concurrency': 4, 'queue': 8, 'queue_timeout': 2.0, 'rate': 1.0, 'burst': 10,
+    },
+    'routes.get_my_properties': {
+        'concurrency': 4, 'queue': 8, 'queue_timeout': 2.0, 'rate': 2.0, 'burst': 10,
+    },
+}
+
+# Buckets of clients not seen for a while are dropped beyond this many
+MAX_RATE_LIMIT_KEYS = 10000
+
+
+class ConcurrencyLimiter:
+    """At most `limit` holders at a time, with a bounded queue of waiters"""
+
+    def __init__(self, name, limit, queue_size, queue_timeout, clock=time.monotonic):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+
+    def acquire(self) -> bool:
+        """
+        Take a slot, waiting for at most queue_timeout when all are taken.
+
+        Returns:
+            True when a slot was taken (call release() afterwards), False when
+            the queue was full or no slot came free in time
+        """
+        with self._condition:
+            # Newcomers queue behind existing waiters
+            if self._active < self.limit and self._waiting == 0:
+                self._active += 1
+                return True
+            if self._waiting >= self.queue_size:
+                return False
+
+            self._waiting += 1
+            try:
+                deadline = self._clock() + self.queue_timeout
+                while self._active >= self.limit:
+                    remaining = deadline - self._clock()
+                    if remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+                self._active += 1
+                return True
+            finally:
+                self._waiting -= 1
+
+    def release(self):
+        with self._condition:
+            self._active -= 1
+            self._condition.notify()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+
+class TokenBuckets:
+    """Token bucket rate limit per key (session or client address)"""
+
+    def __init__(self, rate, burst, max_keys=MAX_RATE_LIMIT_KEYS, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()  # key -> (tokens, updated), least recently used first
+
+    def take(self, key) -> float:
+        """
+        Take one token from the bucket of key.
+
+        Returns:
+            0 when the request may go ahead, otherwise the seconds until the
+            next token
+        """
+        now = self._clock()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class AdmissionPolicy:
+    """The rate limit and concurrency limit of one endpoint"""
+
+    def __init__(self, endpoint, concurrency, queue, queue_timeout, rate, burst):
+        self.limiter = ConcurrencyLimiter(endpoint, concurrency, queue, queue_timeout)
+        self.buckets = TokenBuckets(rate, burst)
+
+
+# =============================================================================
+# FLASK INTEGRATION
+# =============================================================================
+
+def _client_key():
+    """Rate limit key: the logged-in user, otherwise the client address"""
+    user_id = session.get('user_id')
+    if user_id is not None:
+        return f"{session.get('user_type')}:{user_id}"
+    return f"addr:{request.remote_addr}"
+
+
+def _reject(status, message, retry_after):
+    response = jsonify({"success": False, "error": message})
+    response.status_code = status
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def _admit():
+    """before_request hook: apply the endpoint's rate and concurrency limits"""
+    policy = current_app.extensions['admission_policies'].get(request.endpoint)
+    if policy is None:
+        return None
+
+    wait = policy.buckets.take(_client_key())
+    if wait > 0:
+        return _reject(429, "Too many requests. Please slow down and try again shortly.", wait)
+
+    if not policy.limiter.acquire():
+        print(f"[ADMISSION] {request.endpoint}: shed request "
+              f"({policy.limiter.active} running, {policy.limiter.waiting} waiting)")
+        return _reject(503, "The server is busy. Please try again shortly.", policy.limiter.queue_timeout)
+    g.admission_slot = policy.limiter
+    return None
+
+
+def _release(error=None):
+    limiter = g.pop('admission_slot', None)
+    if limiter is not None:
+        limiter.release()
+
+
+def init_admission(app):
+    """Limit the endpoints of ADMISSION_POLICIES (disable with ADMISSION=off)"""
+    if os.getenv('ADMISSION', 'on').lower() in ('0', 'off', 'false', 'no'):
+        return
+
+    app.extensions['admission_policies'] = {
+        endpoint: AdmissionPolicy(endpoint, **settings) for endpoint, settings in ADMISSION_POLICIES.items()
+    }
+    app.before_request(_admit)
+    app.teardown_request(_release)
+    print(f"[ADMISSION] Limiting {', '.join(sorted(ADMISSION_POLICIES))}")
@@ -14,6 +14,27 @@ app.secret_key = os.getenv('SECRET_KEY', secrets.token_hex(16))  # Add secret ke
 from routes import routes
 app.register_blueprint(routes)
 
+# Optional API request capture for load testing (enabled via REQUEST_LOG_PATH)
+from request_log import init_request_log
+init_request_log(app)
+
+# gzip/brotli response compression
+from compression import init_compression
+init_compression(app)
+
+# Fingerprinted static URLs (asset_url() in templates) with immutable caching
+from static_assets import init_static_assets
+init_static_assets(app)
+
+# Rate and concurrency limits for the expensive endpoints (before the Supabase deadline starts)
+from admission import init_admission
+init_admission(app)
+
+# Supabase deadline per request, and 503 + Retry-After while Supabase is unavailable
+# (registered last: its after_request hook runs first, before compression and the request log)
+from resilience import init_resilience
+init_resilience(app)
+
 if __name__ == '__main__':
     app.run(debug=True)
     
\ No newline at end of file
@@ -0,0 +1,118 @@
+# benchmarks/fixtures.py
+import json
+import random
+
+
+# =============================================================================
+# DETERMINISTIC BENCHMARK DATASET
+# =============================================================================
+# Generates a synthetic but realistic GroundLink dataset for the local data
+# stand-in (see local_db.py). The same seed always produces the same rows, so
+# timings are comparable between runs.
+
+# Cities that get sold properties (all present in BELGIAN_CITIES / CITY_TO_PROVINCE)
+DATA_CITIES = [
+    ("gent", "Oost-Vlaanderen"), ("aalst", "Oost-Vlaanderen"), ("sint-niklaas", "Oost-Vlaanderen"),
+    ("antwerpen", "Antwerpen"), ("mechelen", "Antwerpen"), ("turnhout", "Antwerpen"),
+    ("leuven", "Vlaams-Brabant"), ("vilvoorde", "Vlaams-Brabant"), ("halle", "Vlaams-Brabant"),
+    ("brugge", "West-Vlaanderen"), ("kortrijk", "West-Vlaanderen"), ("oostende", "West-Vlaanderen"),
+    ("hasselt", "Limburg"), ("genk", "Limburg"), ("brussel", "Brussel"),
+    ("namur", "Namen"), ("charleroi", "Henegouwen"), ("liège", "Luik"),
+    ("arlon", "Luxemburg"), ("wavre", "Waals-Brabant"),
+]
+
+# A city in BELGIAN_CITIES without any sold data (forces the smart fallback)
+FALLBACK_TARGET = ("merelbeke", "Oost-Vlaanderen")
+
+# Listing descriptions are combined from these (by index, so the random
+# stream and all other columns stay the same) for the text search
+DESCRIPTION_FEATURES = [
+    "Corner plot", "Quiet building plot", "Agricultural land", "Plot with old farmhouse",
+    "Wooded plot", "Building land near the centre", "Former industrial site",
+]
+DESCRIPTION_DETAILS = [
+    "with agricultural zoning", "in a residential area", "close to the motorway",
+    "with a view over the fields", "suitable for two semi-detached houses",
+]
+
+OWNER_ID = 10000001
+DEVELOPER_ID = 20000001
+
+
+def build_dataset(sold_count: int = 2000, unsold_count: int = 1000, seed: int = 24) -> dict:
+    """
+    Build the table dictionary used by LocalSupabase.
+
+    Args:
+        sold_count: Number of sold properties with a final price
+        unsold_count: Number of listed (unsold) properties
+        seed: Random seed for reproducible data
+
+    Returns:
+        Dictionary mapping table names to lists of rows
+    """
+    rng = random.Random(seed)
+    properties = []
+
+    for i in range(sold_count + unsold_count):
+        city, province = DATA_CITIES[i % len(DATA_CITIES)]
+        sold = i < sold_count
+        size = rng.randint(150, 5000)
+        price_per_m2 = rng.uniform(80, 900)
+        price_min = round(size * price_per_m2 * 0.9, -3)
+        properties.append({
+            "property_id": 30000000 + i,
+            "property_name": f"Plot {i}",
+            "size": size,
+            "description": f"{DESCRIPTION_FEATURES[i % 7]} {DESCRIPTION_DETAILS[(i // 7) % 5]}",
+            "province": province,
+            "city": city.title() if i % 3 == 0 else city,
+            "city_key": city,
+            "propertyOwner_id": OWNER_ID if i % 50 == 0 else OWNER_ID + 1 + (i % 40),
+            "image_urls": [],
+            "type": rng.choice(["land", "building", "land"]),
+            "price_min": price_min,
+            "price_max": round(price_min * 1.2, -3),
+            "sold": sold,
+            "final_price": round(size * price_per_m2, 2) if sold else None,
+        })
+
+    developers = [{
+        "developer_id": DEVELOPER_ID + i,
+        "first_name": f"Dev{i}",
+        "last_name": "Bench",
+        "email": f"dev{i}@example.com",
+        "phone_number": f"+3247000{i:04d}",
+        "company_name": f"Bench Development {i}",
+        "VAT_number": f"BE0{i:09d}",
+        "verified": True,
+    } for i in range(20)]
+
+    owners = [{
+        "propertyOwner_id": OWNER_ID + i,
+        "first_name": f"Owner{i}",
+        "last_name": "Bench",
+        "email": f"owner{i}@example.com",
+        "phone_number": f"+3248000{i:04d}",
+    } for i in range(41)]
+
+    owned_ids = [p["property_id"] for p in properties if p["propertyOwner_id"] == OWNER_ID]
+    interests = [
+        {"property_id": property_id, "developer_id": DEVELOPER_ID + ((j + k) % 20)}
+        for j, property_id in enumerate(owned_ids)
+        for k in range(3)
+    ]
+
+    return {
+        "Property": properties,
+        "Developer": developers,
+        "Property owner": owners,
+        "Property_Interest": interests,
+    }
+
+
+def write_dataset(path: str, **kwargs) -> str:
+    """Write the dataset to a JSON file and return the path"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(build_dataset(**kwargs), f)
+    return path
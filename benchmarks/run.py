@@ -0,0 +1,432 @@
+# benchmarks/run.py
+"""
+Benchmark suite for the core algorithms and the main API routes.
+
+Runs every benchmark against the local data stand-in (local_db.py) filled with
+a deterministic dataset, then compares timings and memory peaks with
+benchmarks/baseline.json. Timings are compared on the fastest iteration, which
+is far less sensitive to machine noise than the median, relative to a fixed
+calibration workload timed next to each benchmark: on shared or virtual
+machines the speed of the whole machine changes over time. The baseline
+keeps the median of BASELINE_RUNS measurements, so one lucky run does not set
+it; a benchmark over the limit is measured again (CONFIRM_RUNS times at most)
+and only reported when it stays over. Exits with status 1 when a benchmark
+regresses by more than the allowed percentage.
+
+Usage (from the project root):
+    python -m benchmarks.run                     # compare against the baseline
+    python -m benchmarks.run --update-baseline   # record new baseline values
+    python -m benchmarks.run --only estimate     # run matching benchmarks only
+    python -m benchmarks.run --threshold 30      # override the allowed regression (%)
+"""
+import argparse
+import contextlib
+import gc
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.fixtures import write_dataset, DATA_CITIES, FALLBACK_TARGET, OWNER_ID, DEVELOPER_ID
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Allowed regression before a benchmark fails (percent)
+DEFAULT_THRESHOLD_PCT = 25.0
+
+# Timing differences below this are treated as noise (milliseconds)
+MIN_TIME_DELTA_MS = 0.05
+
+# Memory differences below this are treated as noise (KiB)
+MIN_MEMORY_DELTA_KB = 16.0
+
+# Extra measurements of a benchmark over the limit: a short slowdown of the
+# machine (other processes, CPU frequency) is gone by then, a regression is not
+CONFIRM_RUNS = 2
+
+# Measurements per benchmark when recording the baseline (the median one is kept)
+BASELINE_RUNS = 3
+
+
+class Benchmark:
+    """
+    A single benchmark case.
+
+    Args:
+        name: Unique name used as key in the baseline file
+        func: Callable that performs the measured work
+        repeat: Number of timed iterations
+        setup: Optional callable run before every iteration (not timed)
+    """
+
+    def __init__(self, name, func, repeat=20, setup=None):
+        self.name = name
+        self.func = func
+        self.repeat = repeat
+        self.setup = setup
+
+
+# =============================================================================
+# ENVIRONMENT SETUP
+# =============================================================================
+
+def load_app(data_path):
+    """Point the app at the local data stand-in and import it"""
+    os.environ['SUPABASE_LOCAL_DATA'] = data_path
+    os.environ.setdefault('SECRET_KEY', 'benchmark-secret')
+    # The limited endpoints are called back to back from one session (see admission.py)
+    os.environ.setdefault('ADMISSION', 'off')
+
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        import app as app_module
+        import models
+
+    app_module.app.config['TESTING'] = True
+    return app_module.app, models
+
+
+def login(client, user_type, user_id):
+    """Put a logged-in user in the test client's session"""
+    with client.session_transaction() as sess:
+        sess['user_id'] = user_id
+        sess['user_type'] = user_type
+        sess['user_data'] = {'first_name': 'Bench', 'last_name': 'User'}
+
+
+# =============================================================================
+# BENCHMARK DEFINITIONS
+# =============================================================================
+
+def build_benchmarks(app, models):
+    """Create the list of benchmark cases"""
+    data_city, data_province = DATA_CITIES[0]
+    target_city, target_province = FALLBACK_TARGET
+
+    rng = random.Random(7)
+    coordinates = list(models.BELGIAN_CITIES.values())
+    pairs = [(rng.choice(coordinates), rng.choice(coordinates)) for _ in range(10000)]
+
+    def haversine_pairs():
+        for (lat1, lon1), (lat2, lon2) in pairs:
+            models.haversine_distance(lat1, lon1, lat2, lon2)
+
+    # 10,000 saved searches over province, type, size, price and city filters
+    search_rng = random.Random(11)
+    provinces = [province.value for province in models.Province]
+    saved_searches = models.SavedSearchIndex()
+    for search_id in range(1, 10001):
+        params = {}
+        if search_rng.random() < 0.5:
+            params['province'] = search_rng.choice(provinces)
+        if search_rng.random() < 0.5:
+            params['type'] = search_rng.choice(['land', 'building'])
+        if search_rng.random() < 0.2:
+            params['city'] = search_rng.choice(DATA_CITIES)[0]
+        if search_rng.random() < 0.6:
+            params['min_size'] = search_rng.randint(100, 5000)
+        if search_rng.random() < 0.6:
+            params['max_price'] = search_rng.randint(50000, 2000000)
+        filters, _ = models.parse_listing_filters(params)
+        saved_searches.add({'saved_search_id': search_id, 'developer_id': DEVELOPER_ID, 'filters': filters})
+    new_listings = models.fetch_unsold_rows()[:100]
+
+    def match_new_listings():
+        for row in new_listings:
+            saved_searches.match(row)
+
+    # One page of listings in the in-process and the SQLite cache backend
+    from cache_backends import Cache, MemoryBackend, SQLiteBackend
+    listing_page = models.fetch_unsold_rows()[:50]
+    memory_cache = Cache('bench', MemoryBackend(16))
+    memory_cache.set('page', listing_page)
+    sqlite_cache = Cache('bench', SQLiteBackend(
+        os.path.join(tempfile.mkdtemp(prefix='groundlink-bench-cache-'), 'cache.sqlite3')
+    ))
+    sqlite_cache.set('page', listing_page)
+
+    owner_client = app.test_client()
+    login(owner_client, 'property_owner', OWNER_ID)
+
+    developer_client = app.test_client()
+    login(developer_client, 'developer', DEVELOPER_ID)
+
+    anonymous_client = app.test_client()
+
+    def expect_ok(response):
+        if response.status_code != 200:
+            raise RuntimeError(f"Unexpected status {response.status_code}: {response.get_data(as_text=True)[:200]}")
+        return response
+
+    return [
+        Benchmark('estimate_price_same_city', lambda: models.estimate_property_price({
+            'province': data_province, 'city': data_city, 'type': 'land', 'size': 1200
+        })),
+        Benchmark('estimate_price_fallback', lambda: models.estimate_property_price({
+            'province': target_province, 'city': target_city, 'type': 'land', 'size': 1200
+        })),
+        Benchmark('estimate_price_cached_hit', lambda: models.estimate_property_price_cached({
+            'province': data_province, 'city': data_city, 'type': 'land', 'size': 1210
+        }), repeat=200),
+        Benchmark('estimate_price_cached_miss', lambda: models.estimate_property_price_cached({
+            'province': data_province, 'city': data_city, 'type': 'land', 'size': 1210
+        }), setup=models.bump_dataset_version),
+        Benchmark('find_nearest_city_with_data', lambda: models.find_nearest_city_with_data(
+            target_city, target_province, 'land', 2
+        )),
+        Benchmark('haversine_10k_pairs', haversine_pairs, repeat=10),
+        Benchmark('sold_aggregates_rebuild', lambda: models.load_sold_aggregates(force=True)),
+        Benchmark('listing_index_rebuild', lambda: models.load_listing_index(force=True)),
+        Benchmark('listing_index_query_filtered', lambda: models.load_listing_index().query(
+            province='Oost-Vlaanderen', property_type='land', min_size=500, max_price=900000
+        ), repeat=200),
+        Benchmark('listing_index_facets', lambda: models.load_listing_index().facets(
+            province='Oost-Vlaanderen', min_size=500
+        ), repeat=200),
+        Benchmark('saved_search_match_100_listings', match_new_listings),
+        Benchmark('route_validate_city', lambda: expect_ok(anonymous_client.post(
+            '/api/validate-city', json={'city': 'Gent', 'province': 'Oost-Vlaanderen'}
+        )), repeat=200),
+        Benchmark('route_validate_city_unknown', lambda: expect_ok(anonymous_client.post(
+            '/api/validate-city', json={'city': 'Atlantis', 'province': 'Oost-Vlaanderen'}
+        )), repeat=200),
+        Benchmark('route_properties_all', lambda: expect_ok(developer_client.get('/api/properties'))),
+        Benchmark('route_properties_all_gzip', lambda: expect_ok(developer_client.get(
+            '/api/properties', headers={'Accept-Encoding': 'gzip'}
+        )).get_data()),
+        Benchmark('route_property_facets', lambda: expect_ok(developer_client.get(
+            '/api/properties/facets?province=Oost-Vlaanderen&type=land'
+        )), repeat=200),
+        Benchmark('route_properties_filtered', lambda: expect_ok(developer_client.get(
+            '/api/properties?province=Oost-Vlaanderen&type=land&min_size=500&max_price=900000'
+        ))),
+        Benchmark('route_properties_city', lambda: expect_ok(developer_client.get('/api/properties?city=gen'))),
+        Benchmark('route_properties_near_city', lambda: expect_ok(developer_client.get(
+            '/api/properties?near_city=Gent&radius_km=20'
+        ))),
+        Benchmark('route_properties_search', lambda: expect_ok(developer_client.get(
+            '/api/properties?q=corner+plot&limit=20'
+        ))),
+        Benchmark('route_properties_all_uncached', lambda: expect_ok(developer_client.get('/api/properties')),
+                  setup=models.purge_listing_cache),
+        Benchmark('route_properties_search_uncached', lambda: expect_ok(developer_client.get(
+            '/api/properties?q=corner+plot&limit=20'
+        )), setup=models.purge_listing_cache),
+        Benchmark('cache_memory_get_page', lambda: memory_cache.get('page'), repeat=200),
+        Benchmark('cache_sqlite_get_page', lambda: sqlite_cache.get('page'), repeat=200),
+        Benchmark('cache_sqlite_set_page', lambda: sqlite_cache.set('page', listing_page), repeat=50),
+        Benchmark('cities_within_radius_20km', lambda: models.cities_within_radius('Gent', 20), repeat=200),
+        Benchmark('canonical_city_alias', lambda: models.canonical_city('Rhode-Saint-Genese'), repeat=1000),
+        Benchmark('geocode_city_alias', lambda: models.get_city_coordinates('Kessel-Lo'), repeat=200),
+        Benchmark('suggest_cities_prefix', lambda: models.suggest_cities('sint n'), repeat=1000),
+        Benchmark('suggest_cities_typo', lambda: models.suggest_cities('kortrjik'), repeat=200),
+        Benchmark('route_cities_suggest', lambda: expect_ok(anonymous_client.get('/api/cities/suggest?q=oudenarde')),
+                  repeat=200),
+        Benchmark('route_property_detail', lambda: expect_ok(anonymous_client.get('/api/property/30000001')),
+                  repeat=200),
+        Benchmark('route_my_properties', lambda: expect_ok(owner_client.get('/api/my-properties'))),
+        Benchmark('route_estimate_price', lambda: expect_ok(owner_client.post('/api/estimate-price', json={
+            'province': data_province, 'city': data_city, 'type': 'land', 'size': 1200
+        }))),
+    ]
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+CALIBRATION_REPEAT = 5
+
+# Seconds of benchmark time between two calibration samples
+CALIBRATION_INTERVAL = 0.05
+
+
+def _calibration_workload():
+    counts = {}
+    for i in range(20000):
+        counts[i & 1023] = counts.get(i & 1023, 0) + i * 0.5
+    return counts
+
+
+def calibration_ms(repeat=CALIBRATION_REPEAT):
+    """Time of a fixed pure-Python workload (fastest of repeat runs): the current machine speed"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _calibration_workload()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def relative_time(result):
+    """Fastest iteration in calibration units (the raw time for baselines recorded without calibration)"""
+    return result['min_ms'] / result.get('calibration_ms', 1.0)
+
+
+def measure(benchmark):
+    """
+    Run a benchmark and return its timings (ms) and memory peak (KiB).
+
+    The memory peak is measured in a separate, untimed run because tracemalloc
+    slows down allocation-heavy code considerably. Like timeit, the garbage
+    collector is disabled while timing so that objects left behind by earlier
+    benchmarks do not distort the results.
+    """
+    devnull = open(os.devnull, 'w')
+    gc.collect()
+    with contextlib.redirect_stdout(devnull):
+        # Warm-up run (imports, lazy initialisation)
+        if benchmark.setup:
+            benchmark.setup()
+        benchmark.func()
+
+        timings = []
+        # Sampled all along the timed runs: the fastest iteration is compared
+        # with the fastest calibration of the same period
+        calibrations = [calibration_ms()]
+        next_calibration = time.perf_counter() + CALIBRATION_INTERVAL
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(benchmark.repeat):
+                if benchmark.setup:
+                    benchmark.setup()
+                start = time.perf_counter()
+                benchmark.func()
+                end = time.perf_counter()
+                timings.append((end - start) * 1000)
+                if end >= next_calibration:
+                    calibrations.append(calibration_ms(repeat=1))
+                    next_calibration = time.perf_counter() + CALIBRATION_INTERVAL
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        calibrations.append(calibration_ms())
+        calibration = min(calibrations)
+
+        if benchmark.setup:
+            benchmark.setup()
+        tracemalloc.start()
+        benchmark.func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    devnull.close()
+
+    return {
+        'min_ms': round(min(timings), 4),
+        'median_ms': round(statistics.median(timings), 4),
+        'p95_ms': round(sorted(timings)[max(0, math.ceil(len(timings) * 0.95) - 1)], 4),
+        'peak_kb': round(peak / 1024, 1),
+        'calibration_ms': round(calibration, 4),
+    }
+
+
+def best_of(first, second):
+    """Combine two measurements of a benchmark: the faster one, with the lower memory peak"""
+    best = dict(min(first, second, key=relative_time))
+    best['peak_kb'] = min(first['peak_kb'], second['peak_kb'])
+    return best
+
+
+def check_regression(name, current, baseline, threshold_pct):
+    """Return a list of human-readable regression messages for one benchmark"""
+    problems = []
+    limit = 1 + threshold_pct / 100
+
+    base_time = baseline.get('min_ms')
+    if base_time is not None:
+        if 'calibration_ms' in baseline:
+            # The baseline time at the machine speed of this measurement
+            base_time = relative_time(baseline) * current['calibration_ms']
+        if current['min_ms'] > base_time * limit and current['min_ms'] - base_time > MIN_TIME_DELTA_MS:
+            problems.append(f"{name}: {current['min_ms']:.3f}ms vs baseline {base_time:.3f}ms at the current machine speed")
+
+    base_peak = baseline.get('peak_kb')
+    if base_peak is not None:
+        if current['peak_kb'] > base_peak * limit and current['peak_kb'] - base_peak > MIN_MEMORY_DELTA_KB:
+            problems.append(f"{name}: peak {current['peak_kb']:.1f}KiB vs baseline {base_peak:.1f}KiB")
+
+    return problems
+
+
+def load_baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(results, threshold_pct):
+    baseline = load_baseline()
+    benchmarks = baseline.get('benchmarks', {})
+    benchmarks.update(results)
+    with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+        json.dump({
+            'threshold_pct': threshold_pct,
+            'python': sys.version.split()[0],
+            'benchmarks': dict(sorted(benchmarks.items())),
+        }, f, indent=2)
+        f.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GroundLink benchmark suite")
+    parser.add_argument('--update-baseline', action='store_true', help="store the results as the new baseline")
+    parser.add_argument('--only', default='', help="only run benchmarks whose name contains this text")
+    parser.add_argument('--threshold', type=float, default=None, help="allowed regression in percent")
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline()
+    threshold_pct = args.threshold if args.threshold is not None else baseline.get('threshold_pct', DEFAULT_THRESHOLD_PCT)
+
+    data_dir = tempfile.mkdtemp(prefix='groundlink-bench-')
+    app, models = load_app(write_dataset(os.path.join(data_dir, 'data.json')))
+
+    results = {}
+    regressions = []
+
+    print(f"{'benchmark':<32} {'min ms':>10} {'median ms':>10} {'p95 ms':>10} {'peak KiB':>10} {'baseline ms':>12}")
+    for benchmark in build_benchmarks(app, models):
+        if args.only and args.only not in benchmark.name:
+            continue
+
+        base = baseline.get('benchmarks', {}).get(benchmark.name, {})
+        if args.update_baseline:
+            runs = sorted((measure(benchmark) for _ in range(BASELINE_RUNS)), key=relative_time)
+            result = runs[len(runs) // 2]
+        else:
+            result = measure(benchmark)
+            for _ in range(CONFIRM_RUNS):
+                if not base or not check_regression(benchmark.name, result, base, threshold_pct):
+                    break
+                result = best_of(result, measure(benchmark))
+        results[benchmark.name] = result
+
+        base_ms = f"{base['min_ms']:.3f}" if 'min_ms' in base else '-'
+        print(f"{benchmark.name:<32} {result['min_ms']:>10.3f} {result['median_ms']:>10.3f} {result['p95_ms']:>10.3f} "
+              f"{result['peak_kb']:>10.1f} {base_ms:>12}")
+
+        if not args.update_baseline and base:
+            regressions.extend(check_regression(benchmark.name, result, base, threshold_pct))
+
+    if args.update_baseline:
+        save_baseline(results, threshold_pct)
+        print(f"\nBaseline written to {BASELINE_PATH}")
+        return 0
+
+    if regressions:
+        print(f"\nREGRESSIONS (> {threshold_pct:.0f}% over baseline):")
+        for problem in regressions:
+            print(f"  - {problem}")
+        return 1
+
+    print(f"\nAll benchmarks within {threshold_pct:.0f}% of baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,456 @@
+# cache_backends.py
+import json
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+from resilience import CircuitBreaker, CircuitOpen
+
+
+# =============================================================================
+# CACHE BACKENDS SHARED ACROSS WORKERS
+# =============================================================================
+# Every gunicorn worker used to keep its own caches, so N workers meant N cold
+# caches and N copies in memory. A Cache stores its entries in a backend
+# chosen with CACHE_BACKEND:
+# - memory:        in-process LRU (the default; nothing is shared)
+# - sqlite:        a SQLite database in WAL mode (CACHE_SQLITE_PATH), shared by
+#                  the workers of one machine
+# - redis:         a Redis-protocol server (CACHE_REDIS_URL), shared by every
+#                  machine; scripts/resp_server.py is a local stand-in
+# - memory+sqlite, memory+redis: two tiers, an in-process LRU in front of the
+#                  shared backend
+#
+# Values must be JSON types (dict with string keys, list, str, int, float,
+# bool, None): the shared backends store them as compact JSON (encode()), so
+# they come back the same whatever the backend. The in-process LRU keeps the
+# object itself without copying it: callers must treat values as read-only.
+#
+# Invalidation uses a generation counter per cache, kept in the backend. Keys
+# include the generation, so invalidate() makes every worker miss on its next
+# read; workers re-read the counter of a shared backend at most every
+# INVALIDATION_CHECK_INTERVAL seconds. Entries of old generations are never
+# read again and expire (memory: LRU eviction, sqlite: deleted, redis: TTL).
+#
+# A failing shared backend never fails a request: reads count as misses and
+# writes are dropped (logged with [CACHE]). After a few failures in a row a
+# circuit breaker (see resilience.py) skips it for a while, so an unreachable
+# server does not cost a timeout per call.
+
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory').lower()
+CACHE_SQLITE_PATH = os.getenv('CACHE_SQLITE_PATH', os.path.join(tempfile.gettempdir(), 'groundlink-cache.sqlite3'))
+CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://127.0.0.1:6379/0')
+CACHE_TIMEOUT = float(os.getenv('CACHE_TIMEOUT', '0.5'))  # seconds per shared backend call
+
+INVALIDATION_CHECK_INTERVAL = 1.0  # seconds
+DEFAULT_TTL = 24 * 3600            # seconds, for entries of shared backends
+SQLITE_CLEANUP_EVERY = 1000        # writes between deletions of expired entries
+
+
+def encode(value) -> bytes:
+    """Serialize a cache value (JSON types only)"""
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False, allow_nan=False).encode('utf-8')
+
+
+def decode(data: bytes):
+    return json.loads(data)
+
+
+# =============================================================================
+# BACKENDS
+# =============================================================================
+# get() returns None for a missing or expired entry; values are never None
+# (Cache stores None as a miss).
+
+class MemoryBackend:
+    """In-process LRU"""
+
+    shared = False
+
+    def __init__(self, max_entries, clock=time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, expires_at), least recently used first
+        self._counters = {}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] is not None and entry[1] <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, ttl=None):
+        expires_at = None if ttl is None else self._clock() + ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def counter(self, name) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def incr(self, name) -> int:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + 1
+            return self._counters[name]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SharedBackend:
+    """Base of the backends shared between processes: calls go through a circuit breaker"""
+
+    shared = True
+
+    def __init__(self, name):
+        self.breaker = CircuitBreaker(f"cache {name}")
+
+    def _guarded(self, function):
+        """
+        Run function() (one call to the backend) unless the circuit is open.
+
+        Raises:
+            CircuitOpen without calling function; otherwise its error
+        """
+        self.breaker.before_call()
+        try:
+            result = function()
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return result
+
+
+class SQLiteBackend(SharedBackend):
+    """Entries in a SQLite database in WAL mode, shared by the processes of one machine"""
+
+    def __init__(self, path, timeout=CACHE_TIMEOUT, clock=time.time):
+        super().__init__('sqlite')
+        self.path = path
+        self.timeout = timeout
+        self._clock = clock
+        self._local = threading.local()  # one connection per thread
+        self._writes = 0
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache_counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _execute(self, sql, parameters=()):
+        return self._guarded(lambda: self._connection().execute(sql, parameters).fetchone())
+
+    def get(self, key):
+        row = self._execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, self._clock()),
+        )
+        return None if row is None else decode(row[0])
+
+    def set(self, key, value, ttl=None):
+        expires_at = None if ttl is None else self._clock() + ttl
+        self._execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, encode(value), expires_at),
+        )
+        self._writes += 1
+        if self._writes % SQLITE_CLEANUP_EVERY == 0:
+            self._execute("DELETE FROM cache_entries WHERE expires_at <= ?", (self._clock(),))
+
+    def counter(self, name) -> int:
+        row = self._execute("SELECT value FROM cache_counters WHERE name = ?", (name,))
+        return 0 if row is None else row[0]
+
+    def incr(self, name) -> int:
+        return self._execute(
+            "INSERT INTO cache_counters (name, value) VALUES (?, 1) "
+            "ON CONFLICT (name) DO UPDATE SET value = value + 1 RETURNING value",
+            (name,),
+        )[0]
+
+
+class RedisError(Exception):
+    """Error reply of a Redis-protocol server"""
+
+
+class RedisBackend(SharedBackend):
+    """Entries in a Redis-protocol server (RESP2 over TCP, no client library needed)"""
+
+    def __init__(self, url, timeout=CACHE_TIMEOUT):
+        super().__init__('redis')
+        parsed = urlparse(url)
+        self.host = parsed.hostname or '127.0.0.1'
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.strip('/') or 0)
+        self.password = parsed.password
+        self.timeout = timeout
+        self._local = threading.local()  # one connection per thread
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._local.sock = sock
+        self._local.reader = sock.makefile('rb')
+        try:
+            if self.password:
+                self._command_on_connection('AUTH', self.password)
+            if self.db:
+                self._command_on_connection('SELECT', self.db)
+        except Exception:
+            self._close()
+            raise
+
+    def command(self, *args):
+        """Send one command and return its reply (the connection is closed after I/O errors)"""
+        return self._guarded(lambda: self._command(*args))
+
+    def _command(self, *args):
+        if getattr(self._local, 'sock', None) is None:
+            self._connect()
+        try:
+            return self._command_on_connection(*args)
+        except (OSError, ValueError):
+            self._close()
+            raise
+
+    def _command_on_connection(self, *args):
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode('utf-8')
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._local.sock.sendall(b''.join(parts))
+        return self._read_reply()
+
+    def _read_reply(self):
+        line = self._local.reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by the cache server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b'+':
+            return payload.decode()
+        if kind == b'-':
+            raise RedisError(payload.decode())
+        if kind == b':':
+            return int(payload)
+        if kind == b'$':
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._local.reader.read(length + 2)
+            return data[:-2]
+        if kind == b'*':
+            count = int(payload)
+            return None if count < 0 else [self._read_reply() for _ in range(count)]
+        raise ValueError(f"Unexpected reply from the cache server: {line!r}")
+
+    def _close(self):
+        sock = getattr(self._local, 'sock', None)
+        self._local.sock = None
+        if sock is not None:
+            sock.close()
+
+    def get(self, key):
+        data = self.command('GET', key)
+        return None if data is None else decode(data)
+
+    def set(self, key, value, ttl=None):
+        if ttl is None:
+            self.command('SET', key, encode(value))
+        else:
+            self.command('SET', key, encode(value), 'PX', max(1, int(ttl * 1000)))
+
+    def counter(self, name) -> int:
+        return int(self.command('GET', name) or 0)
+
+    def incr(self, name) -> int:
+        return self.command('INCR', name)
+
+
+class TieredBackend:
+    """An in-process LRU in front of a shared backend"""
+
+    shared = True
+
+    def __init__(self, local, remote):
+        self.local = local
+        self.remote = remote
+
+    def get(self, key):
+        value = self.local.get(key)
+        if value is None:
+            value = self.remote.get(key)
+            if value is not None:
+                self.local.set(key, value)
+        return value
+
+    def set(self, key, value, ttl=None):
+        self.local.set(key, value, ttl)
+        self.remote.set(key, value, ttl)
+
+    def counter(self, name) -> int:
+        return self.remote.counter(name)
+
+    def incr(self, name) -> int:
+        return self.remote.incr(name)
+
+
+_shared_backends = {}
+_shared_backends_lock = threading.Lock()
+
+
+def _shared_backend(kind):
+    """The one SQLite or Redis backend of this process"""
+    with _shared_backends_lock:
+        if kind not in _shared_backends:
+            if kind == 'sqlite':
+                _shared_backends[kind] = SQLiteBackend(CACHE_SQLITE_PATH)
+            elif kind == 'redis':
+                _shared_backends[kind] = RedisBackend(CACHE_REDIS_URL)
+            else:
+                raise ValueError(f"Unknown CACHE_BACKEND: {CACHE_BACKEND}")
+        return _shared_backends[kind]
+
+
+def cache_backend(local_size, kind=None):
+    """
+    Backend for one cache, as configured by CACHE_BACKEND.
+
+    Args:
+        local_size: Maximum number of entries of the in-process LRU (tier)
+        kind: Overrides CACHE_BACKEND
+    """
+    kind = kind or CACHE_BACKEND
+    if kind == 'memory':
+        return MemoryBackend(local_size)
+    if kind.startswith('memory+'):
+        return TieredBackend(MemoryBackend(local_size), _shared_backend(kind[len('memory+'):]))
+    return _shared_backend(kind)
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+def _log_failure(name, message, error):
+    # An open circuit was logged when it opened
+    if not isinstance(error, CircuitOpen):
+        print(f"[CACHE] {name}: {message}: {type(error).__name__}: {error}")
+
+
+class Cache:
+    """One named cache (geocode, estimate, listings) in a backend, with generation-based invalidation"""
+
+    def __init__(self, name, backend, ttl=None):
+        """
+        Args:
+            name: Cache name, prefixed to every key in the backend
+            backend: Backend from cache_backend()
+            ttl: Seconds an entry stays valid (DEFAULT_TTL for shared
+                backends when None)
+        """
+        self.name = name
+        self.backend = backend
+        self.ttl = ttl if ttl is not None or not backend.shared else DEFAULT_TTL
+        self._counter_name = f"{name}:generation"
+        self._lock = threading.Lock()
+        self._generation = None
+        self._generation_checked = 0.0
+
+    @property
+    def shared(self) -> bool:
+        return self.backend.shared
+
+    def _key(self, key, generation):
+        return f"{self.name}:{generation}:{json.dumps(key, separators=(',', ':'), ensure_ascii=False)}"
+
+    def generation(self) -> int:
+        """
+        Current generation; changes whenever any worker calls invalidate().
+
+        A shared backend is asked at most every INVALIDATION_CHECK_INTERVAL seconds.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._generation is not None and (
+                    not self.shared or now - self._generation_checked < INVALIDATION_CHECK_INTERVAL):
+                return self._generation
+        try:
+            generation = self.backend.counter(self._counter_name)
+        except Exception as e:
+            _log_failure(self.name, "could not read the generation", e)
+            generation = self._generation or 0
+        with self._lock:
+            self._generation, self._generation_checked = generation, now
+        return generation
+
+    def get(self, key, generation=None):
+        """
+        Cached value of key, or None on a miss.
+
+        Args:
+            key: JSON-serializable key (a string, number, list or tuple)
+            generation: Read the entry of this generation (default: current)
+        """
+        if generation is None:
+            generation = self.generation()
+        try:
+            return self.backend.get(self._key(key, generation))
+        except Exception as e:
+            _log_failure(self.name, "read failed, treating as a miss", e)
+            return None
+
+    def set(self, key, value, generation=None):
+        """
+        Store value (JSON types only) under key.
+
+        Args:
+            generation: Generation read before computing value; when the cache
+                was invalidated since, the entry is never read again
+        """
+        if value is None:
+            return
+        if generation is None:
+            generation = self.generation()
+        try:
+            self.backend.set(self._key(key, generation), value, self.ttl)
+        except Exception as e:
+            _log_failure(self.name, "write failed, not cached", e)
+
+    def invalidate(self) -> int:
+        """Make every entry of every worker unreachable and return the new generation"""
+        try:
+            generation = self.backend.incr(self._counter_name)
+        except Exception as e:
+            # Entries stay valid until they expire
+            _log_failure(self.name, "could not invalidate", e)
+            return self.generation()
+        with self._lock:
+            self._generation, self._generation_checked = generation, time.monotonic()
+        return generation
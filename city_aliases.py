@@ -0,0 +1,369 @@
+# city_aliases.py
+
+
+# =============================================================================
+# CITY NAME ALIASES
+# =============================================================================
+# Other names for the municipalities in BELGIAN_CITIES, mapped to their key:
+# - exonyms: the French, Dutch, German and English names of a municipality
+#   whose own name is in another language (Anvers, Lüttich, Hoei)
+# - the second official name of the bilingual municipalities (Bruxelles,
+#   Elsene / Ixelles, Bergen / Mons, Kelmis / La Calamine)
+# - sub-municipalities: the former municipalities merged into a larger one
+#   (Borgerhout, Marcinelle, Kessel-Lo), which people still use as addresses
+# - merged municipalities: the names from before the latest mergers
+#   (Puurs, Nevele, Meeuwen-Gruitrode)
+# - common alternative spellings (Sint-Vith, Tongres)
+#
+# Every municipality has one key, so its listings and sold data are grouped
+# under one name whatever name was typed: the name in the language of its
+# region (Liège, Mons, Ieper, Kelmis), and the Dutch name in the Brussels
+# Capital Region, like the province names. Accents, case, hyphens and
+# apostrophes do not matter here: names are folded before the lookup (see
+# canonical_city() in belgian_cities.py), so "Luttich" matches "lüttich".
+#
+# Only unambiguous names are listed. Sub-municipalities whose name is shared
+# by several places (Mariakerke, Berchem, Ruisbroek) and the exonyms that are
+# another municipality's name (Saint-Nicolas is both Sint-Niklaas in French
+# and a municipality near Liège) are left out: those keep their own key, or
+# fall back to geocoding.
+
+CITY_ALIASES = {
+    # ANTWERPEN
+    "anvers": "antwerpen",
+    "antwerp": "antwerpen",
+    "amberes": "antwerpen",
+    "borgerhout": "antwerpen",
+    "deurne": "antwerpen",
+    "merksem": "antwerpen",
+    "hoboken": "antwerpen",
+    "wilrijk": "antwerpen",
+    "ekeren": "antwerpen",
+    "berendrecht": "antwerpen",
+    "zandvliet": "antwerpen",
+    "lillo": "antwerpen",
+    "malines": "mechelen",
+    "mecheln": "mechelen",
+    "walem": "mechelen",
+    "muizen": "mechelen",
+    "hombeek": "mechelen",
+    "leest": "mechelen",
+    "heffen": "mechelen",
+    "lierre": "lier",
+    "koningshooikt": "lier",
+    "gheel": "geel",
+    "puurs": "puurs-sint-amands",
+    "sint-amands": "puurs-sint-amands",
+    "breendonk": "puurs-sint-amands",
+    "liezele": "puurs-sint-amands",
+    "burcht": "zwijndrecht",
+    "hoevenen": "stabroek",
+
+    # BRUSSEL
+    "bruxelles": "brussel",
+    "brussels": "brussel",
+    "ixelles": "elsene",
+    "auderghem": "oudergem",
+    "schaerbeek": "schaarbeek",
+    "berchem-sainte-agathe": "sint-agatha-berchem",
+    "saint-gilles": "sint-gillis",
+    "molenbeek-saint-jean": "sint-jans-molenbeek",
+    "saint-josse-ten-noode": "sint-joost-ten-node",
+    "woluwe-saint-lambert": "sint-lambrechts-woluwe",
+    "woluwe-saint-pierre": "sint-pieters-woluwe",
+    "uccle": "ukkel",
+    "forest": "vorst",
+    "watermael-boitsfort": "watermaal-bosvoorde",
+    "brussel-stad": "brussel",
+    "bruxelles-ville": "brussel",
+    "laken": "brussel",
+    "laeken": "brussel",
+    "neder-over-heembeek": "brussel",
+    "haren": "brussel",
+    "molenbeek": "sint-jans-molenbeek",
+    "sint-joost": "sint-joost-ten-node",
+    "saint-josse": "sint-joost-ten-node",
+    "bosvoorde": "watermaal-bosvoorde",
+    "boitsfort": "watermaal-bosvoorde",
+
+    # HENEGOUWEN
+    "aat": "ath",
+    "bergen": "mons",
+    "doornik": "tournai",
+    "zinnik": "soignies",
+    "edingen": "enghien",
+    "lessen": "lessines",
+    "'s-gravenbrakel": "braine-le-comte",
+    "moeskroen": "mouscron",
+    "komen-waasten": "comines-warneton",
+    "komen": "comines-warneton",
+    "waasten": "comines-warneton",
+    "comines": "comines-warneton",
+    "warneton": "comines-warneton",
+    "opzullik": "silly",
+    "elzele": "ellezelles",
+    "vloesberg": "flobecq",
+    "belœil": "beloeil",
+    "marcinelle": "charleroi",
+    "gosselies": "charleroi",
+    "jumet": "charleroi",
+    "gilly": "charleroi",
+    "montignies-sur-sambre": "charleroi",
+    "marchienne-au-pont": "charleroi",
+    "mont-sur-marchienne": "charleroi",
+    "couillet": "charleroi",
+    "dampremy": "charleroi",
+    "lodelinsart": "charleroi",
+    "ransart": "charleroi",
+    "roux": "charleroi",
+    "monceau-sur-sambre": "charleroi",
+    "goutroux": "charleroi",
+    "jemappes": "mons",
+    "cuesmes": "mons",
+    "nimy": "mons",
+    "obourg": "mons",
+    "ghlin": "mons",
+    "havré": "mons",
+    "houdeng-goegnies": "la louvière",
+    "haine-saint-pierre": "la louvière",
+    "strépy-bracquegnies": "la louvière",
+    "leuze": "leuze-en-hainaut",
+    "ham-sur-heure": "ham-sur-heure-nalinnes",
+    "nalinnes": "ham-sur-heure-nalinnes",
+    "sivry": "sivry-rance",
+    "herseaux": "mouscron",
+    "dottignies": "mouscron",
+    "luingne": "mouscron",
+    "frasnes": "frasnes-lez-anvaing",
+    "espierres-helchin": "spiere-helkijn",
+    "espierres": "spiere-helkijn",
+    "kluisberg": "mont-de-l'enclus",
+
+    # LIMBURG
+    "tongres": "tongeren",
+    "tongern": "tongeren",
+    "saint-trond": "sint-truiden",
+    "looz": "borgloon",
+    "fourons": "voeren",
+    "neerpelt": "pelt",
+    "overpelt": "pelt",
+    "meeuwen-gruitrode": "oudsbergen",
+    "opglabbeek": "oudsbergen",
+    "hamont": "hamont-achel",
+    "achel": "hamont-achel",
+    "dilsen": "dilsen-stokkem",
+    "stokkem": "dilsen-stokkem",
+    "houthalen": "houthalen-helchteren",
+    "helchteren": "houthalen-helchteren",
+    "hechtel": "hechtel-eksel",
+    "eksel": "hechtel-eksel",
+    "heusden": "heusden-zolder",
+    "zolder": "heusden-zolder",
+    "bourg-léopold": "leopoldsburg",
+    "eisden": "maasmechelen",
+
+    # LUIK
+    "luik": "liège",
+    "la calamine": "kelmis",
+    "lüttich": "liège",
+    "hoei": "huy",
+    "borgworm": "waremme",
+    "hannuit": "hannut",
+    "wezet": "visé",
+    "weismes": "waimes",
+    "bullange": "büllingen",
+    "amblève": "amel",
+    "blieberg": "plombières",
+    "saint-vith": "sankt vith",
+    "st. vith": "sankt vith",
+    "sint-vith": "sankt vith",
+    "angleur": "liège",
+    "chênée": "liège",
+    "grivegnée": "liège",
+    "jupille-sur-meuse": "liège",
+    "jupille": "liège",
+    "bressoux": "liège",
+    "wandre": "liège",
+    "glain": "liège",
+    "rocourt": "liège",
+    "ougrée": "seraing",
+    "boncelles": "seraing",
+    "jemeppe-sur-meuse": "seraing",
+    "vivegnis": "oupeye",
+    "hermalle-sous-argenteau": "oupeye",
+    "embourg": "chaudfontaine",
+    "vaux-sous-chèvremont": "chaudfontaine",
+    "heusy": "verviers",
+    "ensival": "verviers",
+    "stembert": "verviers",
+    "hombourg": "plombières",
+    "montzen": "plombières",
+    "hergenrath": "kelmis",
+    "neu-moresnet": "kelmis",
+    "elsenborn": "bütgenbach",
+    "robertville": "waimes",
+    "francorchamps": "stavelot",
+
+    # LUXEMBURG
+    "aarlen": "arlon",
+    "bastenaken": "bastogne",
+    "arel": "arlon",
+    "bastnach": "bastogne",
+    "athus": "aubange",
+    "libramont": "libramont-chevigny",
+    "marche": "marche-en-famenne",
+    "la roche": "la roche-en-ardenne",
+
+    # NAMEN
+    "namen": "namur",
+    "jambes": "namur",
+    "salzinnes": "namur",
+    "bouge": "namur",
+    "saint-servais": "namur",
+    "wépion": "namur",
+    "erpent": "namur",
+    "tamines": "sambreville",
+    "auvelais": "sambreville",
+
+    # OOST-VLAANDEREN
+    "gand": "gent",
+    "ghent": "gent",
+    "ledeberg": "gent",
+    "gentbrugge": "gent",
+    "sint-amandsberg": "gent",
+    "oostakker": "gent",
+    "wondelgem": "gent",
+    "drongen": "gent",
+    "zwijnaarde": "gent",
+    "sint-denijs-westrem": "gent",
+    "afsnee": "gent",
+    "alost": "aalst",
+    "termonde": "dendermonde",
+    "grammont": "geraardsbergen",
+    "renaix": "ronse",
+    "audenarde": "oudenaarde",
+    "waarschoot": "lievegem",
+    "zomergem": "lievegem",
+    "lovendegem": "lievegem",
+    "nevele": "deinze",
+    "knesselare": "aalter",
+    "kruishoutem": "kruisem",
+    "zingem": "kruisem",
+    "erpe": "erpe-mere",
+    "wortegem": "wortegem-petegem",
+    "sinaai": "sint-niklaas",
+    "belsele": "sint-niklaas",
+    "nieuwkerken-waas": "sint-niklaas",
+    "tamise": "temse",
+    "ertvelde": "evergem",
+
+    # VLAAMS-BRABANT
+    "louvain": "leuven",
+    "löwen": "leuven",
+    "kessel-lo": "leuven",
+    "heverlee": "leuven",
+    "wilsele": "leuven",
+    "wijgmaal": "leuven",
+    "tirlemont": "tienen",
+    "vilvorde": "vilvoorde",
+    "léau": "zoutleeuw",
+    "montaigu-zichem": "scherpenheuvel-zichem",
+    "montaigu": "scherpenheuvel-zichem",
+    "scherpenheuvel": "scherpenheuvel-zichem",
+    "rhode-saint-genèse": "sint-genesius-rode",
+    "rode": "sint-genesius-rode",
+    "leeuw-saint-pierre": "sint-pieters-leeuw",
+    "crainhem": "kraainem",
+    "wezembeek": "wezembeek-oppem",
+    "tervueren": "tervuren",
+    "gammerages": "galmaarden",
+    "hérinnes": "herne",
+    "biévène": "bever",
+    "lennick": "lennik",
+    "zellik": "asse",
+    "strombeek-bever": "grimbergen",
+    "diegem": "machelen",
+    "sterrebeek": "zaventem",
+    "nossegem": "zaventem",
+    "zichem": "scherpenheuvel-zichem",
+
+    # WAALS-BRABANT
+    "eigenbrakel": "braine-l'alleud",
+    "geldenaken": "jodoigne",
+    "nijvel": "nivelles",
+    "waver": "wavre",
+    "graven": "grez-doiceau",
+    "ter hulpen": "la hulpe",
+    "tubeke": "tubize",
+    "terhulpen": "la hulpe",
+    "itter": "ittre",
+    "opheylissem": "hélécine",
+    "bierghes": "rebecq",
+    "louvain-la-neuve": "ottignies-louvain-la-neuve",
+    "ottignies": "ottignies-louvain-la-neuve",
+    "genval": "rixensart",
+    "rosières": "rixensart",
+    "limal": "wavre",
+    "bierges": "wavre",
+    "glabais": "genappe",
+    "ways": "genappe",
+    "orp": "orp-jauche",
+    "jauche": "orp-jauche",
+    "chaumont": "chaumont-gistoux",
+    "gistoux": "chaumont-gistoux",
+
+    # WEST-VLAANDEREN
+    "ypres": "ieper",
+    "bruges": "brugge",
+    "sint-andries": "brugge",
+    "sint-michiels": "brugge",
+    "assebroek": "brugge",
+    "sint-kruis": "brugge",
+    "dudzele": "brugge",
+    "lissewege": "brugge",
+    "zeebrugge": "brugge",
+    "koolkerke": "brugge",
+    "courtrai": "kortrijk",
+    "heule": "kortrijk",
+    "marke": "kortrijk",
+    "bissegem": "kortrijk",
+    "bellegem": "kortrijk",
+    "aalbeke": "kortrijk",
+    "rollegem": "kortrijk",
+    "ostende": "oostende",
+    "ostend": "oostende",
+    "stene": "oostende",
+    "zandvoorde": "oostende",
+    "roulers": "roeselare",
+    "rumbeke": "roeselare",
+    "beveren-roeselare": "roeselare",
+    "menin": "menen",
+    "wervicq": "wervik",
+    "furnes": "veurne",
+    "dixmude": "diksmuide",
+    "nieuport": "nieuwpoort",
+    "poperingue": "poperinge",
+    "messines": "mesen",
+    "blankenberghe": "blankenberge",
+    "knokke": "knokke-heist",
+    "duinbergen": "knokke-heist",
+    "la panne": "de panne",
+    "adinkerke": "de panne",
+    "coxyde": "koksijde",
+    "oostduinkerke": "koksijde",
+    "sint-idesbald": "koksijde",
+    "wenduine": "de haan",
+    "le coq": "de haan",
+    "westende": "middelkerke",
+    "bavikhove": "harelbeke",
+    "langemark": "langemark-poelkapelle",
+    "poelkapelle": "langemark-poelkapelle",
+    "reninge": "lo-reninge",
+    "kemmel": "heuvelland",
+    "passendale": "zonnebeke",
+    "passchendaele": "zonnebeke",
+    "spiere": "spiere-helkijn",
+    "helkijn": "spiere-helkijn",
+    "vlamertinge": "ieper",
+    "zillebeke": "ieper",
+}
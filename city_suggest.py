@@ -0,0 +1,209 @@
+# city_suggest.py
+import re
+import unicodedata
+
+
+# =============================================================================
+# CITY AUTOCOMPLETE
+# =============================================================================
+# Suggestions for /api/cities/suggest while a user types a city name.
+#
+# Names are folded first (lowercase, accents removed, hyphens and apostrophes
+# as spaces), so "liege", "Liège" and "liège" are the same input.
+#
+# 1. Prefix: a trie over the folded names, with every word start inserted as
+#    well ("niklaas" finds Sint-Niklaas). Each trie node keeps its best
+#    MAX_SUGGESTIONS cities, so a lookup is one walk down the query: no
+#    subtree is visited.
+# 2. Typos: when no name starts with the query, candidates come from two
+#    indexes and are then compared by edit distance (with transpositions) to
+#    the closest prefix of their name, as the user may not have finished
+#    typing:
+#    - a deletion index: every name prefix (up to DELETE_INDEX_LENGTH
+#      characters) and each variant of it with one character deleted. One
+#      wrong, missing, extra or swapped character leaves the query and the
+#      prefix with a deletion variant in common, so these candidates are
+#      found with a few dictionary lookups, even for short queries with the
+#      typo in the first letters.
+#    - a trigram index for queries with more typos: the names sharing the
+#      most trigrams with the query.
+#    The distance computation stops as soon as it exceeds the number of
+#    typos accepted for the query length.
+#
+# The index is built once from BELGIAN_CITIES in models.py (see
+# suggest_cities()).
+
+MAX_SUGGESTIONS = 20
+
+# Fuzzy matching needs a few characters to mean anything
+FUZZY_MIN_LENGTH = 3
+FUZZY_CANDIDATES = 20
+DELETE_INDEX_LENGTH = 12
+
+_SEPARATORS = re.compile(r"[\s\-'’_.,/]+")
+
+
+def fold(text) -> str:
+    """Lowercase, accent-free form of a name with words separated by single spaces"""
+    text = unicodedata.normalize('NFKD', str(text or '').lower())
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(_SEPARATORS.sub(' ', text).split())
+
+
+def max_typos(length: int) -> int:
+    """Edit distance still accepted as a typo for a query of this length"""
+    if length <= 4:
+        return 1
+    if length <= 8:
+        return 2
+    return 3
+
+
+def prefix_edit_distance(query: str, name: str, limit: int) -> int:
+    """
+    Edit distance between query and the closest prefix of name (the full
+    name included). Insertions, deletions, substitutions and swaps of two
+    adjacent characters count as one edit.
+
+    Returns:
+        The distance, or limit + 1 as soon as it is certain to exceed limit
+    """
+    # Only cells within limit of the diagonal can stay within limit
+    too_far = limit + 1
+    previous2, previous = None, [j if j <= limit else too_far for j in range(len(name) + 1)]
+    for i in range(1, len(query) + 1):
+        q, q_before = query[i - 1], query[i - 2] if i > 1 else None
+        current = [too_far] * (len(name) + 1)
+        current[0] = i if i <= limit else too_far
+        for j in range(max(1, i - limit), min(len(name), i + limit) + 1):
+            n = name[j - 1]
+            best = previous[j - 1] + (q != n)
+            if previous[j] + 1 < best:
+                best = previous[j] + 1
+            if current[j - 1] + 1 < best:
+                best = current[j - 1] + 1
+            if j > 1 and q == name[j - 2] and q_before == n and previous2[j - 2] + 1 < best:
+                best = previous2[j - 2] + 1
+            current[j] = best if best < too_far else too_far
+        if min(current) > limit:
+            return too_far
+        previous2, previous = previous, current
+    return min(previous)
+
+
+def _with_deletions(text: str) -> set:
+    """text and every string made by deleting one of its characters"""
+    return {text} | {text[:i] + text[i + 1:] for i in range(len(text))}
+
+
+def _trigrams(folded: str, finished: bool = True) -> set:
+    # Padded at the start so first letters weigh in; only finished names get the end padding
+    padded = f"  {folded} " if finished else f"  {folded}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _TrieNode:
+    __slots__ = ('children', 'best')
+
+    def __init__(self):
+        self.children = {}
+        self.best = {}  # city -> rank while building, then a list of cities in rank order
+
+
+class CitySuggestIndex:
+    """Prefix trie plus trigram index over city names"""
+
+    def __init__(self, cities):
+        """
+        Args:
+            cities: Iterable of canonical city keys
+        """
+        self._root = _TrieNode()
+        self._folded = {}    # city -> folded name
+        self._deletions = {}  # prefix or prefix with one character deleted -> set of cities
+        self._trigrams = {}  # trigram -> set of cities
+
+        for city in cities:
+            folded = fold(city)
+            if not folded:
+                continue
+            self._folded[city] = folded
+            words = folded.split(' ')
+            for position in range(len(words)):
+                # Whole-name prefixes rank before word prefixes, then shorter names first
+                rank = (position > 0, len(folded), folded)
+                self._insert(' '.join(words[position:]), city, rank)
+            # Prefixes one longer than the query length cover a missing character
+            for length in range(FUZZY_MIN_LENGTH - 1, min(len(folded), DELETE_INDEX_LENGTH + 1) + 1):
+                for variant in _with_deletions(folded[:length]):
+                    self._deletions.setdefault(variant, set()).add(city)
+            for trigram in _trigrams(folded):
+                self._trigrams.setdefault(trigram, set()).add(city)
+
+        self._finish(self._root)
+
+    def _insert(self, text, city, rank):
+        node = self._root
+        for ch in text:
+            node = node.children.setdefault(ch, _TrieNode())
+            if rank < node.best.get(city, (True, float('inf'), '')):
+                node.best[city] = rank
+
+    def _finish(self, root):
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            node.best = [city for city, _ in sorted(node.best.items(), key=lambda item: item[1])[:MAX_SUGGESTIONS]]
+            stack.extend(node.children.values())
+
+    def suggest(self, query: str, limit: int = 10) -> list:
+        """
+        Suggest cities for what the user typed so far.
+
+        Args:
+            query: Partial or misspelled city name
+            limit: Maximum number of suggestions (at most MAX_SUGGESTIONS)
+
+        Returns:
+            List of (city key, 'prefix' or 'fuzzy'), best first
+        """
+        folded = fold(query)
+        if not folded:
+            return []
+        limit = min(limit, MAX_SUGGESTIONS)
+
+        node = self._root
+        for ch in folded:
+            node = node.children.get(ch)
+            if node is None:
+                break
+        else:
+            if node.best:
+                return [(city, 'prefix') for city in node.best[:limit]]
+
+        if len(folded) < FUZZY_MIN_LENGTH:
+            return []
+        return [(city, 'fuzzy') for city in self._fuzzy(folded, limit)]
+
+    def _fuzzy(self, folded, limit):
+        shared = {}
+        for trigram in _trigrams(folded, finished=False):
+            for city in self._trigrams.get(trigram, ()):
+                shared[city] = shared.get(city, 0) + 1
+        candidates = set(sorted(shared, key=lambda city: (-shared[city], self._folded[city]))[:FUZZY_CANDIDATES])
+        for variant in _with_deletions(folded[:DELETE_INDEX_LENGTH]):
+            candidates.update(self._deletions.get(variant, ()))
+
+        allowed = max_typos(len(folded))
+        scored = []
+        for city in candidates:
+            name = self._folded[city]
+            # Longer prefixes than query + allowed can never be close enough
+            distance = prefix_edit_distance(folded, name[:len(folded) + allowed], allowed)
+            if distance <= allowed:
+                scored.append((distance, -shared.get(city, 0), len(name), name, city))
+        scored.sort()
+        return [entry[-1] for entry in scored[:limit]]
+
+    def __len__(self):
+        return len(self._folded)
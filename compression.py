@@ -0,0 +1,217 @@
+# compression.py
+import gzip
+import mimetypes
+import os
+import zlib
+from flask import current_app, request, send_from_directory
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # optional: without it responses are only gzip-compressed
+    brotli = None
+
+
+# =============================================================================
+# RESPONSE COMPRESSION
+# =============================================================================
+# Compresses JSON, HTML, CSS and JavaScript responses with brotli or gzip,
+# whichever the client prefers in Accept-Encoding (brotli only when the
+# optional brotli package is installed).
+#
+# - Bodies smaller than COMPRESSION_MIN_SIZE are sent as they are: the
+#   headers and CPU would cost more than the bytes saved.
+# - Bodies of STREAMING_MIN_SIZE and more, and streamed responses, are
+#   compressed chunk by chunk while they are sent, so the server never holds
+#   a second, compressed copy of a large body.
+# - Server-Sent Events and file responses are never compressed here. Static
+#   files are compressed once by scripts/build_static.py, which writes .br and
+#   .gz siblings next to them; send_static() sends those when they are
+#   present and up to date.
+
+COMPRESSION_MIN_SIZE = 1024
+STREAMING_MIN_SIZE = 256 * 1024
+STREAMING_CHUNK_SIZE = 64 * 1024
+
+# Per-request levels favour speed; scripts/build_static.py uses the maximum
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+}
+
+# File extension of the precompressed sibling for each encoding
+PRECOMPRESSED_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def available_encodings() -> tuple:
+    """Content encodings this process can produce, in order of preference"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def is_compressible(mimetype) -> bool:
+    return bool(mimetype) and (mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES) \
+        and mimetype != 'text/event-stream'
+
+
+def choose_encoding(accept_encodings, encodings=None):
+    """
+    Pick the content encoding for a request.
+
+    Args:
+        accept_encodings: The parsed Accept-Encoding header (request.accept_encodings)
+        encodings: Encodings that are available (default: available_encodings())
+
+    Returns:
+        'br', 'gzip' or None (send uncompressed). On equal quality values
+        the earlier encoding in the list wins.
+    """
+    best, best_quality = None, 0
+    for encoding in encodings or available_encodings():
+        quality = accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress a whole body with the per-request settings"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_chunks(chunks, encoding: str):
+    """
+    Compress an iterable of byte chunks, yielding compressed chunks as they
+    become available (for large and streamed bodies).
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        for chunk in chunks:
+            if chunk:
+                output = compressor.process(chunk)
+                if output:
+                    yield output
+        yield compressor.finish()
+        return
+
+    # wbits 16 + MAX_WBITS writes the gzip header and trailer
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        if chunk:
+            output = compressor.compress(chunk)
+            if output:
+                yield output
+    yield compressor.flush()
+
+
+def _split(data: bytes, size: int = STREAMING_CHUNK_SIZE):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def _encode_chunks(iterable, charset='utf-8'):
+    for chunk in iterable:
+        yield chunk.encode(charset) if isinstance(chunk, str) else chunk
+
+
+# =============================================================================
+# FLASK INTEGRATION
+# =============================================================================
+
+def _compress_response(response):
+    """after_request hook: compress the response body when the client accepts it"""
+    if not is_compressible(response.mimetype):
+        return response
+
+    # Caches must keep the compressed and uncompressed variants apart
+    response.vary.add('Accept-Encoding')
+
+    if (request.method == 'HEAD'
+            or response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or 'no-transform' in (response.headers.get('Cache-Control') or '')):
+        return response
+
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = compress_chunks(_encode_chunks(response.response), encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESSION_MIN_SIZE:
+            return response
+        if len(data) >= STREAMING_MIN_SIZE:
+            response.response = compress_chunks(_split(data), encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            response.set_data(compress(data, encoding))
+
+    response.headers['Content-Encoding'] = encoding
+    # A strong ETag names exact bytes; the compressed body is a different representation
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+    return response
+
+
+def send_static(filename, max_age=None):
+    """
+    Send a static file, or its precompressed .br/.gz sibling written by
+    scripts/build_static.py when the client accepts it and it is not older
+    than the file itself (siblings are sent even without the brotli package).
+
+    Args:
+        filename: Path relative to the static folder
+        max_age: Cache max-age in seconds (default: the app's static file setting)
+    """
+    static_folder = current_app.static_folder
+    if max_age is None:
+        max_age = current_app.get_send_file_max_age(filename)
+
+    accepted = sorted(
+        (encoding for encoding in PRECOMPRESSED_SUFFIXES if request.accept_encodings.quality(encoding) > 0),
+        key=lambda encoding: -request.accept_encodings.quality(encoding)
+    )
+    for encoding in accepted:
+        sibling = filename + PRECOMPRESSED_SUFFIXES[encoding]
+        if not _is_fresh(safe_join(static_folder, sibling), safe_join(static_folder, filename)):
+            continue
+        response = send_from_directory(static_folder, sibling,
+                                       mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+                                       max_age=max_age)
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+
+    response = send_from_directory(static_folder, filename, max_age=max_age)
+    if is_compressible(response.mimetype):
+        response.vary.add('Accept-Encoding')
+    return response
+
+
+def _is_fresh(sibling_path, source_path):
+    if sibling_path is None or source_path is None:  # outside the static folder
+        return False
+    try:
+        return os.path.getmtime(sibling_path) >= os.path.getmtime(source_path)
+    except OSError:
+        return False
+
+
+def init_compression(app):
+    """Compress responses on the fly (disable with COMPRESSION=off)"""
+    if os.getenv('COMPRESSION', 'on').lower() in ('0', 'off', 'false', 'no'):
+        return
+
+    app.after_request(_compress_response)
+    print(f"[COMPRESSION] Enabled ({', '.join(available_encodings())})")
@@ -0,0 +1,169 @@
+# events.py
+import itertools
+import json
+import threading
+import time
+from collections import deque
+
+
+# =============================================================================
+# IN-PROCESS EVENT BUS (for the /api/events Server-Sent Events stream)
+# =============================================================================
+# The mutation routes publish an event after every change to a property or a
+# new developer interest; every open /api/events stream of the same worker
+# receives it and forwards the events its user may see.
+#
+# Events are kept in a ring buffer of the last EVENT_HISTORY events with
+# increasing ids. A stream remembers the last id it sent and waits on a
+# condition for newer ones, so there are no per-subscriber queues to clean
+# up. The ids double as SSE event ids: a reconnecting EventSource sends
+# Last-Event-ID and gets the events it missed, or a "resync" event when they
+# have already left the buffer (or were published by another worker).
+#
+# Audience:
+#   property.created / .updated / .sold / .deleted -> all developers and the owner
+#   interest.created                              -> the owner of the property
+
+EVENT_HISTORY = 1000
+
+# A stream ends after STREAM_MAX_SECONDS (the browser reconnects after
+# RECONNECT_MS and resumes from Last-Event-ID); a comment line is sent when
+# nothing happened for HEARTBEAT_SECONDS so proxies keep the connection open
+STREAM_MAX_SECONDS = 300
+HEARTBEAT_SECONDS = 15
+RECONNECT_MS = 3000
+
+PROPERTY_EVENTS = ('property.created', 'property.updated', 'property.sold', 'property.deleted')
+INTEREST_EVENTS = ('interest.created',)
+
+
+class EventBus:
+    """Publish/subscribe for events inside one process"""
+
+    def __init__(self, history: int = EVENT_HISTORY):
+        self._condition = threading.Condition()
+        self._events = deque(maxlen=history)
+        self._last_id = 0
+        # Ids restart at 0 in every process: a Last-Event-ID from another
+        # process or an earlier run is recognized by this prefix
+        self.instance = f"{int(time.time()):x}"
+
+    @property
+    def last_id(self):
+        return self._last_id
+
+    def event_id(self, number: int = None) -> str:
+        """SSE id of an event of this bus (default: the last published one)"""
+        return f"{self.instance}-{self._last_id if number is None else number}"
+
+    def publish(self, event_type: str, data: dict, owner_id=None, developers: bool = True) -> dict:
+        """
+        Publish an event to all subscribers.
+
+        Args:
+            event_type: One of PROPERTY_EVENTS / INTEREST_EVENTS
+            data: JSON-serializable payload
+            owner_id: Property owner the event concerns (receives it)
+            developers: Whether developers receive it
+
+        Returns:
+            The published event
+        """
+        with self._condition:
+            self._last_id += 1
+            event = {
+                'id': self._last_id,
+                'type': event_type,
+                'data': data,
+                'owner_id': owner_id,
+                'developers': developers,
+            }
+            self._events.append(event)
+            self._condition.notify_all()
+        return event
+
+    def events_after(self, last_id: int, timeout: float = None):
+        """
+        Return the events published after last_id, waiting up to timeout
+        seconds for one when there are none yet.
+
+        Returns:
+            Tuple (events, complete): complete is False when events after
+            last_id were already dropped from the history
+        """
+        with self._condition:
+            if self._last_id <= last_id and timeout:
+                self._condition.wait_for(lambda: self._last_id > last_id, timeout)
+            oldest_id = self._events[0]['id'] if self._events else self._last_id + 1
+            # Ids are consecutive, so the events after last_id start at a known position
+            start = max(last_id - oldest_id + 1, 0)
+            events = list(itertools.islice(self._events, start, None))
+            return events, last_id >= oldest_id - 1
+
+
+def visible_to(event: dict, user_type: str, user_id) -> bool:
+    """Whether a logged-in user may receive an event (owners only see their own properties)"""
+    if user_type == 'developer':
+        return event['developers']
+    if user_type == 'property_owner':
+        return event['owner_id'] is not None and str(event['owner_id']) == str(user_id)
+    return False
+
+
+def format_sse(event_id: str, event_type: str, data) -> str:
+    """Encode one Server-Sent Events message"""
+    return f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def event_stream(bus: EventBus, user_type: str, user_id, last_event_id: str = None,
+                 max_seconds: float = STREAM_MAX_SECONDS, heartbeat_seconds: float = HEARTBEAT_SECONDS):
+    """
+    Generate the Server-Sent Events text for one subscriber.
+
+    Args:
+        bus: The EventBus to read from
+        user_type, user_id: The logged-in user (see visible_to)
+        last_event_id: Last-Event-ID sent by a reconnecting client, if any
+        max_seconds: How long to keep the stream open
+        heartbeat_seconds: Longest silence before a keep-alive comment
+
+    Yields:
+        SSE messages: the visible events, "resync" when events may have been
+        missed (the client should reload its lists) and keep-alive comments
+    """
+    yield f"retry: {RECONNECT_MS}\n\n"
+
+    last_id = _parse_event_id(bus, last_event_id)
+    if last_id is None:
+        last_id = bus.last_id
+        if last_event_id:
+            yield format_sse(bus.event_id(last_id), 'resync', {})
+
+    deadline = time.monotonic() + max_seconds
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+
+        events, complete = bus.events_after(last_id, timeout=min(heartbeat_seconds, remaining))
+        sent = False
+        if not complete:
+            last_id = events[-1]['id'] if events else bus.last_id
+            yield format_sse(bus.event_id(last_id), 'resync', {})
+            continue
+
+        for event in events:
+            last_id = event['id']
+            if visible_to(event, user_type, user_id):
+                yield format_sse(bus.event_id(event['id']), event['type'], event['data'])
+                sent = True
+        if not sent:
+            yield ": keep-alive\n\n"
+
+
+def _parse_event_id(bus, event_id):
+    """Numeric id from an SSE id of this bus ("<instance>-<id>"), else None"""
+    instance, _, number = (event_id or '').partition('-')
+    if instance != bus.instance or not number.isdigit() or int(number) > bus.last_id:
+        return None
+    return int(number)
@@ -0,0 +1,442 @@
+# listing_index.py
+import bisect
+import threading
+import time
+
+from text_search import listing_terms
+
+
+# =============================================================================
+# IN-MEMORY LISTING INDEX
+# =============================================================================
+# Keeps every unsold property in memory so /api/properties can answer its
+# filters without a database round trip:
+# - posting lists (sets of property ids) per province, per type and per city_key
+# - a sorted list of city keys for prefix lookups ("sint-" -> sint-niklaas, ...)
+# - sorted (value, property_id) arrays on size and price_min for the range filters
+# - an inverted index (term -> property ids) over names and descriptions for
+#   the q search (terms from text_search.listing_terms)
+#
+# A query starts from the smallest candidate list (a posting list or a range
+# slice located with bisect) and checks the remaining filters on the rows.
+#
+# For facet counts every listing also gets a dense slot number, and each
+# facet value (province, type, city, size bucket, price bucket) a bitmap of
+# the slots that have it, stored as a Python int. A facet count is then
+# bitmap AND filter bitmap followed by int.bit_count(). Because the slots are
+# dense, a bitmap takes one bit per listing (about 1.2 KiB for 10,000 listings).
+#
+# The index only holds data; models.py loads it from the database, keeps it
+# fresh from the write routes and rebuilds it periodically (see
+# load_listing_index()).
+
+
+# Facet buckets as [low, high) ranges; None means unbounded
+SIZE_BUCKETS = [(0, 500), (500, 1000), (1000, 2500), (2500, 5000), (5000, 10000), (10000, None)]
+PRICE_BUCKETS = [(0, 100000), (100000, 250000), (250000, 500000), (500000, 1000000),
+                 (1000000, 2500000), (2500000, None)]
+
+FACET_DIMENSIONS = ('province', 'type', 'city', 'size', 'price')
+
+
+def bucket_of(value, buckets):
+    """Index of the bucket containing value, or None"""
+    if value is None:
+        return None
+    for index, (low, high) in enumerate(buckets):
+        if value >= low and (high is None or value < high):
+            return index
+    return None
+
+
+class ListingIndex:
+    """Unsold properties indexed on the /api/properties filters"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+        self.loaded_at = None
+        self._journal = None  # changes made while a rebuild is fetching rows
+
+    def _reset(self):
+        self._rows = {}          # property_id -> row
+        self._by_province = {}   # province -> set of property_ids
+        self._by_type = {}       # type -> set of property_ids
+        self._by_city = {}       # city_key -> set of property_ids
+        self._city_keys = []     # sorted city keys that have listings
+        self._by_size = []       # sorted (size, property_id)
+        self._by_price = []      # sorted (price_min, property_id)
+        self._by_term = {}       # search term -> set of property_ids
+        self._slots = {}         # property_id -> slot
+        self._slot_ids = []      # slot -> property_id (None for a free slot)
+        self._free_slots = []
+        self._all_bits = 0       # bitmap of the occupied slots
+        self._bitmaps = {dimension: {} for dimension in FACET_DIMENSIONS}  # value -> bitmap
+
+    # ----- maintenance -----
+
+    def begin_rebuild(self):
+        """
+        Start recording changes before the rows for a rebuild are fetched.
+
+        Changes made between begin_rebuild() and rebuild() may be missing from
+        the fetched rows; rebuild() applies them again on top.
+        """
+        with self._lock:
+            self._journal = []
+
+    def rebuild_cancelled(self):
+        """Stop recording changes after a failed fetch"""
+        with self._lock:
+            self._journal = None
+
+    def rebuild(self, rows):
+        """Replace the index with the given rows (unsold properties)"""
+        with self._lock:
+            journal, self._journal = self._journal or [], None
+            self._reset()
+            for row in rows:
+                if not row.get('sold') and row.get('property_id') not in self._rows:
+                    self._add(row, set_bits=False)
+            self._build_bitmaps()
+            for operation, value in journal:
+                if operation == 'upsert':
+                    self.upsert(value)
+                else:
+                    self.remove(value)
+            self.loaded_at = time.time()
+            print(f"[LISTING INDEX] Rebuilt with {len(self._rows)} unsold properties "
+                  f"({len(journal)} concurrent changes replayed)")
+
+    def upsert(self, row):
+        """Add or replace a property; sold properties are removed from the index"""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(('upsert', row))
+            self._discard(row.get('property_id'))
+            if not row.get('sold'):
+                self._add(row)
+
+    def remove(self, property_id):
+        """Remove a property (deleted or sold)"""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(('remove', property_id))
+            return self._discard(property_id)
+
+    def is_fresh(self, max_age_seconds):
+        return self.loaded_at is not None and time.time() - self.loaded_at < max_age_seconds
+
+    def _add(self, row, set_bits=True):
+        row = dict(row)
+        property_id = row.get('property_id')
+        self._rows[property_id] = row
+
+        slot = self._free_slots.pop() if self._free_slots else len(self._slot_ids)
+        if slot == len(self._slot_ids):
+            self._slot_ids.append(property_id)
+        else:
+            self._slot_ids[slot] = property_id
+        self._slots[property_id] = slot
+        if set_bits:
+            bit = 1 << slot
+            self._all_bits |= bit
+            for dimension, value in _facet_values(row):
+                bitmaps = self._bitmaps[dimension]
+                bitmaps[value] = bitmaps.get(value, 0) | bit
+
+        self._by_province.setdefault(row.get('province'), set()).add(property_id)
+        self._by_type.setdefault(row.get('type'), set()).add(property_id)
+
+        city_key = row.get('city_key')
+        if city_key not in self._by_city:
+            self._by_city[city_key] = set()
+            if city_key:
+                bisect.insort(self._city_keys, city_key)
+        self._by_city[city_key].add(property_id)
+
+        if row.get('size') is not None:
+            bisect.insort(self._by_size, (row['size'], property_id))
+        if row.get('price_min') is not None:
+            bisect.insort(self._by_price, (row['price_min'], property_id))
+
+        for term in listing_terms(row):
+            self._by_term.setdefault(term, set()).add(property_id)
+
+    def _discard(self, property_id):
+        row = self._rows.pop(property_id, None)
+        if row is None:
+            return False
+
+        slot = self._slots.pop(property_id)
+        self._slot_ids[slot] = None
+        self._free_slots.append(slot)
+        mask = ~(1 << slot)
+        self._all_bits &= mask
+        for dimension, value in _facet_values(row):
+            bitmaps = self._bitmaps[dimension]
+            bits = bitmaps.get(value, 0) & mask
+            if bits:
+                bitmaps[value] = bits
+            else:
+                bitmaps.pop(value, None)
+
+        _remove_from_posting(self._by_province, row.get('province'), property_id)
+        _remove_from_posting(self._by_type, row.get('type'), property_id)
+
+        city_key = row.get('city_key')
+        if _remove_from_posting(self._by_city, city_key, property_id) and city_key:
+            index = bisect.bisect_left(self._city_keys, city_key)
+            if index < len(self._city_keys) and self._city_keys[index] == city_key:
+                self._city_keys.pop(index)
+
+        if row.get('size') is not None:
+            _remove_from_sorted(self._by_size, (row['size'], property_id))
+        if row.get('price_min') is not None:
+            _remove_from_sorted(self._by_price, (row['price_min'], property_id))
+        for term in listing_terms(row):
+            _remove_from_posting(self._by_term, term, property_id)
+        return True
+
+    # ----- lookups -----
+
+    def query(self, province=None, property_type=None, city_key=None, city_prefix=None,
+              min_size=None, max_price=None, near_cities=None, search_terms=None):
+        """
+        Return the unsold properties matching all given filters (same semantics
+        as the database query in get_properties).
+
+        Args:
+            province: exact Province value
+            property_type: exact type ('land' / 'building')
+            city_key: exact canonical city key
+            city_prefix: canonical city key prefix (used when city_key is None)
+            min_size: size >= min_size
+            max_price: price_min <= max_price
+            near_cities: collection of canonical city keys (radius search)
+            search_terms: terms that must all occur in the name or description
+
+        Returns:
+            List of property rows ordered by property_id (do not modify them)
+        """
+        with self._lock:
+            candidates = []  # (size, ids)
+            if province is not None:
+                ids = self._by_province.get(province, ())
+                candidates.append((len(ids), ids))
+            if property_type is not None:
+                ids = self._by_type.get(property_type, ())
+                candidates.append((len(ids), ids))
+            if city_key is not None:
+                ids = self._by_city.get(city_key, ())
+                candidates.append((len(ids), ids))
+            elif city_prefix is not None:
+                ids = self._city_prefix_ids(city_prefix)
+                candidates.append((len(ids), ids))
+            if near_cities is not None:
+                ids = set()
+                for near_city in near_cities:
+                    ids |= self._by_city.get(near_city, set())
+                candidates.append((len(ids), ids))
+            search_ids = None
+            if search_terms is not None:
+                search_ids = self._term_ids(search_terms)
+                candidates.append((len(search_ids), search_ids))
+            if min_size is not None:
+                start = bisect.bisect_left(self._by_size, (min_size,))
+                candidates.append((len(self._by_size) - start, _RangeIds(self._by_size, start, len(self._by_size))))
+            if max_price is not None:
+                end = bisect.bisect_right(self._by_price, (max_price, float('inf')))
+                candidates.append((end, _RangeIds(self._by_price, 0, end)))
+
+            if candidates:
+                ids = min(candidates, key=lambda candidate: candidate[0])[1]
+            else:
+                ids = self._rows.keys()
+
+            results = []
+            for property_id in ids:
+                row = self._rows[property_id]
+                if province is not None and row.get('province') != province:
+                    continue
+                if property_type is not None and row.get('type') != property_type:
+                    continue
+                if city_key is not None and row.get('city_key') != city_key:
+                    continue
+                if city_key is None and city_prefix is not None and not (row.get('city_key') or '').startswith(city_prefix):
+                    continue
+                if near_cities is not None and row.get('city_key') not in near_cities:
+                    continue
+                if search_ids is not None and property_id not in search_ids:
+                    continue
+                if min_size is not None and (row.get('size') is None or row['size'] < min_size):
+                    continue
+                if max_price is not None and (row.get('price_min') is None or row['price_min'] > max_price):
+                    continue
+                results.append(row)
+
+            results.sort(key=lambda row: row['property_id'])
+            return results
+
+    def _build_bitmaps(self):
+        """Build all bitmaps at once (setting bits one by one is quadratic on big ints)"""
+        size = len(self._slot_ids) // 8 + 1
+        buffers = {dimension: {} for dimension in FACET_DIMENSIONS}
+        occupied = bytearray(size)
+        for slot, property_id in enumerate(self._slot_ids):
+            if property_id is None:
+                continue
+            byte, bit = slot >> 3, 1 << (slot & 7)
+            occupied[byte] |= bit
+            for dimension, value in _facet_values(self._rows[property_id]):
+                buffer = buffers[dimension].get(value)
+                if buffer is None:
+                    buffer = buffers[dimension][value] = bytearray(size)
+                buffer[byte] |= bit
+        self._all_bits = int.from_bytes(occupied, 'little')
+        self._bitmaps = {
+            dimension: {value: int.from_bytes(buffer, 'little') for value, buffer in values.items()}
+            for dimension, values in buffers.items()
+        }
+
+    def _range_bitmap(self, array, start, end):
+        """Bitmap of the listings in array[start:end] (a sorted (value, property_id) array)"""
+        buffer = bytearray(len(self._slot_ids) // 8 + 1)
+        for index in range(start, end):
+            slot = self._slots[array[index][1]]
+            buffer[slot >> 3] |= 1 << (slot & 7)
+        return int.from_bytes(buffer, 'little')
+
+    def facets(self, province=None, property_type=None, city_key=None, city_prefix=None,
+               min_size=None, max_price=None, near_cities=None, search_terms=None):
+        """
+        Count the listings per facet value for a filter set (same filters as query()).
+
+        Each facet is counted with all filters except its own, so the counts
+        show how many results every alternative choice would give.
+
+        Returns:
+            Dictionary with 'total' (listings matching all filters) and per
+            dimension a dict of counts: 'province' and 'type' keyed on the
+            stored value, 'size' and 'price' keyed on the bucket index in
+            SIZE_BUCKETS / PRICE_BUCKETS
+        """
+        with self._lock:
+            masks = {}
+            if province is not None:
+                masks['province'] = self._bitmaps['province'].get(province, 0)
+            if property_type is not None:
+                masks['type'] = self._bitmaps['type'].get(property_type, 0)
+            if city_key is not None:
+                masks['city'] = self._bitmaps['city'].get(city_key, 0)
+            elif city_prefix is not None:
+                bits = 0
+                index = bisect.bisect_left(self._city_keys, city_prefix)
+                while index < len(self._city_keys) and self._city_keys[index].startswith(city_prefix):
+                    bits |= self._bitmaps['city'].get(self._city_keys[index], 0)
+                    index += 1
+                masks['city'] = bits
+            if near_cities is not None:
+                bits = 0
+                for near_city in near_cities:
+                    bits |= self._bitmaps['city'].get(near_city, 0)
+                masks['near'] = bits
+            if search_terms is not None:
+                masks['text'] = self._ids_bitmap(self._term_ids(search_terms))
+            if min_size is not None:
+                start = bisect.bisect_left(self._by_size, (min_size,))
+                masks['size'] = self._range_bitmap(self._by_size, start, len(self._by_size))
+            if max_price is not None:
+                end = bisect.bisect_right(self._by_price, (max_price, float('inf')))
+                masks['price'] = self._range_bitmap(self._by_price, 0, end)
+
+            def matching(excluded=None):
+                bits = self._all_bits
+                for dimension, mask in masks.items():
+                    if dimension != excluded:
+                        bits &= mask
+                return bits
+
+            result = {'total': matching().bit_count()}
+            for dimension in ('province', 'type', 'size', 'price'):
+                base = matching(dimension)
+                result[dimension] = {
+                    value: (bitmap & base).bit_count()
+                    for value, bitmap in self._bitmaps[dimension].items()
+                }
+            return result
+
+    def _ids_bitmap(self, ids):
+        """Bitmap of the given listings"""
+        buffer = bytearray(len(self._slot_ids) // 8 + 1)
+        for property_id in ids:
+            slot = self._slots[property_id]
+            buffer[slot >> 3] |= 1 << (slot & 7)
+        return int.from_bytes(buffer, 'little')
+
+    def _term_ids(self, terms):
+        """Ids of the listings containing every term (intersection, smallest posting list first)"""
+        postings = sorted((self._by_term.get(term, set()) for term in terms), key=len)
+        if not postings:
+            return set(self._rows)
+        return postings[0].intersection(*postings[1:])
+
+    def _city_prefix_ids(self, prefix):
+        ids = set()
+        index = bisect.bisect_left(self._city_keys, prefix)
+        while index < len(self._city_keys) and self._city_keys[index].startswith(prefix):
+            ids |= self._by_city[self._city_keys[index]]
+            index += 1
+        return ids
+
+    def get(self, property_id):
+        return self._rows.get(property_id)
+
+    def __len__(self):
+        return len(self._rows)
+
+
+class _RangeIds:
+    """Iterates the property ids of a slice of a sorted (value, property_id) array"""
+
+    __slots__ = ('_array', '_start', '_end')
+
+    def __init__(self, array, start, end):
+        self._array = array
+        self._start = start
+        self._end = end
+
+    def __iter__(self):
+        for index in range(self._start, self._end):
+            yield self._array[index][1]
+
+
+def _facet_values(row):
+    """Yield (dimension, value) for every facet bitmap a listing belongs to"""
+    yield 'province', row.get('province')
+    yield 'type', row.get('type')
+    yield 'city', row.get('city_key')
+    size_bucket = bucket_of(row.get('size'), SIZE_BUCKETS)
+    if size_bucket is not None:
+        yield 'size', size_bucket
+    price_bucket = bucket_of(row.get('price_min'), PRICE_BUCKETS)
+    if price_bucket is not None:
+        yield 'price', price_bucket
+
+
+def _remove_from_posting(postings, key, property_id):
+    """Remove an id from a posting list; returns True when the list became empty"""
+    ids = postings.get(key)
+    if ids is None:
+        return False
+    ids.discard(property_id)
+    if not ids:
+        del postings[key]
+        return True
+    return False
+
+
+def _remove_from_sorted(array, item):
+    index = bisect.bisect_left(array, item)
+    if index < len(array) and array[index] == item:
+        array.pop(index)
@@ -0,0 +1,342 @@
+# local_db.py
+import json
+import re
+import threading
+from copy import deepcopy
+from datetime import datetime, timezone
+
+from text_search import listing_terms, query_terms
+
+
+# =============================================================================
+# LOCAL DATA STAND-IN FOR THE SUPABASE CLIENT
+# =============================================================================
+# A small in-memory replacement for the parts of the Supabase client that the
+# app uses (table queries, filters, insert/update/delete and storage).
+# It lets benchmarks, load tests and local development run without a network
+# connection to Supabase. Enable it by pointing SUPABASE_LOCAL_DATA at a JSON
+# file of the form {"Property": [...], "Developer": [...], ...}.
+
+
+# Column defaults from migrations/, applied on insert (callables are called)
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+COLUMN_DEFAULTS = {
+    'Property': {'image_urls': [], 'sold': False, 'final_price': None},
+    'Developer': {'verified': False},
+    'Property_Interest': {'created_at': _now},
+    'Saved_Search': {'filters': {}, 'created_at': _now},
+    'Saved_Search_Match': {'created_at': _now},
+}
+
+# "generated by default as identity" columns, numbered on insert
+IDENTITY_COLUMNS = {
+    'Property_Interest': 'id',
+    'Saved_Search': 'saved_search_id',
+    'Saved_Search_Match': 'match_id',
+}
+
+
+# PostgREST computed fields (functions taking the row) that can be filtered on
+COMPUTED_FIELDS = {
+    ('Property', 'search_vector'): listing_terms,  # migrations/0005_property_search.sql
+}
+
+_TEXT_SEARCH_OPERATOR = re.compile(r'(pl|ph|w)?fts(\(\w+\))?')
+
+
+def _with_defaults(table_name, row):
+    defaults = {column: value() if callable(value) else deepcopy(value)
+                for column, value in COLUMN_DEFAULTS.get(table_name, {}).items()}
+    return {**defaults, **deepcopy(row)}
+
+
+def _new_row(table_name, rows, row):
+    """A row to insert: defaults applied and the identity column numbered"""
+    new_row = _with_defaults(table_name, row)
+    identity = IDENTITY_COLUMNS.get(table_name)
+    if identity and new_row.get(identity) is None:
+        new_row[identity] = max((existing.get(identity) or 0 for existing in rows), default=0) + 1
+    return new_row
+
+
+class LocalResponse:
+    """Mimics the response object returned by postgrest's execute()"""
+
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+def _like_to_regex(pattern: str, case_sensitive: bool = False) -> re.Pattern:
+    """Convert a SQL LIKE pattern (% and _ wildcards) into a compiled regex"""
+    parts = []
+    for char in pattern:
+        if char == '%':
+            parts.append('.*')
+        elif char == '_':
+            parts.append('.')
+        else:
+            parts.append(re.escape(char))
+    flags = re.DOTALL if case_sensitive else re.IGNORECASE | re.DOTALL
+    return re.compile('^' + ''.join(parts) + '$', flags)
+
+
+class _NotFilter:
+    """Handles the `.not_` prefix (only `.not_.is_(col, 'null')` is used by the app)"""
+
+    def __init__(self, query):
+        self._query = query
+
+    def is_(self, column, value):
+        return self._query._add_filter(lambda row: not _is_match(row.get(column), value))
+
+    def eq(self, column, value):
+        return self._query._add_filter(lambda row: row.get(column) != value)
+
+
+def _is_match(actual, value):
+    if value in (None, 'null'):
+        return actual is None
+    if value in (True, 'true'):
+        return actual is True
+    if value in (False, 'false'):
+        return actual is False
+    return actual == value
+
+
+class LocalQuery:
+    """
+    Query builder supporting the chained postgrest calls used in this repo.
+
+    Filters are collected as predicates and applied when execute() is called.
+    """
+
+    def __init__(self, store, table_name):
+        self._store = store
+        self._table_name = table_name
+        self._operation = 'select'
+        self._columns = None
+        self._payload = None
+        self._filters = []
+        self._order = []
+        self._range = None
+        self._count = None
+        self._conflict_columns = []
+        self._ignore_duplicates = False
+
+    # ----- operations -----
+
+    def select(self, columns='*', count=None):
+        self._operation = 'select'
+        self._columns = None if columns.strip() == '*' else [c.strip() for c in columns.split(',')]
+        self._count = count
+        return self
+
+    def insert(self, payload):
+        self._operation = 'insert'
+        self._payload = payload
+        return self
+
+    def upsert(self, payload, on_conflict='', ignore_duplicates=False):
+        self._operation = 'upsert'
+        self._payload = payload
+        self._conflict_columns = [c.strip() for c in on_conflict.split(',') if c.strip()]
+        self._ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, payload):
+        self._operation = 'update'
+        self._payload = payload
+        return self
+
+    def delete(self):
+        self._operation = 'delete'
+        return self
+
+    # ----- filters -----
+
+    def _add_filter(self, predicate):
+        self._filters.append(predicate)
+        return self
+
+    @property
+    def not_(self):
+        return _NotFilter(self)
+
+    def eq(self, column, value):
+        return self._add_filter(lambda row: row.get(column) == value)
+
+    def neq(self, column, value):
+        return self._add_filter(lambda row: row.get(column) != value)
+
+    def gt(self, column, value):
+        return self._add_filter(lambda row: row.get(column) is not None and row.get(column) > value)
+
+    def gte(self, column, value):
+        return self._add_filter(lambda row: row.get(column) is not None and row.get(column) >= value)
+
+    def lt(self, column, value):
+        return self._add_filter(lambda row: row.get(column) is not None and row.get(column) < value)
+
+    def lte(self, column, value):
+        return self._add_filter(lambda row: row.get(column) is not None and row.get(column) <= value)
+
+    def in_(self, column, values):
+        allowed = set(values)
+        return self._add_filter(lambda row: row.get(column) in allowed)
+
+    def is_(self, column, value):
+        return self._add_filter(lambda row: _is_match(row.get(column), value))
+
+    def filter(self, column, operator, criteria):
+        """Generic filter; only the full-text search operators (fts, plfts, ...) are supported"""
+        compute = COMPUTED_FIELDS.get((self._table_name, column))
+        if compute is None or not _TEXT_SEARCH_OPERATOR.fullmatch(operator):
+            raise NotImplementedError(f"Local stand-in cannot filter {column} with {operator}")
+        terms = set(query_terms(criteria))
+        return self._add_filter(lambda row: terms <= compute(row))
+
+    def like(self, column, pattern):
+        regex = _like_to_regex(pattern, case_sensitive=True)
+        return self._add_filter(lambda row: row.get(column) is not None and bool(regex.match(str(row.get(column)))))
+
+    def ilike(self, column, pattern):
+        regex = _like_to_regex(pattern)
+        return self._add_filter(lambda row: row.get(column) is not None and bool(regex.match(str(row.get(column)))))
+
+    # ----- ordering and paging -----
+
+    def order(self, column, desc=False):
+        self._order.append((column, desc))
+        return self
+
+    def range(self, start, end):
+        self._range = (start, end)
+        return self
+
+    def limit(self, size):
+        self._range = (0, size - 1)
+        return self
+
+    # ----- execution -----
+
+    def _matches(self, row):
+        return all(predicate(row) for predicate in self._filters)
+
+    def execute(self):
+        with self._store.lock:
+            rows = self._store.tables.setdefault(self._table_name, [])
+
+            if self._operation == 'insert':
+                payload = self._payload if isinstance(self._payload, list) else [self._payload]
+                inserted = []
+                for row in payload:
+                    inserted.append(_new_row(self._table_name, rows, row))
+                    rows.append(inserted[-1])
+                return LocalResponse(deepcopy(inserted))
+
+            if self._operation == 'upsert':
+                payload = self._payload if isinstance(self._payload, list) else [self._payload]
+                written = []
+                for new_row in payload:
+                    key = tuple(new_row.get(c) for c in self._conflict_columns)
+                    existing = next((row for row in rows
+                                     if tuple(row.get(c) for c in self._conflict_columns) == key), None)
+                    if existing is None:
+                        inserted = _new_row(self._table_name, rows, new_row)
+                        rows.append(inserted)
+                        written.append(deepcopy(inserted))
+                    elif not self._ignore_duplicates:
+                        existing.update(deepcopy(new_row))
+                        written.append(deepcopy(existing))
+                return LocalResponse(written)
+
+            if self._operation == 'update':
+                updated = []
+                for row in rows:
+                    if self._matches(row):
+                        row.update(deepcopy(self._payload))
+                        updated.append(deepcopy(row))
+                return LocalResponse(updated)
+
+            if self._operation == 'delete':
+                kept, deleted = [], []
+                for row in rows:
+                    (deleted if self._matches(row) else kept).append(row)
+                self._store.tables[self._table_name] = kept
+                return LocalResponse(deepcopy(deleted))
+
+            result = [row for row in rows if self._matches(row)]
+            total = len(result)
+
+            for column, desc in reversed(self._order):
+                result.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+
+            if self._range:
+                start, end = self._range
+                result = result[start:end + 1]
+
+            if self._columns:
+                result = [{col: row.get(col) for col in self._columns} for row in result]
+
+            return LocalResponse(deepcopy(result), count=total if self._count else None)
+
+
+class _LocalBucket:
+    """In-memory storage bucket that keeps uploaded file bytes"""
+
+    def __init__(self, name, files):
+        self._name = name
+        self._files = files
+
+    def upload(self, path, content, file_options=None):
+        self._files[path] = content
+        return {'path': path}
+
+    def get_public_url(self, path):
+        return f"/local-storage/{self._name}/{path}"
+
+    def remove(self, paths):
+        for path in paths:
+            self._files.pop(path, None)
+        return [{'name': path} for path in paths]
+
+
+class _LocalStorage:
+    def __init__(self):
+        self._buckets = {}
+
+    def from_(self, bucket_name):
+        return _LocalBucket(bucket_name, self._buckets.setdefault(bucket_name, {}))
+
+
+class LocalSupabase:
+    """
+    Drop-in stand-in for the supabase Client used by models.py and routes.py.
+
+    Args:
+        tables: Dictionary mapping table names to lists of row dictionaries
+    """
+
+    def __init__(self, tables=None):
+        self.tables = deepcopy(tables or {})
+        self.lock = threading.RLock()
+        self.storage = _LocalStorage()
+
+    @classmethod
+    def from_json(cls, path):
+        """Load the tables from a JSON file"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def table(self, table_name):
+        return LocalQuery(self, table_name)
+
+    def from_(self, table_name):
+        return self.table(table_name)
+
+    def rpc(self, function_name, params=None):
+        raise NotImplementedError(f"RPC '{function_name}' is not available in the local data stand-in")
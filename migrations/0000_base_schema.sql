@@ -0,0 +1,48 @@
+-- migrations/0000_base_schema.sql
+-- Base GroundLink schema as used by routes.py and models.py.
+--
+-- On Supabase these tables already exist (they were created in the dashboard);
+-- every statement is idempotent so this file is a no-op there. It mainly lets
+-- the later migrations be applied and tested against a local Postgres.
+
+create table if not exists public."Developer" (
+    developer_id    bigint primary key,
+    first_name      text not null,
+    last_name       text not null,
+    email           text not null,
+    phone_number    text,
+    company_name    text,
+    "VAT_number"    text,
+    verified        boolean not null default false
+);
+
+create table if not exists public."Property owner" (
+    "propertyOwner_id"  bigint primary key,
+    first_name          text not null,
+    last_name           text not null,
+    email               text not null,
+    phone_number        text
+);
+
+create table if not exists public."Property" (
+    property_id         bigint primary key,
+    property_name       text,
+    size                integer,
+    description         text,
+    province            text,
+    city                text,
+    "propertyOwner_id"  bigint references public."Property owner" ("propertyOwner_id"),
+    image_urls          text[] default '{}',
+    type                text,
+    price_min           double precision,
+    price_max           double precision,
+    sold                boolean not null default false,
+    final_price         double precision
+);
+
+create table if not exists public."Property_Interest" (
+    id              bigint generated by default as identity primary key,
+    property_id     bigint not null references public."Property" (property_id) on delete cascade,
+    developer_id    bigint not null references public."Developer" (developer_id) on delete cascade,
+    created_at      timestamptz not null default now()
+);
@@ -0,0 +1,132 @@
+-- migrations/0001_estimate_price_knn.sql
+-- Server-side KNN scoring for the price estimator (see estimate_property_price in models.py).
+--
+-- Instead of shipping the whole sold table to Python for every estimate, the
+-- app calls these functions through supabase.rpc():
+--
+--   estimate_price_knn  scores the sold properties exactly like the Python
+--                       engine and returns only the rows that can be in the
+--                       top K for a size in [p_size_low, p_size_high]. For a
+--                       single size (low = high) that is the top K itself
+--                       (plus rows tied with the K-th score).
+--   sold_city_counts    number of sold properties per (city, province), used
+--                       to pick a fallback city when the target city has too
+--                       little data.
+--
+-- Scoring (kept in sync with _score_comparables / _top_k_price_per_m2):
+--   same city +4, fallback city +3, other city in same province +1,
+--   same province +2, same type +1, minus abs(size difference) / 10.
+-- The size penalty is applied by the caller, which gets base_score and size
+-- back, so the result can also be cached for a whole size bucket.
+
+create or replace function public.estimate_price_knn(
+    p_city          text,
+    p_province      text,
+    p_type          text,
+    p_size_low      double precision,
+    p_size_high     double precision default null,
+    p_fallback_city text default null,
+    p_k             integer default 5
+)
+returns table (
+    property_id     bigint,
+    city            text,
+    base_score      integer,
+    size            double precision,
+    price_per_m2    double precision,
+    is_fallback     boolean,
+    same_city_count bigint
+)
+language sql
+stable
+as $$
+    with sold as (
+        select p.property_id::bigint                            as property_id,
+               p.city::text                                     as city,
+               lower(btrim(coalesce(p.city::text, '')))         as city_norm,
+               btrim(coalesce(p.province::text, ''))            as province_norm,
+               lower(btrim(coalesce(p.type::text, '')))         as type_norm,
+               p.size::double precision                         as size,
+               p.final_price::double precision                  as final_price
+        from public."Property" p
+        where p.sold and p.final_price is not null
+    ),
+    scored as (
+        select s.property_id,
+               s.city,
+               s.size,
+               s.final_price,
+               (case
+                    when s.city_norm = p_city then 4
+                    when p_fallback_city is not null and s.city_norm = p_fallback_city then 3
+                    when s.province_norm = p_province then 1
+                    else 0
+                end
+                + case when s.province_norm = p_province then 2 else 0 end
+                + case when s.type_norm = p_type then 1 else 0 end)     as base_score,
+               (s.city_norm <> p_city
+                and p_fallback_city is not null
+                and s.city_norm = p_fallback_city)                     as is_fallback
+        from sold s
+        where s.final_price > 0 and s.size > 0
+    ),
+    bounded as (
+        -- Best and worst possible score for any size in [p_size_low, p_size_high]
+        select sc.*,
+               sc.base_score - greatest(p_size_low - sc.size,
+                                        sc.size - coalesce(p_size_high, p_size_low),
+                                        0) / 10.0                      as upper_score,
+               sc.base_score - greatest(abs(p_size_low - sc.size),
+                                        abs(coalesce(p_size_high, p_size_low) - sc.size)) / 10.0
+                                                                       as lower_score
+        from scored sc
+    ),
+    threshold as (
+        -- K-th highest worst-case score: rows that cannot beat it never reach the top K
+        select b.lower_score as value
+        from bounded b
+        order by b.lower_score desc
+        offset greatest(p_k - 1, 0)
+        limit 1
+    )
+    select b.property_id,
+           b.city,
+           b.base_score,
+           b.size,
+           b.final_price / b.size,
+           b.is_fallback,
+           (select count(*) from sold s where s.city_norm = p_city)
+    from bounded b
+    where b.upper_score >= coalesce((select t.value from threshold t), '-infinity'::double precision)
+    order by b.upper_score desc, b.property_id;
+$$;
+
+create or replace function public.sold_city_counts(p_min_count integer default 1)
+returns table (
+    city            text,
+    province        text,
+    property_count  bigint
+)
+language sql
+stable
+as $$
+    select lower(btrim(coalesce(p.city::text, ''))),
+           btrim(coalesce(p.province::text, '')),
+           count(*)
+    from public."Property" p
+    where p.sold and p.final_price is not null
+    group by 1, 2
+    having count(*) >= p_min_count;
+$$;
+
+-- Supabase exposes functions to the API roles only when they may execute them
+do $$
+begin
+    if exists (select 1 from pg_roles where rolname = 'anon') then
+        grant execute on function public.estimate_price_knn(text, text, text, double precision, double precision, text, integer)
+            to anon, authenticated, service_role;
+        grant execute on function public.sold_city_counts(integer)
+            to anon, authenticated, service_role;
+    end if;
+end
+$$;
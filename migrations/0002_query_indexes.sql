@@ -0,0 +1,92 @@
+-- migrations/0002_query_indexes.sql
+-- Indexes for the query shapes used by routes.py and models.py.
+-- Check that they are used with scripts/explain_queries.py.
+--
+--   /api/properties          sold = false, plus optional province =, city ilike '%x%',
+--                            type ilike 'x', size >=, price_min <=
+--   price estimator          sold = true and final_price is not null
+--   /api/my-properties       "propertyOwner_id" =
+--   interest lookups         Property_Interest (property_id =, developer_id =)
+--   registration / login     Developer and Property owner by email or phone_number
+--
+-- The tables are small, so the indexes are built inside the migration
+-- transaction (no CREATE INDEX CONCURRENTLY).
+
+-- Trigram matching for the substring (ilike) city filter.
+-- Supabase keeps extensions in the "extensions" schema, plain Postgres in public.
+do $$
+begin
+    if exists (select 1 from pg_namespace where nspname = 'extensions') then
+        create extension if not exists pg_trgm with schema extensions;
+    else
+        create extension if not exists pg_trgm;
+    end if;
+end
+$$;
+
+-- ----- Property: developer browsing (unsold listings only) -----
+
+create index if not exists property_unsold_province_size_idx
+    on public."Property" (province, size)
+    where sold = false;
+
+create index if not exists property_unsold_size_idx
+    on public."Property" (size)
+    where sold = false;
+
+create index if not exists property_unsold_price_min_idx
+    on public."Property" (price_min)
+    where sold = false;
+
+create index if not exists property_unsold_city_trgm_idx
+    on public."Property" using gin (city gin_trgm_ops)
+    where sold = false;
+
+-- type ilike 'x' has no index of its own: the column has two values, so the
+-- filter keeps about half the rows and is applied on top of the others.
+
+-- ----- Property: price estimator comparables -----
+
+create index if not exists property_sold_city_province_idx
+    on public."Property" (city, province)
+    where sold = true and final_price is not null;
+
+-- ----- Property: owner dashboard -----
+
+create index if not exists property_owner_id_idx
+    on public."Property" ("propertyOwner_id");
+
+-- ----- Property_Interest: one row per (property, developer) -----
+
+-- Remove duplicates left by the old check-then-insert race before adding the constraint
+delete from public."Property_Interest" a
+    using public."Property_Interest" b
+    where a.property_id = b.property_id
+      and a.developer_id = b.developer_id
+      and a.ctid > b.ctid;
+
+do $$
+begin
+    if not exists (
+        select 1 from pg_constraint
+        where conname = 'property_interest_property_developer_key'
+    ) then
+        alter table public."Property_Interest"
+            add constraint property_interest_property_developer_key unique (property_id, developer_id);
+    end if;
+end
+$$;
+
+-- ----- Accounts: registration duplicate checks and login -----
+
+create index if not exists developer_email_idx
+    on public."Developer" (email);
+
+create index if not exists developer_phone_number_idx
+    on public."Developer" (phone_number);
+
+create index if not exists property_owner_email_idx
+    on public."Property owner" (email);
+
+create index if not exists property_owner_phone_number_idx
+    on public."Property owner" (phone_number);
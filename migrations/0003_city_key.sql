@@ -0,0 +1,25 @@
+-- migrations/0003_city_key.sql
+-- Canonical city key for filtering (see canonical_city in models.py).
+--
+-- city_key holds the lowercase canonical name (the BELGIAN_CITIES key for
+-- known cities); city keeps the display name. /api/properties filters with
+-- city_key = 'gent' for known cities and city_key like 'sint-%' for partially
+-- typed names, both served by one btree index. text_pattern_ops makes the
+-- prefix match indexable under any database collation.
+--
+-- Existing rows get a plain lowercase key here so the filter works right
+-- away; scripts/backfill_city_keys.py then rewrites them with the app's
+-- canonicalization and display names.
+
+alter table public."Property" add column if not exists city_key text;
+
+update public."Property"
+set city_key = lower(regexp_replace(btrim(city), '\s+', ' ', 'g'))
+where city_key is null and city is not null;
+
+create index if not exists property_unsold_city_key_idx
+    on public."Property" (city_key text_pattern_ops)
+    where sold = false;
+
+-- The substring (ilike '%city%') filter is gone, so its trigram index only costs writes
+drop index if exists public.property_unsold_city_trgm_idx;
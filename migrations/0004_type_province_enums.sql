@@ -0,0 +1,181 @@
+-- migrations/0004_type_province_enums.sql
+-- Property.type and Property.province as Postgres enums (see PropertyType /
+-- Province and normalize_property_type / normalize_province in models.py).
+--
+-- type used to be stored as typed ('Land', 'land', ' building'), so
+-- /api/properties matched it with ilike and the estimator lowercased every
+-- row it scored. After this migration both columns only hold canonical
+-- values, filters use plain equality and the scoring functions compare
+-- city_key / province / type without any per-row normalization.
+--
+--   type      'land' | 'building' (NULL and unknown values become 'land',
+--             the default submit_property already used)
+--   province  Province values; empty or unknown values become NULL
+
+do $$
+begin
+    if not exists (select 1 from pg_type where typname = 'property_type' and typnamespace = 'public'::regnamespace) then
+        create type public.property_type as enum ('land', 'building');
+    end if;
+    if not exists (select 1 from pg_type where typname = 'province' and typnamespace = 'public'::regnamespace) then
+        create type public.province as enum (
+            'Antwerpen', 'Brussel', 'Henegouwen', 'Limburg', 'Luik', 'Luxemburg', 'Namen',
+            'Oost-Vlaanderen', 'Vlaams-Brabant', 'Waals-Brabant', 'West-Vlaanderen'
+        );
+    end if;
+end
+$$;
+
+-- ----- Normalize existing data -----
+
+update public."Property"
+set type = case when lower(btrim(type::text)) = 'building' then 'building' else 'land' end
+where type is null or type::text not in ('land', 'building');
+
+update public."Property" p
+set province = e.enumlabel
+from pg_enum e
+where e.enumtypid = 'public.province'::regtype
+  and lower(btrim(p.province::text)) = lower(e.enumlabel)
+  and p.province::text <> e.enumlabel;
+
+do $$
+declare
+    cleared integer;
+begin
+    update public."Property"
+    set province = null
+    where province is not null
+      and province::text not in (select enumlabel from pg_enum where enumtypid = 'public.province'::regtype);
+    get diagnostics cleared = row_count;
+    if cleared > 0 then
+        raise notice 'Cleared % unrecognized province value(s)', cleared;
+    end if;
+end
+$$;
+
+-- ----- Convert the columns -----
+
+alter table public."Property"
+    alter column type type public.property_type using type::text::public.property_type,
+    alter column type set default 'land',
+    alter column type set not null,
+    alter column province type public.province using province::text::public.province;
+
+-- type is now an indexable equality filter: fold it into the province index
+-- (province, then type, then the size range). type alone keeps about half the
+-- rows and is not worth an index of its own.
+drop index if exists public.property_unsold_province_size_idx;
+
+create index if not exists property_unsold_province_type_size_idx
+    on public."Property" (province, type, size)
+    where sold = false;
+
+-- Sold comparables are grouped and matched on city_key now, not on the display name
+drop index if exists public.property_sold_city_province_idx;
+
+create index if not exists property_sold_city_key_province_idx
+    on public."Property" (city_key, province)
+    where sold = true and final_price is not null;
+
+-- ----- Scoring functions: plain equality on canonical values -----
+
+create or replace function public.estimate_price_knn(
+    p_city          text,
+    p_province      text,
+    p_type          text,
+    p_size_low      double precision,
+    p_size_high     double precision default null,
+    p_fallback_city text default null,
+    p_k             integer default 5
+)
+returns table (
+    property_id     bigint,
+    city            text,
+    base_score      integer,
+    size            double precision,
+    price_per_m2    double precision,
+    is_fallback     boolean,
+    same_city_count bigint
+)
+language sql
+stable
+as $$
+    with sold as (
+        select p.property_id::bigint            as property_id,
+               p.city::text                     as city,
+               p.city_key                       as city_key,
+               p.province::text                 as province,
+               p.type::text                     as type,
+               p.size::double precision         as size,
+               p.final_price::double precision  as final_price
+        from public."Property" p
+        where p.sold and p.final_price is not null
+    ),
+    scored as (
+        select s.property_id,
+               s.city,
+               s.size,
+               s.final_price,
+               (case
+                    when s.city_key = p_city then 4
+                    when p_fallback_city is not null and s.city_key = p_fallback_city then 3
+                    when s.province = p_province then 1
+                    else 0
+                end
+                + case when s.province = p_province then 2 else 0 end
+                + case when s.type = p_type then 1 else 0 end)         as base_score,
+               (s.city_key is distinct from p_city
+                and p_fallback_city is not null
+                and s.city_key = p_fallback_city)                      as is_fallback
+        from sold s
+        where s.final_price > 0 and s.size > 0
+    ),
+    bounded as (
+        -- Best and worst possible score for any size in [p_size_low, p_size_high]
+        select sc.*,
+               sc.base_score - greatest(p_size_low - sc.size,
+                                        sc.size - coalesce(p_size_high, p_size_low),
+                                        0) / 10.0                      as upper_score,
+               sc.base_score - greatest(abs(p_size_low - sc.size),
+                                        abs(coalesce(p_size_high, p_size_low) - sc.size)) / 10.0
+                                                                       as lower_score
+        from scored sc
+    ),
+    threshold as (
+        -- K-th highest worst-case score: rows that cannot beat it never reach the top K
+        select b.lower_score as value
+        from bounded b
+        order by b.lower_score desc
+        offset greatest(p_k - 1, 0)
+        limit 1
+    )
+    select b.property_id,
+           b.city,
+           b.base_score,
+           b.size,
+           b.final_price / b.size,
+           b.is_fallback,
+           (select count(*) from sold s where s.city_key = p_city)
+    from bounded b
+    where b.upper_score >= coalesce((select t.value from threshold t), '-infinity'::double precision)
+    order by b.upper_score desc, b.property_id;
+$$;
+
+create or replace function public.sold_city_counts(p_min_count integer default 1)
+returns table (
+    city            text,
+    province        text,
+    property_count  bigint
+)
+language sql
+stable
+as $$
+    select coalesce(p.city_key, ''),
+           coalesce(p.province::text, ''),
+           count(*)
+    from public."Property" p
+    where p.sold and p.final_price is not null
+    group by 1, 2
+    having count(*) >= p_min_count;
+$$;
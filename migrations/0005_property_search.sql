@@ -0,0 +1,31 @@
+-- migrations/0005_property_search.sql
+-- Full-text search over Property.property_name and Property.description for
+-- the q parameter of /api/properties.
+--
+-- search_vector(Property) is a PostgREST computed field: it can be filtered
+-- on like a column (?search_vector=plfts(simple).corner%20plot, or
+-- .filter('search_vector', 'plfts(simple)', q) in supabase-py) but is not
+-- part of select *, so the API rows stay unchanged. The function is plain
+-- SQL and immutable, so the planner inlines it and matches the expression
+-- GIN index below.
+--
+-- The 'simple' configuration lowercases words without stemming or stop
+-- words: listings are written in Dutch, French and English, and the in-memory
+-- fallback (text_search.py) tokenizes the same way. Names weigh more than
+-- descriptions (A vs B) for ts_rank.
+
+create or replace function public.search_vector(p public."Property")
+returns tsvector
+language sql
+immutable
+as $$
+    select setweight(to_tsvector('simple'::regconfig, coalesce(p.property_name, '')), 'A')
+        || setweight(to_tsvector('simple'::regconfig, coalesce(p.description, '')), 'B');
+$$;
+
+create index if not exists property_unsold_search_idx
+    on public."Property" using gin ((
+        setweight(to_tsvector('simple'::regconfig, coalesce(property_name, '')), 'A')
+        || setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'B')
+    ))
+    where sold = false;
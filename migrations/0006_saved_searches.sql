@@ -0,0 +1,32 @@
+-- migrations/0006_saved_searches.sql
+-- Saved searches and their inbox (see SAVED SEARCHES in models.py).
+--
+-- Saved_Search.filters holds the /api/properties query parameters of the
+-- search (province, city, type, min_size, max_price, near_city, radius_km,
+-- q). The app matches every new listing against all saved searches in memory
+-- and inserts one Saved_Search_Match row per match; match_id only grows, so
+-- /api/saved-searches/inbox?since=<match_id> returns just the new matches.
+
+create table if not exists public."Saved_Search" (
+    saved_search_id bigint generated by default as identity primary key,
+    developer_id    bigint not null references public."Developer" (developer_id) on delete cascade,
+    name            text not null,
+    filters         jsonb not null default '{}'::jsonb,
+    created_at      timestamptz not null default now()
+);
+
+create index if not exists saved_search_developer_idx
+    on public."Saved_Search" (developer_id);
+
+create table if not exists public."Saved_Search_Match" (
+    match_id        bigint generated by default as identity primary key,
+    saved_search_id bigint not null references public."Saved_Search" (saved_search_id) on delete cascade,
+    developer_id    bigint not null references public."Developer" (developer_id) on delete cascade,
+    property_id     bigint not null references public."Property" (property_id) on delete cascade,
+    created_at      timestamptz not null default now(),
+    constraint saved_search_match_search_property_key unique (saved_search_id, property_id)
+);
+
+-- Inbox: a developer's matches after a cursor, in match_id order
+create index if not exists saved_search_match_developer_idx
+    on public."Saved_Search_Match" (developer_id, match_id);
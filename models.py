@@ -4,11 +4,31 @@ import mimetypes
 import random
 import math
 import time
+import threading
 import requests
 from enum import Enum
 from datetime import datetime
 from supabase import create_client, Client
 from dotenv import load_dotenv
+from price_aggregates import PriceAggregateStore
+from listing_index import ListingIndex
+from spatial_index import CityGridIndex
+from city_suggest import CitySuggestIndex, MAX_SUGGESTIONS
+from text_search import query_terms
+from saved_searches import SavedSearchIndex
+from events import EventBus
+from postgrest.exceptions import APIError
+from resilience import ResilientClient, client_options, note_shared_failure, is_dependency_failure
+from singleflight import SingleFlight
+from swr_cache import StaleWhileRevalidateCache
+from cache_backends import Cache, cache_backend
+from belgian_cities import (
+    BELGIAN_CITIES,
+    CITY_TO_PROVINCE,
+    canonical_city,
+    is_known_city,
+    city_display_name
+)
 
 # Load environment variables from .env
 load_dotenv()
@@ -33,785 +53,83 @@ class Province(Enum):
     WEST_VLAANDEREN = "West-Vlaanderen"
 
 
+# Stored values: the type column holds the lowercase enum value ('land', 'building'),
+# the province column the Province value as is (see migrations/0004_type_province_enums.sql)
+_PROPERTY_TYPES = {t.value.lower(): t.value.lower() for t in PropertyType}
+_PROVINCES = {p.value.lower(): p.value for p in Province}
+
+
+def normalize_property_type(value) -> str:
+    """
+    Normalize a property type to its stored value.
+
+    Returns:
+        'land' or 'building' (case-insensitive match), or None when invalid or empty
+    """
+    return _PROPERTY_TYPES.get((value or '').strip().lower())
+
+
+def normalize_province(value) -> str:
+    """
+    Normalize a province name to its Province value.
+
+    Returns:
+        The Province value (case-insensitive match), or None when invalid or empty
+    """
+    return _PROVINCES.get((value or '').strip().lower())
+
+
 # Initialize Supabase
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise RuntimeError("Supabase credentials not found. Add SUPABASE_URL and SUPABASE_KEY to your .env")
+# Optional local data stand-in (benchmarks, load tests, offline development)
+SUPABASE_LOCAL_DATA = os.getenv("SUPABASE_LOCAL_DATA")
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Database functions that only read (see migrations/): their calls may be retried
+READ_ONLY_FUNCTIONS = {'estimate_price_knn', 'sold_city_counts'}
 
+if SUPABASE_LOCAL_DATA:
+    from local_db import LocalSupabase
+    _client = LocalSupabase.from_json(SUPABASE_LOCAL_DATA)
+else:
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise RuntimeError("Supabase credentials not found. Add SUPABASE_URL and SUPABASE_KEY to your .env")
 
-# =============================================================================
-# PRE-CACHED BELGIAN CITY COORDINATES
-# =============================================================================
-# All 581 Belgian municipalities with their coordinates (lat, lon)
-# This eliminates the need for API calls and makes lookups instant
-# Source: Belgian National Geographic Institute
-
-BELGIAN_CITIES = {
-    # ANTWERPEN PROVINCE
-    "aartselaar": (51.1333, 4.3833),
-    "antwerpen": (51.2194, 4.4025),
-    "boechout": (51.1575, 4.4983),
-    "boom": (51.0903, 4.3697),
-    "borsbeek": (51.1939, 4.4833),
-    "brasschaat": (51.2917, 4.4917),
-    "brecht": (51.3500, 4.6333),
-    "edegem": (51.1583, 4.4417),
-    "essen": (51.4667, 4.4667),
-    "hemiksem": (51.1458, 4.3392),
-    "hove": (51.1533, 4.4733),
-    "kalmthout": (51.3833, 4.4667),
-    "kapellen": (51.3167, 4.4333),
-    "kontich": (51.1333, 4.4500),
-    "lint": (51.1286, 4.4897),
-    "malle": (51.3000, 4.6833),
-    "mortsel": (51.1667, 4.4500),
-    "niel": (51.1167, 4.3333),
-    "ranst": (51.1917, 4.5583),
-    "rumst": (51.0833, 4.4167),
-    "schelle": (51.1250, 4.3417),
-    "schilde": (51.2333, 4.5667),
-    "schoten": (51.2500, 4.5000),
-    "stabroek": (51.3333, 4.3667),
-    "wijnegem": (51.2167, 4.5167),
-    "wommelgem": (51.2000, 4.5167),
-    "wuustwezel": (51.3833, 4.6000),
-    "zandhoven": (51.2167, 4.6667),
-    "zoersel": (51.2667, 4.7000),
-    "zwijndrecht": (51.2167, 4.3333),
-    "arendonk": (51.3167, 5.0833),
-    "baarle-hertog": (51.4333, 4.9333),
-    "balderel": (51.0333, 4.7500),
-    "beerse": (51.3167, 4.8500),
-    "dessel": (51.2333, 5.1167),
-    "geel": (51.1667, 4.9833),
-    "grobbendonk": (51.1833, 4.7333),
-    "herentals": (51.1833, 4.8333),
-    "herenthout": (51.1500, 4.7667),
-    "herselt": (51.0500, 4.8833),
-    "hoogstraten": (51.4000, 4.7667),
-    "hulshout": (51.0667, 4.7833),
-    "kasterlee": (51.2333, 4.9667),
-    "laakdal": (51.0833, 4.9667),
-    "lille": (51.2333, 4.8167),
-    "meerhout": (51.1333, 5.0833),
-    "merksplas": (51.3667, 4.8667),
-    "mol": (51.1833, 5.1167),
-    "olen": (51.1500, 4.8667),
-    "oud-turnhout": (51.3167, 4.9833),
-    "ravels": (51.4000, 5.0167),
-    "retie": (51.2667, 5.0833),
-    "rijkevorsel": (51.3500, 4.7500),
-    "turnhout": (51.3167, 4.9500),
-    "vorselaar": (51.2000, 4.7667),
-    "vosselaar": (51.3167, 4.8833),
-    "westerlo": (51.0833, 4.9167),
-    "berlaar": (51.1167, 4.6500),
-    "bonheiden": (51.0333, 4.5333),
-    "bornem": (51.1000, 4.2333),
-    "duffel": (51.0917, 4.5083),
-    "heist-op-den-berg": (51.0833, 4.7167),
-    "lier": (51.1333, 4.5667),
-    "mechelen": (51.0333, 4.4833),
-    "nijlen": (51.1500, 4.6667),
-    "putte": (51.0500, 4.6333),
-    "puurs-sint-amands": (51.0667, 4.2833),
-    "sint-katelijne-waver": (51.0667, 4.5333),
-    "willebroek": (51.0667, 4.3667),
-    
-    # BRUSSEL (BRUSSELS CAPITAL REGION)
-    "anderlecht": (50.8333, 4.3167),
-    "brussel": (50.8503, 4.3517),
-    "brussels": (50.8503, 4.3517),
-    "bruxelles": (50.8503, 4.3517),
-    "elsene": (50.8333, 4.3667),
-    "ixelles": (50.8333, 4.3667),
-    "etterbeek": (50.8333, 4.3833),
-    "evere": (50.8667, 4.4000),
-    "ganshoren": (50.8667, 4.3167),
-    "jette": (50.8833, 4.3333),
-    "koekelberg": (50.8667, 4.3333),
-    "oudergem": (50.8167, 4.4167),
-    "auderghem": (50.8167, 4.4167),
-    "schaarbeek": (50.8667, 4.3833),
-    "schaerbeek": (50.8667, 4.3833),
-    "sint-agatha-berchem": (50.8667, 4.2833),
-    "berchem-sainte-agathe": (50.8667, 4.2833),
-    "sint-gillis": (50.8333, 4.3500),
-    "saint-gilles": (50.8333, 4.3500),
-    "sint-jans-molenbeek": (50.8500, 4.3333),
-    "molenbeek-saint-jean": (50.8500, 4.3333),
-    "sint-joost-ten-node": (50.8500, 4.3667),
-    "saint-josse-ten-noode": (50.8500, 4.3667),
-    "sint-lambrechts-woluwe": (50.8500, 4.4333),
-    "woluwe-saint-lambert": (50.8500, 4.4333),
-    "sint-pieters-woluwe": (50.8333, 4.4333),
-    "woluwe-saint-pierre": (50.8333, 4.4333),
-    "ukkel": (50.8000, 4.3333),
-    "uccle": (50.8000, 4.3333),
-    "vorst": (50.8167, 4.3167),
-    "forest": (50.8167, 4.3167),
-    "watermaal-bosvoorde": (50.8000, 4.4167),
-    "watermael-boitsfort": (50.8000, 4.4167),
-    
-    # HENEGOUWEN (HAINAUT)
-    "aat": (50.6333, 3.7833),
-    "ath": (50.6333, 3.7833),
-    "beaumont": (50.2333, 4.2333),
-    "Bergen": (50.4542, 3.9514),
-    "mons": (50.4542, 3.9514),
-    "binche": (50.4167, 4.1667),
-    "boussu": (50.4333, 3.8000),
-    "braine-le-comte": (50.6000, 4.1333),
-    "brugelette": (50.6000, 3.8500),
-    "charleroi": (50.4108, 4.4447),
-    "châtelet": (50.4000, 4.5167),
-    "chièvres": (50.5833, 3.8000),
-    "chimay": (50.0500, 4.3167),
-    "colfontaine": (50.4000, 3.8500),
-    "comines-warneton": (50.7667, 3.0000),
-    "courcelles": (50.4500, 4.3667),
-    "dour": (50.3833, 3.7833),
-    "ecaussinnes": (50.5667, 4.1667),
-    "ellezelles": (50.7333, 3.6833),
-    "enghien": (50.7000, 4.0333),
-    "erquelinnes": (50.3000, 4.1167),
-    "estaimpuis": (50.7000, 3.2667),
-    "estinnes": (50.3833, 4.1000),
-    "farciennes": (50.4333, 4.5500),
-    "fleurus": (50.4833, 4.5500),
-    "fontaine-l'évêque": (50.4167, 4.3333),
-    "frameries": (50.4167, 3.8833),
-    "frasnes-lez-anvaing": (50.6833, 3.5833),
-    "froidchapelle": (50.1500, 4.3333),
-    "gerpinnes": (50.3333, 4.5333),
-    "ham-sur-heure-nalinnes": (50.3167, 4.4000),
-    "hensies": (50.4333, 3.6833),
-    "honnelles": (50.3500, 3.7167),
-    "jurbise": (50.5333, 3.9167),
-    "la louvière": (50.4833, 4.1833),
-    "le roeulx": (50.5000, 4.1167),
-    "lens": (50.5500, 3.9000),
-    "les bons villers": (50.5000, 4.4167),
-    "lessines": (50.7167, 3.8333),
-    "leuze-en-hainaut": (50.6000, 3.6167),
-    "lobbes": (50.3500, 4.2667),
-    "manage": (50.5000, 4.2333),
-    "merbes-le-château": (50.3167, 4.1667),
-    "momignies": (50.0333, 4.1667),
-    "mont-de-l'enclus": (50.7500, 3.5167),
-    "montigny-le-tilleul": (50.3833, 4.3667),
-    "morlanwelz": (50.4500, 4.2333),
-    "mouscron": (50.7333, 3.2167),
-    "pecq": (50.6833, 3.3333),
-    "péruwelz": (50.5167, 3.5833),
-    "pont-à-celles": (50.5000, 4.3667),
-    "quaregnon": (50.4333, 3.8667),
-    "quévy": (50.3667, 3.9500),
-    "quiévrain": (50.4000, 3.6833),
-    "rumes": (50.5333, 3.3000),
-    "saint-ghislain": (50.4500, 3.8167),
-    "seneffe": (50.5333, 4.2667),
-    "silly": (50.6500, 3.9167),
-    "sivry-rance": (50.1667, 4.2333),
-    "soignies": (50.5833, 4.0667),
-    "thuin": (50.3333, 4.2833),
-    "tournai": (50.6000, 3.3833),
-    "doornik": (50.6000, 3.3833),
-    
-    # LIMBURG
-    "alken": (50.8833, 5.3000),
-    "as": (51.0000, 5.5833),
-    "beringen": (51.0500, 5.2167),
-    "bilzen": (50.8667, 5.5167),
-    "bocholt": (51.1667, 5.5833),
-    "borgloon": (50.8000, 5.3500),
-    "bree": (51.1333, 5.6000),
-    "diepenbeek": (50.9167, 5.4167),
-    "dilsen-stokkem": (51.0333, 5.7167),
-    "genk": (50.9667, 5.5000),
-    "gingelom": (50.7500, 5.1333),
-    "halen": (50.9500, 5.1167),
-    "ham": (51.1000, 5.1667),
-    "hamont-achel": (51.2500, 5.5333),
-    "hasselt": (50.9311, 5.3378),
-    "hechtel-eksel": (51.1167, 5.3667),
-    "heers": (50.7667, 5.3000),
-    "herk-de-stad": (50.9333, 5.1667),
-    "herstappe": (50.7500, 5.4333),
-    "hoeselt": (50.8500, 5.4833),
-    "houthalen-helchteren": (51.0333, 5.3667),
-    "kinrooi": (51.1500, 5.7500),
-    "kortessem": (50.8667, 5.3833),
-    "lanaken": (50.8833, 5.6500),
-    "leopoldsburg": (51.1167, 5.2500),
-    "lommel": (51.2333, 5.3000),
-    "lummen": (50.9833, 5.2000),
-    "maaseik": (51.1000, 5.7833),
-    "maasmechelen": (50.9667, 5.7000),
-    "nieuwerkerken": (50.8500, 5.1500),
-    "oudsbergen": (51.0667, 5.5500),
-    "peer": (51.1333, 5.4500),
-    "pelt": (51.2167, 5.4333),
-    "riemst": (50.8000, 5.6000),
-    "sint-truiden": (50.8167, 5.1833),
-    "tessenderlo": (51.0667, 5.0833),
-    "tongeren": (50.7833, 5.4667),
-    "voeren": (50.7500, 5.8167),
-    "wellen": (50.8500, 5.3333),
-    "zonhoven": (50.9833, 5.3667),
-    "zutendaal": (50.9333, 5.5833),
-    
-    # LUIK (LIÈGE)
-    "amay": (50.5500, 5.3167),
-    "amel": (50.3500, 6.1833),
-    "ans": (50.6667, 5.5167),
-    "anthisnes": (50.4833, 5.5167),
-    "aubel": (50.7000, 5.8500),
-    "awans": (50.6667, 5.4500),
-    "aywaille": (50.4667, 5.6667),
-    "baelen": (50.6333, 5.9667),
-    "bassenge": (50.7667, 5.6167),
-    "berloz": (50.7000, 5.2167),
-    "beyne-heusay": (50.6167, 5.6667),
-    "blegny": (50.6667, 5.7333),
-    "braives": (50.6333, 5.1333),
-    "büllingen": (50.4167, 6.2833),
-    "burdinne": (50.5833, 5.0833),
-    "burg-reuland": (50.1833, 6.1333),
-    "bütgenbach": (50.4167, 6.2000),
-    "chaudfontaine": (50.5833, 5.6333),
-    "clavier": (50.4000, 5.3667),
-    "comblain-au-pont": (50.4833, 5.5833),
-    "crisnée": (50.7167, 5.5000),
-    "dalhem": (50.7000, 5.7333),
-    "dison": (50.6167, 5.8500),
-    "donceel": (50.6833, 5.3333),
-    "engis": (50.5833, 5.4000),
-    "esneux": (50.5333, 5.5667),
-    "eupen": (50.6333, 6.0333),
-    "faimes": (50.6833, 5.2500),
-    "ferrières": (50.4000, 5.6167),
-    "fexhe-le-haut-clocher": (50.6833, 5.4167),
-    "flémalle": (50.6000, 5.4667),
-    "fléron": (50.6167, 5.6833),
-    "geer": (50.7000, 5.1667),
-    "grâce-hollogne": (50.6333, 5.5000),
-    "hamoir": (50.4333, 5.5333),
-    "hannut": (50.6833, 5.0833),
-    "héron": (50.5500, 5.1000),
-    "herstal": (50.6667, 5.6333),
-    "herve": (50.6333, 5.7833),
-    "jalhay": (50.5500, 5.9667),
-    "juprelle": (50.7167, 5.5333),
-    "kelmis": (50.7000, 6.0167),
-    "la calamine": (50.7000, 6.0167),
-    "liège": (50.6333, 5.5667),
-    "luik": (50.6333, 5.5667),
-    "lierneux": (50.2833, 5.7833),
-    "limbourg": (50.6167, 5.9333),
-    "lincent": (50.7167, 5.0333),
-    "lontzen": (50.6667, 6.0000),
-    "malmedy": (50.4333, 6.0333),
-    "marchin": (50.4667, 5.2333),
-    "modave": (50.4500, 5.3000),
-    "nandrin": (50.5000, 5.4167),
-    "neupré": (50.5333, 5.4833),
-    "olne": (50.5833, 5.7500),
-    "oreye": (50.7167, 5.3500),
-    "ouffet": (50.4333, 5.4500),
-    "oupeye": (50.7167, 5.6500),
-    "pepinster": (50.5667, 5.8000),
-    "plombières": (50.7333, 5.9667),
-    "raeren": (50.6667, 6.1167),
-    "remicourt": (50.6833, 5.3000),
-    "saint-georges-sur-meuse": (50.5833, 5.3333),
-    "saint-nicolas": (50.6333, 5.5333),
-    "sankt vith": (50.2833, 6.1333),
-    "seraing": (50.5833, 5.5000),
-    "soumagne": (50.6167, 5.7500),
-    "spa": (50.4833, 5.8667),
-    "sprimont": (50.5000, 5.6333),
-    "stavelot": (50.3833, 5.9333),
-    "stoumont": (50.4000, 5.8000),
-    "theux": (50.5333, 5.8167),
-    "thimister-clermont": (50.6500, 5.8667),
-    "tinlot": (50.4833, 5.3667),
-    "trois-ponts": (50.3667, 5.8667),
-    "trooz": (50.5667, 5.7000),
-    "verlaine": (50.6167, 5.3167),
-    "verviers": (50.5833, 5.8667),
-    "villers-le-bouillet": (50.5833, 5.2500),
-    "visé": (50.7333, 5.7000),
-    "waimes": (50.4167, 6.1167),
-    "wanze": (50.5333, 5.2167),
-    "waremme": (50.7000, 5.2500),
-    "wasseiges": (50.6167, 5.0000),
-    "welkenraedt": (50.6667, 5.9667),
-    
-    # LUXEMBURG
-    "arlon": (49.6833, 5.8167),
-    "aarlen": (49.6833, 5.8167),
-    "attert": (49.7500, 5.7833),
-    "aubange": (49.5667, 5.7667),
-    "bastogne": (50.0000, 5.7167),
-    "bastenaken": (50.0000, 5.7167),
-    "bertogne": (50.0833, 5.6667),
-    "bertrix": (49.8500, 5.2500),
-    "bouillon": (49.7833, 5.0667),
-    "chiny": (49.7333, 5.3333),
-    "daverdisse": (49.9833, 5.1167),
-    "durbuy": (50.3500, 5.4500),
-    "érezée": (50.3000, 5.5500),
-    "étalle": (49.6667, 5.6000),
-    "fauvillers": (49.8667, 5.6667),
-    "florenville": (49.7000, 5.3167),
-    "gouvy": (50.1833, 5.9500),
-    "habay": (49.7167, 5.6167),
-    "herbeumont": (49.7833, 5.2333),
-    "hotton": (50.2667, 5.4500),
-    "houffalize": (50.1333, 5.7833),
-    "la roche-en-ardenne": (50.1833, 5.5833),
-    "léglise": (49.8000, 5.5333),
-    "libin": (49.9833, 5.2500),
-    "libramont-chevigny": (49.9167, 5.3833),
-    "manhay": (50.3000, 5.6833),
-    "marche-en-famenne": (50.2167, 5.3500),
-    "martelange": (49.8333, 5.7333),
-    "meix-devant-virton": (49.6167, 5.4833),
-    "messancy": (49.5833, 5.8167),
-    "musson": (49.5500, 5.7000),
-    "nassogne": (50.1333, 5.3500),
-    "neufchâteau": (49.8500, 5.4333),
-    "paliseul": (49.9000, 5.1333),
-    "rendeux": (50.2333, 5.5000),
-    "rouvroy": (49.5500, 5.4833),
-    "sainte-ode": (50.0167, 5.5167),
-    "saint-hubert": (50.0333, 5.3833),
-    "saint-léger": (49.6167, 5.6500),
-    "tellin": (50.0667, 5.2167),
-    "tenneville": (50.0833, 5.5333),
-    "tintigny": (49.6833, 5.5167),
-    "vaux-sur-sûre": (49.9167, 5.6000),
-    "vielsalm": (50.2833, 5.9167),
-    "virton": (49.5667, 5.5333),
-    "wellin": (50.0833, 5.1167),
-    
-    # NAMEN (NAMUR)
-    "andenne": (50.4833, 5.1000),
-    "anhée": (50.3167, 4.8833),
-    "assesse": (50.3667, 4.9833),
-    "beauraing": (50.1167, 4.9500),
-    "bièvre": (49.9333, 5.0000),
-    "cerfontaine": (50.1667, 4.4000),
-    "ciney": (50.3000, 5.1000),
-    "couvin": (50.0500, 4.4833),
-    "dinant": (50.2667, 4.9167),
-    "doische": (50.1333, 4.7333),
-    "eghezée": (50.5833, 4.9167),
-    "fernelmont": (50.5333, 4.9500),
-    "floreffe": (50.4333, 4.7500),
-    "florennes": (50.2500, 4.6000),
-    "fosses-la-ville": (50.3833, 4.7000),
-    "gedinne": (49.9833, 4.9333),
-    "gembloux": (50.5667, 4.7000),
-    "gesves": (50.4000, 5.0667),
-    "hamois": (50.3333, 5.1667),
-    "hastière": (50.2167, 4.8333),
-    "havelange": (50.3833, 5.2333),
-    "houyet": (50.1833, 5.0000),
-    "jemeppe-sur-sambre": (50.4167, 4.6667),
-    "la bruyère": (50.5167, 4.7667),
-    "mettet": (50.3167, 4.6500),
-    "namen": (50.4667, 4.8667),
-    "namur": (50.4667, 4.8667),
-    "ohey": (50.4333, 5.1333),
-    "onhaye": (50.2333, 4.8333),
-    "philippeville": (50.2000, 4.5500),
-    "profondeville": (50.3833, 4.8667),
-    "rochefort": (50.1500, 5.2167),
-    "sambreville": (50.4500, 4.6167),
-    "sombreffe": (50.5333, 4.6000),
-    "somme-leuze": (50.3000, 5.3000),
-    "viroinval": (50.0667, 4.6000),
-    "vresse-sur-semois": (49.8667, 4.9333),
-    "walcourt": (50.2500, 4.4333),
-    "yvoir": (50.3333, 4.8667),
-    
-    # OOST-VLAANDEREN (EAST FLANDERS)
-    "aalst": (50.9333, 4.0333),
-    "aalter": (51.0833, 3.4500),
-    "berlare": (51.0333, 3.9833),
-    "beveren": (51.2167, 4.2500),
-    "brakel": (50.8000, 3.7500),
-    "buggenhout": (51.0167, 4.2000),
-    "deinze": (50.9833, 3.5333),
-    "denderleeuw": (50.8833, 4.0667),
-    "dendermonde": (51.0333, 4.1000),
-    "destelbergen": (51.0500, 3.8000),
-    "eeklo": (51.1833, 3.5667),
-    "erpe-mere": (50.9333, 3.9500),
-    "evergem": (51.1000, 3.7000),
-    "gavere": (50.9333, 3.6667),
-    "gent": (51.0500, 3.7167),
-    "geraardsbergen": (50.7667, 3.8833),
-    "haaltert": (50.9000, 4.0000),
-    "hamme": (51.1000, 4.1333),
-    "herzele": (50.8833, 3.8833),
-    "horebeke": (50.8500, 3.6833),
-    "kaprijke": (51.2000, 3.6167),
-    "kluisbergen": (50.7833, 3.5167),
-    "kruibeke": (51.1667, 4.3000),
-    "kruisem": (50.9167, 3.5167),
-    "laarne": (51.0333, 3.8500),
-    "lebbeke": (51.0000, 4.1333),
-    "lede": (50.9667, 3.9833),
-    "lierde": (50.8333, 3.8167),
-    "lochristi": (51.1000, 3.8333),
-    "lokeren": (51.1000, 3.9833),
-    "lievegem": (51.1167, 3.5667),
-    "maarkedal": (50.8000, 3.6333),
-    "maldegem": (51.2000, 3.4333),
-    "melle": (51.0000, 3.8000),
-    "merelbeke": (51.0000, 3.7500),
-    "moerbeke": (51.1833, 3.9333),
-    "nazareth": (50.9667, 3.6000),
-    "ninove": (50.8333, 4.0333),
-    "oosterzele": (50.9500, 3.8167),
-    "oudenaarde": (50.8500, 3.6000),
-    "ronse": (50.7500, 3.6000),
-    "sint-gillis-waas": (51.2167, 4.1167),
-    "sint-lievens-houtem": (50.9167, 3.8667),
-    "sint-martens-latem": (51.0000, 3.6333),
-    "sint-niklaas": (51.1500, 4.1333),
-    "stekene": (51.2167, 4.0333),
-    "temse": (51.1333, 4.2167),
-    "waasmunster": (51.1000, 4.0833),
-    "wachtebeke": (51.1667, 3.8667),
-    "wetteren": (51.0000, 3.8833),
-    "wichelen": (51.0000, 3.9667),
-    "wortegem-petegem": (50.8667, 3.5667),
-    "zele": (51.0667, 4.0333),
-    "zottegem": (50.8667, 3.8167),
-    "zulte": (50.9333, 3.4500),
-    "zwalm": (50.8833, 3.7167),
-    
-    # VLAAMS-BRABANT (FLEMISH BRABANT)
-    "aarschot": (50.9833, 4.8333),
-    "affligem": (50.9167, 4.1167),
-    "asse": (50.9167, 4.2000),
-    "beersel": (50.7667, 4.3000),
-    "begijnendijk": (51.0167, 4.7833),
-    "bekkevoort": (50.9667, 4.9500),
-    "bertem": (50.8667, 4.6167),
-    "bever": (50.7500, 3.9500),
-    "bierbeek": (50.8333, 4.7667),
-    "boortmeerbeek": (50.9833, 4.5667),
-    "boutersem": (50.8333, 4.8333),
-    "diest": (50.9833, 5.0500),
-    "dilbeek": (50.8500, 4.2500),
-    "drogenbos": (50.7833, 4.3167),
-    "galmaarden": (50.7500, 4.0500),
-    "geetbets": (50.9167, 5.1000),
-    "glabbeek": (50.8833, 4.9500),
-    "gooik": (50.7833, 4.1333),
-    "grimbergen": (50.9333, 4.3667),
-    "haacht": (50.9833, 4.6333),
-    "halle": (50.7333, 4.2333),
-    "herent": (50.9000, 4.6667),
-    "herne": (50.7333, 4.0333),
-    "hoegaarden": (50.7833, 4.8833),
-    "hoeilaart": (50.7667, 4.4667),
-    "holsbeek": (50.9167, 4.7667),
-    "huldenberg": (50.7833, 4.5833),
-    "kampenhout": (50.9500, 4.5500),
-    "kapelle-op-den-bos": (51.0000, 4.3667),
-    "keerbergen": (51.0000, 4.6333),
-    "kortenaken": (50.9167, 5.0667),
-    "kortenberg": (50.8833, 4.5333),
-    "kraainem": (50.8667, 4.4667),
-    "landen": (50.7500, 5.0833),
-    "lennik": (50.8000, 4.1500),
-    "leuven": (50.8798, 4.7005),
-    "liedekerke": (50.8667, 4.0833),
-    "linkebeek": (50.7667, 4.3333),
-    "linter": (50.8333, 5.0500),
-    "londerzeel": (51.0000, 4.3000),
-    "lubbeek": (50.8833, 4.8333),
-    "machelen": (50.9167, 4.4333),
-    "meise": (50.9333, 4.3333),
-    "merchtem": (50.9500, 4.2333),
-    "opwijk": (50.9667, 4.1833),
-    "oud-heverlee": (50.8333, 4.6667),
-    "overijse": (50.7833, 4.5333),
-    "pepingen": (50.7500, 4.1500),
-    "roosdaal": (50.8500, 4.0667),
-    "rotselaar": (50.9667, 4.7167),
-    "scherpenheuvel-zichem": (51.0000, 4.9833),
-    "sint-genesius-rode": (50.7500, 4.3500),
-    "sint-pieters-leeuw": (50.7833, 4.2500),
-    "steenokkerzeel": (50.9167, 4.5167),
-    "ternat": (50.8667, 4.1667),
-    "tervuren": (50.8167, 4.5167),
-    "tielt-winge": (50.9333, 4.9000),
-    "tienen": (50.8000, 4.9333),
-    "tremelo": (50.9833, 4.7000),
-    "vilvoorde": (50.9333, 4.4333),
-    "wemmel": (50.9167, 4.3000),
-    "wezembeek-oppem": (50.8500, 4.4833),
-    "zaventem": (50.8833, 4.4667),
-    "zemst": (50.9833, 4.4500),
-    "zoutleeuw": (50.8333, 5.1000),
-    
-    # WAALS-BRABANT (WALLOON BRABANT)
-    "beauvechain": (50.7833, 4.7667),
-    "braine-l'alleud": (50.6833, 4.3667),
-    "eigenbrakel": (50.6833, 4.3667),
-    "braine-le-château": (50.6833, 4.2667),
-    "chastre": (50.6000, 4.6333),
-    "chaumont-gistoux": (50.6833, 4.7167),
-    "court-saint-etienne": (50.6333, 4.5667),
-    "grez-doiceau": (50.7333, 4.7000),
-    "hélécine": (50.7500, 4.9667),
-    "incourt": (50.7000, 4.8000),
-    "ittre": (50.6333, 4.2667),
-    "jodoigne": (50.7167, 4.8667),
-    "geldenaken": (50.7167, 4.8667),
-    "la hulpe": (50.7333, 4.4833),
-    "lasne": (50.7000, 4.5000),
-    "mont-saint-guibert": (50.6333, 4.6167),
-    "nivelles": (50.6000, 4.3333),
-    "nijvel": (50.6000, 4.3333),
-    "orp-jauche": (50.7167, 4.9500),
-    "ottignies-louvain-la-neuve": (50.6667, 4.5667),
-    "perwez": (50.6333, 4.8000),
-    "ramillies": (50.6333, 4.9000),
-    "rebecq": (50.6667, 4.1333),
-    "rixensart": (50.7167, 4.5333),
-    "tubize": (50.6833, 4.2000),
-    "villers-la-ville": (50.5667, 4.5333),
-    "walhain": (50.6167, 4.7000),
-    "waterloo": (50.7167, 4.3833),
-    "wavre": (50.7167, 4.6000),
-    "waver": (50.7167, 4.6000),
-    
-    # WEST-VLAANDEREN (WEST FLANDERS)
-    "anzegem": (50.8500, 3.4667),
-    "ardooie": (50.9667, 3.2000),
-    "avelgem": (50.7833, 3.4500),
-    "beernem": (51.1333, 3.3333),
-    "blankenberge": (51.3167, 3.1333),
-    "bredene": (51.2333, 2.9667),
-    "brugge": (51.2167, 3.2333),
-    "damme": (51.2500, 3.2833),
-    "de haan": (51.2833, 3.0333),
-    "de panne": (51.1000, 2.5833),
-    "deerlijk": (50.8500, 3.3500),
-    "dentergem": (50.9667, 3.4167),
-    "diksmuide": (51.0333, 2.8667),
-    "harelbeke": (50.8500, 3.3000),
-    "heuvelland": (50.7833, 2.8000),
-    "hooglede": (50.9833, 3.0833),
-    "houthulst": (50.9833, 2.9500),
-    "ichtegem": (51.1000, 3.0167),
-    "ieper": (50.8500, 2.8833),
-    "ypres": (50.8500, 2.8833),
-    "ingelmunster": (50.9167, 3.2500),
-    "izegem": (50.9167, 3.2167),
-    "jabbeke": (51.1833, 3.0833),
-    "knokke-heist": (51.3500, 3.2833),
-    "koekelare": (51.0833, 2.9667),
-    "koksijde": (51.1167, 2.6500),
-    "kortemark": (51.0167, 3.0500),
-    "kortrijk": (50.8333, 3.2667),
-    "kuurne": (50.8500, 3.2833),
-    "langemark-poelkapelle": (50.9167, 2.9167),
-    "ledegem": (50.8667, 3.1167),
-    "lendelede": (50.8833, 3.2333),
-    "lichtervelde": (51.0333, 3.1500),
-    "lo-reninge": (50.9667, 2.7333),
-    "menen": (50.8000, 3.1167),
-    "mesen": (50.7667, 2.9000),
-    "meulebeke": (50.9500, 3.2833),
-    "middelkerke": (51.1833, 2.8167),
-    "moorslede": (50.8833, 3.0667),
-    "nieuwpoort": (51.1333, 2.7500),
-    "oostende": (51.2333, 2.9167),
-    "oostkamp": (51.1500, 3.2333),
-    "oostrozebeke": (50.9333, 3.3500),
-    "oudenburg": (51.1833, 3.0000),
-    "poperinge": (50.8500, 2.7167),
-    "roeselare": (50.9500, 3.1333),
-    "ruiselede": (51.0500, 3.3833),
-    "spiere-helkijn": (50.7167, 3.3500),
-    "staden": (50.9833, 3.0167),
-    "tielt": (51.0000, 3.3333),
-    "torhout": (51.0667, 3.1000),
-    "veurne": (51.0667, 2.6667),
-    "vleteren": (50.9167, 2.7333),
-    "waregem": (50.8833, 3.4333),
-    "wervik": (50.7833, 3.0333),
-    "wevelgem": (50.8167, 3.1833),
-    "wielsbeke": (50.9000, 3.3833),
-    "wingene": (51.0667, 3.2833),
-    "zedelgem": (51.1333, 3.1333),
-    "zonnebeke": (50.8667, 2.9833),
-    "zuienkerke": (51.2667, 3.1500),
-    "zwevegem": (50.8167, 3.3333),
-}
+    _client: Client = create_client(SUPABASE_URL, SUPABASE_KEY, options=client_options())
 
-# =============================================================================
-# CITY TO PROVINCE MAPPING
-# =============================================================================
-# Maps each city to its province (using Province enum values)
-
-CITY_TO_PROVINCE = {
-    # ANTWERPEN
-    **{city: "Antwerpen" for city in [
-        "aartselaar", "antwerpen", "boechout", "boom", "borsbeek", "brasschaat", "brecht",
-        "edegem", "essen", "hemiksem", "hove", "kalmthout", "kapellen", "kontich", "lint",
-        "malle", "mortsel", "niel", "ranst", "rumst", "schelle", "schilde", "schoten",
-        "stabroek", "wijnegem", "wommelgem", "wuustwezel", "zandhoven", "zoersel", "zwijndrecht",
-        "arendonk", "baarle-hertog", "balderel", "beerse", "dessel", "geel", "grobbendonk",
-        "herentals", "herenthout", "herselt", "hoogstraten", "hulshout", "kasterlee", "laakdal",
-        "lille", "meerhout", "merksplas", "mol", "olen", "oud-turnhout", "ravels", "retie",
-        "rijkevorsel", "turnhout", "vorselaar", "vosselaar", "westerlo", "berlaar", "bonheiden",
-        "bornem", "duffel", "heist-op-den-berg", "lier", "mechelen", "nijlen", "putte",
-        "puurs-sint-amands", "sint-katelijne-waver", "willebroek"
-    ]},
-    # BRUSSEL
-    **{city: "Brussel" for city in [
-        "anderlecht", "brussel", "brussels", "bruxelles", "elsene", "ixelles", "etterbeek",
-        "evere", "ganshoren", "jette", "koekelberg", "oudergem", "auderghem", "schaarbeek",
-        "schaerbeek", "sint-agatha-berchem", "berchem-sainte-agathe", "sint-gillis", "saint-gilles",
-        "sint-jans-molenbeek", "molenbeek-saint-jean", "sint-joost-ten-node", "saint-josse-ten-noode",
-        "sint-lambrechts-woluwe", "woluwe-saint-lambert", "sint-pieters-woluwe", "woluwe-saint-pierre",
-        "ukkel", "uccle", "vorst", "forest", "watermaal-bosvoorde", "watermael-boitsfort"
-    ]},
-    # HENEGOUWEN
-    **{city: "Henegouwen" for city in [
-        "aat", "ath", "beaumont", "bergen", "mons", "binche", "boussu", "braine-le-comte",
-        "brugelette", "charleroi", "châtelet", "chièvres", "chimay", "colfontaine",
-        "comines-warneton", "courcelles", "dour", "ecaussinnes", "ellezelles", "enghien",
-        "erquelinnes", "estaimpuis", "estinnes", "farciennes", "fleurus", "fontaine-l'évêque",
-        "frameries", "frasnes-lez-anvaing", "froidchapelle", "gerpinnes", "ham-sur-heure-nalinnes",
-        "hensies", "honnelles", "jurbise", "la louvière", "le roeulx", "lens", "les bons villers",
-        "lessines", "leuze-en-hainaut", "lobbes", "manage", "merbes-le-château", "momignies",
-        "mont-de-l'enclus", "montigny-le-tilleul", "morlanwelz", "mouscron", "pecq", "péruwelz",
-        "pont-à-celles", "quaregnon", "quévy", "quiévrain", "rumes", "saint-ghislain", "seneffe",
-        "silly", "sivry-rance", "soignies", "thuin", "tournai", "doornik"
-    ]},
-    # LIMBURG
-    **{city: "Limburg" for city in [
-        "alken", "as", "beringen", "bilzen", "bocholt", "borgloon", "bree", "diepenbeek",
-        "dilsen-stokkem", "genk", "gingelom", "halen", "ham", "hamont-achel", "hasselt",
-        "hechtel-eksel", "heers", "herk-de-stad", "herstappe", "hoeselt", "houthalen-helchteren",
-        "kinrooi", "kortessem", "lanaken", "leopoldsburg", "lommel", "lummen", "maaseik",
-        "maasmechelen", "nieuwerkerken", "oudsbergen", "peer", "pelt", "riemst", "sint-truiden",
-        "tessenderlo", "tongeren", "voeren", "wellen", "zonhoven", "zutendaal"
-    ]},
-    # LUIK
-    **{city: "Luik" for city in [
-        "amay", "amel", "ans", "anthisnes", "aubel", "awans", "aywaille", "baelen", "bassenge",
-        "berloz", "beyne-heusay", "blégny", "braives", "büllingen", "burdinne", "burg-reuland",
-        "chaudfontaine", "clavier", "comblain-au-pont", "crisnée", "dalhem", "dison", "donceel",
-        "engis", "esneux", "eupen", "faimes", "ferrières", "fexhe-le-haut-clocher", "flémalle",
-        "fléron", "geer", "grâce-hollogne", "hamoir", "hannut", "héron", "herstal", "herve",
-        "jalhay", "juprelle", "kelmis", "liège", "luik", "lierneux", "limbourg", "lincent",
-        "lontzen", "malmedy", "marchin", "modave", "nandrin", "neupré", "olne", "oreye",
-        "ouffet", "oupeye", "pepinster", "plombières", "raeren", "remicourt", "saint-georges-sur-meuse",
-        "saint-nicolas", "sankt vith", "seraing", "soumagne", "spa", "sprimont", "stavelot",
-        "stoumont", "theux", "thimister-clermont", "tinlot", "trois-ponts", "trooz", "verlaine",
-        "verviers", "villers-le-bouillet", "visé", "waimes", "wanze", "wasseiges", "welkenraedt"
-    ]},
-    # LUXEMBURG
-    **{city: "Luxemburg" for city in [
-        "arlon", "aarlen", "attert", "aubange", "bastogne", "bastenaken", "bertogne", "bertrix",
-        "bouillon", "chiny", "daverdisse", "durbuy", "érezée", "étalle", "fauvillers", "florenville",
-        "gouvy", "habay", "herbeumont", "hotton", "houffalize", "la roche-en-ardenne", "léglise",
-        "libin", "libramont-chevigny", "manhay", "marche-en-famenne", "martelange", "meix-devant-virton",
-        "messancy", "musson", "nassogne", "neufchâteau", "paliseul", "rendeux", "rouvroy",
-        "sainte-ode", "saint-hubert", "saint-léger", "tellin", "tenneville", "tintigny",
-        "vaux-sur-sûre", "vielsalm", "virton", "wellin"
-    ]},
-    # NAMEN
-    **{city: "Namen" for city in [
-        "andenne", "anhée", "assesse", "beauraing", "bièvre", "cerfontaine", "ciney", "couvin",
-        "dinant", "doische", "éghezée", "fernelmont", "floreffe", "florennes", "fosses-la-ville",
-        "gedinne", "gembloux", "gesves", "hamois", "hastière", "havelange", "houyet", "jemeppe-sur-sambre",
-        "la bruyère", "mettet", "namen", "namur", "ohey", "onhaye", "philippeville", "profondeville",
-        "rochefort", "sambreville", "sombreffe", "somme-leuze", "viroinval", "vresse-sur-semois",
-        "walcourt", "yvoir"
-    ]},
-    # OOST-VLAANDEREN
-    **{city: "Oost-Vlaanderen" for city in [
-        "aalst", "aalter", "assenede", "berlare", "beveren", "brakel", "buggenhout", "denderleeuw",
-        "dendermonde", "destelbergen", "deinze", "eeklo", "erpe-mere", "evergem", "gavere", "gent",
-        "geraardsbergen", "haaltert", "hamme", "herzele", "horebeke", "kaprijke", "kluisbergen",
-        "kruibeke", "kruisem", "laarne", "lebbeke", "lede", "lierde", "lochristi", "lokeren",
-        "lievegem", "maarkedal", "maldegem", "melle", "merelbeke", "moerbeke", "nazareth",
-        "ninove", "oosterzele", "oudenaarde", "ronse", "sint-gillis-waas", "sint-lievens-houtem",
-        "sint-martens-latem", "sint-niklaas", "stekene", "temse", "waasmunster", "wachtebeke",
-        "wetteren", "wichelen", "wortegem-petegem", "zele", "zelzate", "zottegem", "zulte", "zwalm"
-    ]},
-    # VLAAMS-BRABANT
-    **{city: "Vlaams-Brabant" for city in [
-        "aarschot", "affligem", "asse", "beersel", "begijnendijk", "bekkevoort", "bertem",
-        "bever", "bierbeek", "boortmeerbeek", "boutersem", "diest", "dilbeek", "drogenbos",
-        "galmaarden", "geetbets", "glabbeek", "gooik", "grimbergen", "haacht", "halle",
-        "herent", "herne", "hoegaarden", "hoeilaart", "holsbeek", "huldenberg", "kampenhout",
-        "kapelle-op-den-bos", "keerbergen", "kortenaken", "kortenberg", "kraainem", "landen",
-        "lennik", "leuven", "liedekerke", "linkebeek", "linter", "londerzeel", "lubbeek",
-        "machelen", "meise", "merchtem", "opwijk", "oud-heverlee", "overijse", "pepingen",
-        "roosdaal", "rotselaar", "scherpenheuvel-zichem", "sint-genesius-rode", "sint-pieters-leeuw",
-        "steenokkerzeel", "ternat", "tervuren", "tielt-winge", "tienen", "tremelo", "vilvoorde",
-        "wemmel", "wezembeek-oppem", "zaventem", "zemst", "zoutleeuw"
-    ]},
-    # WAALS-BRABANT
-    **{city: "Waals-Brabant" for city in [
-        "beauvechain", "braine-l'alleud", "braine-le-château", "chastre", "chaumont-gistoux",
-        "court-saint-étienne", "genappe", "graven", "hélécine", "incourt", "ittre", "jodoigne",
-        "la hulpe", "lasne", "mont-saint-guibert", "nivelles", "nijvel", "orp-jauche", "ottignies-louvain-la-neuve",
-        "perwez", "ramillies", "rebecq", "rixensart", "tubize", "villers-la-ville", "walhain",
-        "waterloo", "wavre", "waver"
-    ]},
-    # WEST-VLAANDEREN
-    **{city: "West-Vlaanderen" for city in [
-        "alveringem", "anzegem", "ardooie", "avelgem", "beernem", "blankenberge", "bredene",
-        "brugge", "damme", "de haan", "de panne", "deerlijk", "dentergem", "diksmuide",
-        "harelbeke", "heuvelland", "hooglede", "houthulst", "ichtegem", "ieper", "ingelmunster",
-        "izegem", "jabbeke", "knokke-heist", "koekelare", "koksijde", "kortemark", "kortrijk",
-        "kuurne", "langemark-poelkapelle", "ledegem", "lendelede", "lichtervelde", "lo-reninge",
-        "menen", "mesen", "meulebeke", "middelkerke", "moorslede", "nieuwpoort", "oostende",
-        "oostkamp", "oostrozebeke", "oudenburg", "pittem", "poperinge", "roeselare", "ruiselede",
-        "spiere-helkijn", "staden", "tielt", "torhout", "veurne", "vleteren", "waregem",
-        "wervik", "wevelgem", "wielsbeke", "wingene", "zedelgem", "zonnebeke", "zuienkerke", "zwevegem"
-    ]},
-}
+# Timeouts, per-request deadline, retries of reads and a circuit breaker (see resilience.py)
+supabase = ResilientClient(_client, read_only_functions=READ_ONLY_FUNCTIONS)
 
 
 # =============================================================================
 # GEOCODING WITH PRE-CACHED DATA + NOMINATIM FALLBACK
 # =============================================================================
 
-# Runtime cache for cities not in the pre-cached list
-_coordinates_cache = {}
+GEOCODE_CACHE_SIZE = 4096              # entries kept in process
+GEOCODE_CACHE_TTL = 30 * 24 * 3600     # seconds
+
+# Runtime cache for cities not in the pre-cached list (shared by the workers
+# depending on CACHE_BACKEND, see cache_backends.py)
+coordinates_cache = Cache('geocode', cache_backend(GEOCODE_CACHE_SIZE), ttl=GEOCODE_CACHE_TTL)
 
 # Rate limiting: Nominatim requires max 1 request per second
 _last_nominatim_request = 0
 
+# Concurrent lookups of the same uncached city share one Nominatim request
+_geocode_flight = SingleFlight('geocode')
+
 
 def get_city_coordinates(city: str, province: str = None) -> dict:
     """
     Fetch latitude and longitude for a Belgian city.
     
     LOOKUP ORDER:
-    1. Check pre-cached BELGIAN_CITIES dictionary (instant, ~580 cities)
+    1. Check pre-cached BELGIAN_CITIES dictionary (instant, ~600 cities,
+       also under their other names: see canonical_city())
     2. Check runtime cache (for previously looked up cities)
-    3. Fall back to Nominatim API (rate limited, 1 req/sec)
+    3. Fall back to Nominatim API (rate limited, 1 req/sec; concurrent
+       lookups of the same city share one request)
     
     Args:
         city: Name of the city
@@ -820,10 +138,8 @@ def get_city_coordinates(city: str, province: str = None) -> dict:
     Returns:
         Dictionary with 'lat' and 'lon' keys, or None if city not found
     """
-    global _last_nominatim_request
-    
-    # Normalize city name
-    city_normalized = city.strip().lower()
+    # Normalize city name (exonyms, sub-municipalities and accent-free spellings -> BELGIAN_CITIES key)
+    city_normalized = canonical_city(city)
     
     # Step 1: Check pre-cached Belgian cities (INSTANT)
     if city_normalized in BELGIAN_CITIES:
@@ -833,11 +149,19 @@ def get_city_coordinates(city: str, province: str = None) -> dict:
     
     # Step 2: Check runtime cache
     cache_key = f"{city_normalized}|{province or 'any'}"
-    if cache_key in _coordinates_cache:
-        cached = _coordinates_cache[cache_key]
+    cached = coordinates_cache.get(cache_key)
+    if cached is not None:
         print(f"[GEOCODE CACHE HIT] {city} -> ({cached['lat']}, {cached['lon']})")
         return {'lat': cached['lat'], 'lon': cached['lon']}
     
+    # Step 3: Nominatim
+    return _geocode_flight.do(cache_key, lambda: _geocode_nominatim(city, province, cache_key))
+
+
+def _geocode_nominatim(city: str, province: str, cache_key: str) -> dict:
+    """Look up a city with Nominatim and cache the answer under cache_key"""
+    global _last_nominatim_request
+    
     # Respect rate limit: wait if needed (1 request per second)
     current_time = time.time()
     time_since_last_request = current_time - _last_nominatim_request
@@ -878,18 +202,18 @@ def get_city_coordinates(city: str, province: str = None) -> dict:
                 lon = float(data[0]['lon'])
                 
                 # Cache the result
-                _coordinates_cache[cache_key] = {
+                coordinates_cache.set(cache_key, {
                     'lat': lat,
                     'lon': lon,
                     'cached_at': time.time()
-                }
+                })
                 
                 print(f"[GEOCODE API] Found: {city} -> ({lat}, {lon})")
                 return {'lat': lat, 'lon': lon}
             else:
                 print(f"[GEOCODE API] No results found for: {city}, {province}")
                 # Cache negative result to avoid repeated failed lookups
-                _coordinates_cache[cache_key] = {'lat': None, 'lon': None, 'cached_at': time.time()}
+                coordinates_cache.set(cache_key, {'lat': None, 'lon': None, 'cached_at': time.time()})
                 return None
         else:
             print(f"[GEOCODE API] Error: HTTP {response.status_code}")
@@ -942,6 +266,513 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     return EARTH_RADIUS_KM * c
 
 
+# =============================================================================
+# RADIUS SEARCH
+# =============================================================================
+# Grid index over the BELGIAN_CITIES coordinates, keyed on canonical city key
+# (the key stored in Property.city_key), for the near_city / radius_km filter
+# of /api/properties.
+
+NEAR_CITY_DEFAULT_RADIUS_KM = 10
+NEAR_CITY_MAX_RADIUS_KM = 100
+
+city_spatial_index = CityGridIndex({
+    canonical_city(city): coordinates for city, coordinates in BELGIAN_CITIES.items()
+})
+
+
+def cities_within_radius(city: str, radius_km: float) -> dict:
+    """
+    Find the known cities within radius_km of a city.
+    
+    Args:
+        city: Center city name (any spelling canonical_city() accepts)
+        radius_km: Search radius in kilometers
+    
+    Returns:
+        Dict of canonical city key -> distance in km, nearest first (the
+        center itself at 0), or None when the center is not in BELGIAN_CITIES
+    """
+    center = city_spatial_index.coordinates(canonical_city(city))
+    if center is None:
+        return None
+    return city_spatial_index.within(center[0], center[1], radius_km)
+
+
+# =============================================================================
+# CITY SUGGESTIONS
+# =============================================================================
+# Autocomplete and "did you mean" for city names (/api/cities/suggest and
+# /api/validate-city). The index is built on first use.
+
+CITY_SUGGESTIONS_DEFAULT = 8
+CITY_SUGGESTIONS_MAX = MAX_SUGGESTIONS
+
+_city_suggest_index = None
+_city_suggest_lock = threading.Lock()
+
+
+def suggest_cities(query: str, limit: int = CITY_SUGGESTIONS_DEFAULT) -> list:
+    """
+    Suggest known cities for a partial or misspelled name.
+    
+    Args:
+        query: What the user typed
+        limit: Maximum number of suggestions
+    
+    Returns:
+        List of dicts with city (display name), city_key, province and
+        match ('prefix', or 'fuzzy' for typo corrections), best first
+    """
+    global _city_suggest_index
+    if _city_suggest_index is None:
+        with _city_suggest_lock:
+            if _city_suggest_index is None:
+                _city_suggest_index = CitySuggestIndex(canonical_city(city) for city in BELGIAN_CITIES)
+    
+    return [
+        {
+            'city': city_display_name(city_key),
+            'city_key': city_key,
+            'province': CITY_TO_PROVINCE.get(city_key),
+            'match': match
+        }
+        for city_key, match in _city_suggest_index.suggest(query, limit)
+    ]
+
+
+# =============================================================================
+# LISTING FILTERS
+# =============================================================================
+# The filters of /api/properties, also stored as the parameters of saved
+# searches (see SAVED SEARCHES below).
+
+def parse_listing_filters(args):
+    """
+    Parse the /api/properties query parameters into normalized filters.
+    
+    Returns:
+        Tuple (filters, error): filters is a dict with province, property_type,
+        city_key, city_prefix, min_size, max_price, near_cities and
+        search_terms (None when not given; near_cities maps city keys within
+        radius_km of near_city to their distance, search_terms holds the words
+        of q); error is a message for invalid province/type/radius values,
+        otherwise None
+    """
+    filters = {'province': None, 'property_type': None, 'city_key': None,
+               'city_prefix': None, 'min_size': None, 'max_price': None,
+               'near_cities': None, 'search_terms': None}
+    
+    province = args.get('province', '')
+    if province:
+        filters['province'] = normalize_province(province)
+        if filters['province'] is None:
+            return None, "Invalid province"
+    
+    prop_type = args.get('type', '')
+    if prop_type:
+        filters['property_type'] = normalize_property_type(prop_type)
+        if filters['property_type'] is None:
+            return None, "Invalid property type"
+    
+    city_key = canonical_city(args.get('city', ''))
+    if city_key:
+        if is_known_city(city_key):
+            filters['city_key'] = city_key
+        else:
+            # Partially typed names ("sint-") match every city starting with them
+            filters['city_prefix'] = city_key
+    
+    near_city = args.get('near_city', '')
+    if near_city:
+        try:
+            radius_km = float(args.get('radius_km') or NEAR_CITY_DEFAULT_RADIUS_KM)
+        except ValueError:
+            return None, "Invalid radius"
+        if not 0 <= radius_km <= NEAR_CITY_MAX_RADIUS_KM:
+            return None, f"Radius must be between 0 and {NEAR_CITY_MAX_RADIUS_KM} km"
+        filters['near_cities'] = cities_within_radius(near_city, radius_km)
+        if filters['near_cities'] is None:
+            return None, "Unknown city"
+    
+    # A q without any words (only punctuation) does not filter
+    search_terms = query_terms(args.get('q', ''))
+    if search_terms:
+        filters['search_terms'] = search_terms
+    
+    # Unparseable numbers are ignored, as before
+    try:
+        if args.get('min_size'):
+            filters['min_size'] = int(args.get('min_size'))
+    except ValueError:
+        pass
+    try:
+        if args.get('max_price'):
+            filters['max_price'] = float(args.get('max_price'))
+    except ValueError:
+        pass
+    
+    return filters, None
+
+
+# =============================================================================
+# PAGED QUERIES
+# =============================================================================
+
+FETCH_PAGE_SIZE = 1000  # PostgREST returns at most 1000 rows per request by default
+
+
+def fetch_all_rows(build_query, page_size: int = FETCH_PAGE_SIZE) -> list:
+    """
+    Fetch every row of a query, page by page.
+    
+    Args:
+        build_query: function returning a fresh query ordered on a unique column
+        page_size: rows per request
+    
+    Returns:
+        List of all rows
+    """
+    rows = []
+    start = 0
+    while True:
+        page = build_query().range(start, start + page_size - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        start += page_size
+
+
+# =============================================================================
+# SOLD PROPERTY SNAPSHOT (INCREMENTAL AGGREGATES)
+# =============================================================================
+# The estimator and the fallback used to fetch and regroup the whole sold table
+# on every call. The snapshot is now loaded once into a PriceAggregateStore and
+# updated incrementally by /api/mark-sold (record_sold_property) and by deleting
+# a sold property (forget_sold_property).
+#
+# Other gunicorn workers do not see those incremental updates, so the snapshot
+# is rebuilt from the database once it is older than SOLD_SNAPSHOT_MAX_AGE, or
+# as soon as another worker invalidated the (shared) estimate cache.
+
+SOLD_SNAPSHOT_MAX_AGE = 300  # seconds
+
+sold_aggregates = PriceAggregateStore()
+
+# A cold or expired snapshot requested by several threads is fetched only once
+_sold_snapshot_flight = SingleFlight('sold snapshot', on_shared_error=note_shared_failure)
+
+# Estimate cache generation the snapshot is up to date with
+_sold_snapshot_generation = None
+
+
+def load_sold_aggregates(force: bool = False) -> PriceAggregateStore:
+    """
+    Return the sold-property aggregates, (re)building them from the database when needed.
+    
+    Raises:
+        Exception: when the database query fails
+    """
+    if (not force and sold_aggregates.is_fresh(SOLD_SNAPSHOT_MAX_AGE)
+            and estimate_cache.generation() == _sold_snapshot_generation):
+        return sold_aggregates
+    
+    return _sold_snapshot_flight.do('sold', _rebuild_sold_aggregates)
+
+
+def _rebuild_sold_aggregates() -> PriceAggregateStore:
+    global _sold_snapshot_generation
+    generation = estimate_cache.generation()
+    rows = fetch_all_rows(
+        lambda: supabase.table('Property').select('*').eq('sold', True).not_.is_('final_price', 'null').order('property_id')
+    )
+    first_load = sold_aggregates.loaded_at is None
+    changed = sold_aggregates.rebuild(rows)
+    if changed and not first_load and generation == _sold_snapshot_generation:
+        # Rows changed outside the app and nobody announced it yet: cached
+        # estimates are no longer trustworthy. When the generation moved, the
+        # worker that changed the rows already bumped it; bumping again would
+        # make every other worker rebuild (and bump) in turn.
+        bump_dataset_version()
+    else:
+        _sold_snapshot_generation = generation
+    return sold_aggregates
+
+
+def record_sold_property(row: dict):
+    """Add a freshly sold property to the aggregates and invalidate cached estimates"""
+    if sold_aggregates.loaded_at is not None:
+        sold_aggregates.record_sale(row)
+    bump_dataset_version()
+
+
+def forget_sold_property(property_id: int):
+    """Remove a (deleted) sold property from the aggregates and invalidate cached estimates"""
+    sold_aggregates.remove(property_id)
+    bump_dataset_version()
+
+
+# =============================================================================
+# UNSOLD LISTING INDEX
+# =============================================================================
+# /api/properties is answered from an in-memory ListingIndex of the unsold
+# properties. The write routes update it incrementally (record_listing /
+# forget_listing); other gunicorn workers do not see those updates, so the
+# index is rebuilt from the database once it is older than LISTING_INDEX_MAX_AGE.
+# Set LISTING_INDEX=off to always query the database.
+
+LISTING_INDEX_ENABLED = os.getenv('LISTING_INDEX', 'on').lower() != 'off'
+LISTING_INDEX_MAX_AGE = 60  # seconds
+
+listing_index = ListingIndex()
+_listing_rebuild_lock = threading.Lock()
+
+# Listing cache generation the index is up to date with (see LISTING RESULT CACHE)
+_listing_index_generation = None
+
+
+def load_listing_index(force: bool = False) -> ListingIndex:
+    """
+    Return the listing index, rebuilding it from the database when it is stale
+    (too old, or another worker changed a listing and purged the listing cache).
+    
+    While one request rebuilds a stale index, other requests keep using the
+    current one; only the very first load makes them wait.
+    
+    Raises:
+        Exception: when the database query fails
+    """
+    global _listing_index_generation
+    if not force and _listing_index_is_fresh():
+        return listing_index
+    
+    blocking = listing_index.loaded_at is None or force
+    if not _listing_rebuild_lock.acquire(blocking=blocking):
+        return listing_index
+    try:
+        if not force and _listing_index_is_fresh():
+            return listing_index
+        generation = listing_cache.store.generation()
+        listing_index.begin_rebuild()
+        try:
+            rows = fetch_unsold_rows()
+        except Exception:
+            listing_index.rebuild_cancelled()
+            raise
+        listing_index.rebuild(rows)
+        _listing_index_generation = generation
+        return listing_index
+    finally:
+        _listing_rebuild_lock.release()
+
+
+def _listing_index_is_fresh() -> bool:
+    return (listing_index.is_fresh(LISTING_INDEX_MAX_AGE)
+            and listing_cache.store.generation() == _listing_index_generation)
+
+
+def fetch_unsold_rows() -> list:
+    """All unsold properties, straight from the database"""
+    return fetch_all_rows(lambda: supabase.table('Property').select('*').eq('sold', False).order('property_id'))
+
+
+def build_listing_index() -> ListingIndex:
+    """A one-off ListingIndex built from the database (used when LISTING_INDEX=off)"""
+    index = ListingIndex()
+    index.rebuild(fetch_unsold_rows())
+    return index
+
+
+def record_listing(row: dict):
+    """Add or refresh a property in the listing index after it was written"""
+    if listing_index.loaded_at is not None:
+        listing_index.upsert(row)
+    purge_listing_cache()
+
+
+def forget_listing(property_id: int):
+    """Remove a deleted or sold property from the listing index"""
+    if listing_index.loaded_at is not None:
+        listing_index.remove(property_id)
+    purge_listing_cache()
+
+
+def purge_listing_cache():
+    """
+    Drop the cached listing results of every worker after a change this
+    worker's listing index already has (other workers rebuild theirs).
+    """
+    global _listing_index_generation
+    _listing_index_generation = listing_cache.purge()
+
+
+# =============================================================================
+# LISTING RESULT CACHE
+# =============================================================================
+# Browsing repeats a few filter combinations (everything, one province, one
+# type). The ordered matches of each combination are cached in a
+# StaleWhileRevalidateCache keyed on the parsed filters (routes.listing_results):
+# after LISTING_CACHE_SOFT_TTL seconds they are still served while a background
+# thread refreshes them, after LISTING_CACHE_HARD_TTL they are recomputed
+# inline. The write routes purge the cache through record_listing /
+# forget_listing. With a shared CACHE_BACKEND the purge reaches every worker,
+# which then also rebuilds its listing index; otherwise other workers see the
+# writes after at most the hard TTL (plus the age of their listing index).
+# Set LISTING_CACHE=off to compute every request.
+
+LISTING_CACHE_ENABLED = os.getenv('LISTING_CACHE', 'on').lower() != 'off'
+LISTING_CACHE_SOFT_TTL = 10   # seconds
+LISTING_CACHE_HARD_TTL = 120  # seconds
+LISTING_CACHE_SIZE = 256      # filter combinations
+
+listing_cache = StaleWhileRevalidateCache(
+    Cache('listings', cache_backend(LISTING_CACHE_SIZE), ttl=LISTING_CACHE_HARD_TTL),
+    LISTING_CACHE_SOFT_TTL, LISTING_CACHE_HARD_TTL,
+)
+
+
+# =============================================================================
+# SAVED SEARCHES
+# =============================================================================
+# Developers save a set of /api/properties filters (Saved_Search.filters holds
+# the query parameters). Every new listing is matched against all saved
+# searches with a SavedSearchIndex and each match is stored in
+# Saved_Search_Match, which is the developers' inbox.
+#
+# Each worker keeps its own index: searches saved through other workers are
+# fetched before matching (their ids are higher than any indexed one) and the
+# whole index is rebuilt once it is older than SAVED_SEARCH_MAX_AGE.
+
+SAVED_SEARCH_MAX_AGE = 60  # seconds
+SAVED_SEARCH_PARAMS = ('province', 'city', 'type', 'min_size', 'max_price', 'near_city', 'radius_km', 'q')
+SAVED_SEARCHES_PER_DEVELOPER = 20
+
+saved_search_index = SavedSearchIndex()
+_saved_search_lock = threading.Lock()
+
+
+def saved_search_entry(row: dict) -> dict:
+    """
+    Turn a Saved_Search row into a SavedSearchIndex entry.
+    
+    Returns:
+        Dict with saved_search_id, developer_id and parsed filters, or None
+        when the stored filters are no longer valid
+    """
+    filters, error = parse_listing_filters(row.get('filters') or {})
+    if error:
+        print(f"[SAVED SEARCH] Skipping search {row.get('saved_search_id')}: {error}")
+        return None
+    return {'saved_search_id': row['saved_search_id'], 'developer_id': row['developer_id'], 'filters': filters}
+
+
+def load_saved_search_index(force: bool = False) -> SavedSearchIndex:
+    """
+    Return the saved search index, up to date with the Saved_Search table.
+    
+    Rebuilds it when it is stale (or force is set); otherwise only fetches
+    the searches added since the last load.
+    
+    Raises:
+        Exception: when the database query fails
+    """
+    columns = 'saved_search_id, developer_id, filters'
+    with _saved_search_lock:
+        if force or not saved_search_index.is_fresh(SAVED_SEARCH_MAX_AGE):
+            rows = fetch_all_rows(lambda: supabase.table('Saved_Search').select(columns).order('saved_search_id'))
+            saved_search_index.rebuild(entry for entry in map(saved_search_entry, rows) if entry)
+        else:
+            rows = (supabase.table('Saved_Search').select(columns)
+                    .gt('saved_search_id', saved_search_index.max_id)
+                    .order('saved_search_id').execute().data)
+            for entry in map(saved_search_entry, rows):
+                if entry:
+                    saved_search_index.add(entry)
+    return saved_search_index
+
+
+def record_saved_search(row: dict):
+    """Add a newly saved search to the index"""
+    entry = saved_search_entry(row)
+    if entry and saved_search_index.loaded_at is not None:
+        saved_search_index.add(entry)
+
+
+def forget_saved_search(saved_search_id: int):
+    """Remove a deleted saved search from the index"""
+    saved_search_index.remove(saved_search_id)
+
+
+def match_saved_searches(row: dict) -> int:
+    """
+    Match a new listing against all saved searches and add it to the inbox
+    of every developer with a matching search.
+    
+    Args:
+        row: The inserted Property row
+    
+    Returns:
+        Number of matching saved searches
+    
+    Raises:
+        Exception: when the database queries fail
+    """
+    for attempt in range(2):
+        matches = load_saved_search_index(force=attempt > 0).match(row)
+        if not matches:
+            return 0
+        try:
+            supabase.table('Saved_Search_Match').upsert([
+                {
+                    'saved_search_id': search['saved_search_id'],
+                    'developer_id': search['developer_id'],
+                    'property_id': row['property_id']
+                }
+                for search in matches
+            ], on_conflict='saved_search_id,property_id', ignore_duplicates=True).execute()
+            print(f"[SAVED SEARCH] Property {row['property_id']} matched {len(matches)} saved searches")
+            return len(matches)
+        except Exception as e:
+            if attempt:
+                raise
+            # A matched search may have been deleted through another worker: reload and retry
+            print(f"[SAVED SEARCH] Storing matches failed, reloading saved searches: {e}")
+
+
+# =============================================================================
+# LIVE EVENTS
+# =============================================================================
+# The mutation routes publish their changes on event_bus; /api/events streams
+# them to the logged-in users of this worker (see events.py for who sees what).
+
+event_bus = EventBus()
+
+
+def publish_property_event(event_type: str, row: dict):
+    """
+    Publish a property change.
+    
+    Args:
+        event_type: 'property.created', 'property.updated', 'property.sold' or 'property.deleted'
+        row: The property row (after the change; before it for deletions)
+    """
+    if event_type in ('property.created', 'property.updated'):
+        data = row
+    else:
+        data = {'property_id': row.get('property_id')}
+    # Developers only browse unsold listings, but must hear that one got sold
+    developers = event_type == 'property.sold' or not row.get('sold')
+    event_bus.publish(event_type, data, owner_id=row.get('propertyOwner_id'), developers=developers)
+
+
+def publish_interest_event(property_row: dict, developer: dict):
+    """Tell a property owner that a developer viewed the contact details of their property"""
+    event_bus.publish('interest.created', {
+        'property_id': property_row.get('property_id'),
+        'developer': developer
+    }, owner_id=property_row.get('propertyOwner_id'), developers=False)
+
+
 # =============================================================================
 # SMART CITY FALLBACK MECHANISM
 # =============================================================================
@@ -955,8 +786,8 @@ def find_nearest_city_with_data(target_city: str, target_province: str, property
     SMART FALLBACK MECHANISM:
     -------------------------
     1. Get coordinates of the target city using Nominatim API
-    2. Query all sold properties and group them by city
-    3. Filter cities that have at least min_required_properties sold
+    2. Load the sold-property aggregates (grouped by city when they are built)
+    3. Look up the cities that have at least min_required_properties sold
     4. Calculate geographic distance from target city to each candidate
     5. Return the nearest city with sufficient data
     
@@ -989,56 +820,52 @@ def find_nearest_city_with_data(target_city: str, target_province: str, property
     target_lon = target_coords['lon']
     print(f"[FALLBACK] Target city coordinates: ({target_lat}, {target_lon})")
     
-    # Step 2: Query all sold properties with final prices
+    # Step 2: Load the sold-property aggregates
     try:
-        response = supabase.table('Property').select('*').eq('sold', True).not_.is_('final_price', 'null').execute()
-        all_sold_properties = response.data or []
+        aggregates = load_sold_aggregates()
     except Exception as e:
+        if is_dependency_failure(e):
+            raise  # answered 503 (see resilience.py)
         print(f"[FALLBACK] Database error: {e}")
         return None
     
-    if not all_sold_properties:
+    if not len(aggregates):
         print("[FALLBACK] No sold properties in database")
         return None
     
-    print(f"[FALLBACK] Found {len(all_sold_properties)} total sold properties")
+    print(f"[FALLBACK] Found {len(aggregates)} total sold properties")
     
-    # Step 3: Group properties by city and count them
+    # Step 3: Look up the cities with enough sold properties (pre-grouped by city + province)
     # NOTE: We do NOT filter by property type here - we want to find ANY city with enough data
     # The property type scoring happens later in estimate_property_price()
-    city_property_map = {}
+    city_groups = aggregates.city_groups(min_count=min_required_properties, exclude_city=target_city)
     
-    for prop in all_sold_properties:
-        prop_city = (prop.get('city') or '').strip().lower()
-        prop_province = (prop.get('province') or '').strip()
-        
-        # Skip the original target city (we're looking for alternatives)
-        if prop_city == target_city.lower():
-            continue
-        
-        # Create unique key for city+province combination
-        city_key = f"{prop_city}|{prop_province}"
-        
-        if city_key not in city_property_map:
-            city_property_map[city_key] = {
-                'city': prop_city,
-                'province': prop_province,
-                'properties': []
-            }
-        
-        city_property_map[city_key]['properties'].append(prop)
+    print(f"[FALLBACK] Found {len(city_groups)} cities with at least {min_required_properties} sold properties")
     
-    print(f"[FALLBACK] Found {len(city_property_map)} unique cities with sold properties")
+    # Steps 4-5: Calculate distances and pick the nearest candidate
+    nearest = nearest_city_from_groups(target_lat, target_lon, city_groups)
+    if nearest:
+        nearest['properties'] = aggregates.properties_in(nearest['city'], nearest['province'])
     
-    # Step 4: Filter cities with sufficient data and calculate distances
+    return nearest
+
+
+def nearest_city_from_groups(target_lat: float, target_lon: float, city_groups: list) -> dict:
+    """
+    Steps 4-5 of the fallback: geocode the candidate cities and return the nearest one.
+    
+    Args:
+        target_lat, target_lon: Coordinates of the target city
+        city_groups: List of dicts with 'city', 'province' and 'property_count'
+    
+    Returns:
+        Dictionary with 'city', 'province', 'distance_km' and 'property_count',
+        or None if none of the candidates could be geocoded
+    """
     candidate_cities = []
     
-    for city_key, city_data in city_property_map.items():
-        property_count = len(city_data['properties'])
-        
-        # Only consider cities with at least min_required_properties
-        if property_count < min_required_properties:
-            continue
+    for city_data in city_groups:
+        property_count = city_data['property_count']
         
         # Get coordinates for this candidate city
         city_coords = get_city_coordinates(city_data['city'], city_data['province'])
@@ -1057,13 +884,12 @@ def find_nearest_city_with_data(target_city: str, target_province: str, property
             'city': city_data['city'],
             'province': city_data['province'],
             'distance_km': round(distance, 2),
-            'property_count': property_count,
-            'properties': city_data['properties']
+            'property_count': property_count
         })
         
         print(f"[FALLBACK] Candidate: {city_data['city']} - {distance:.1f}km away, {property_count} properties")
     
-    # Step 5: Sort by distance and return the nearest city
+    # Sort by distance and return the nearest city
     if not candidate_cities:
         print("[FALLBACK] No suitable cities found with sufficient data")
         return None
@@ -1173,6 +999,11 @@ def generate_unique_property_id():
 # PRICE ESTIMATION ALGORITHM (KNN-based with Smart City Fallback)
 # =============================================================================
 
+# Configuration constants
+KNN_NEIGHBORS = 5  # Number of nearest neighbors to consider (K)
+MIN_SAME_CITY_PROPERTIES = 2  # Minimum properties needed before fallback (lowered for small datasets)
+
+
 def estimate_property_price(data):
     """
     KNN-based price estimation algorithm with smart geographic fallback.
@@ -1209,55 +1040,102 @@ def estimate_property_price(data):
         - fallback_distance_km: Distance to fallback city (if used)
         - error: Error message (if failed)
     """
-    # Configuration constants
-    K = 5  # Number of nearest neighbors to consider
-    MIN_SAME_CITY_PROPERTIES = 2  # Minimum properties needed before fallback (lowered for small datasets)
+    city, province, property_type, size, error = _parse_estimate_input(data)
+    if error:
+        return error
     
-    # Parse and validate input data
-    province = data.get('province', '').strip()
-    city = data.get('city', '').strip().lower()
-    property_type = data.get('type', '').strip().lower()
+    print(f"\n[PRICE EST] Starting estimation for: {city}, {province}, type={property_type}, size={size}m2")
+    
+    scoring = _score_comparables(city, province, property_type, size, size)
+    return _build_price_estimate(scoring, city, size)
+
+
+def _parse_estimate_input(data):
+    """
+    Parse and validate the estimator input.
+    
+    Returns:
+        Tuple (city, province, property_type, size, error). On invalid input
+        error holds the failure response and the other values are None.
+    """
+    # Unknown provinces/types are kept as typed: they simply never match a stored value
+    province = normalize_province(data.get('province')) or (data.get('province') or '').strip()
+    city = canonical_city(data.get('city'))
+    property_type = normalize_property_type(data.get('type')) or (data.get('type') or '').strip().lower()
     
     try:
         size = float(data.get('size', 0))
-        if size <= 0:
-            return {"success": False, "error": "Size must be a positive number"}
+        # "inf", "nan" and "1e400" parse as floats, but have no size bucket
+        if not math.isfinite(size) or size <= 0:
+            return None, None, None, None, {"success": False, "error": "Size must be a positive number"}
     except (ValueError, TypeError):
-        return {"success": False, "error": "Invalid size format"}
+        return None, None, None, None, {"success": False, "error": "Invalid size format"}
     
-    print(f"\n[PRICE EST] Starting estimation for: {city}, {province}, type={property_type}, size={size}m2")
+    return city, province, property_type, size, None
+
+
+def _score_comparables(city, province, property_type, size_low, size_high):
+    """
+    Steps 2-5 of the estimator: score the sold properties on location and type.
+    
+    Uses the estimate_price_knn database function when it is available (only
+    the comparables that can reach the top K for a size in [size_low, size_high]
+    are returned) and the Python engine otherwise. Both return the same structure.
+    """
+    if _database_engine_available():
+        scoring = _score_comparables_database(city, province, property_type, size_low, size_high)
+        if scoring is not None:
+            return scoring
+    
+    return _score_comparables_python(city, province, property_type)
+
+
+def _score_comparables_python(city, province, property_type):
+    """
+    Python engine for steps 2-5: load the sold properties and score them on location and type.
+    
+    The size penalty is the only size-dependent part of the score and is applied
+    later by _top_k_price_per_m2(), so the result can be reused for any size.
+    
+    Returns:
+        Dictionary with either:
+        - comparables: list of dicts with base_score, size, price_per_m2, is_fallback and city
+          (in database order, which decides ties), plus fallback_city_info
+          (None when no fallback was used)
+        - response: a complete response when no estimate can be made
+    """
+    print(f"\n[PRICE EST] Scoring comparables for: {city}, {province}, type={property_type}")
     
-    # Query all sold properties
+    # Load all sold properties (snapshot kept up to date incrementally)
     try:
-        response = supabase.table('Property').select('*').eq('sold', True).not_.is_('final_price', 'null').execute()
-        sold_properties = response.data or []
+        aggregates = load_sold_aggregates()
+        sold_properties = aggregates.rows()
     except Exception as e:
-        return {"success": False, "error": f"Database error: {str(e)}"}
+        if is_dependency_failure(e):
+            raise  # answered 503 (see resilience.py)
+        return {"response": {"success": False, "error": f"Database error: {str(e)}"}}
     
     if not sold_properties:
         print("[PRICE EST] No sold properties in database")
-        return {
+        return {"response": {
             "success": True, 
             "suggested_price_min": None, 
             "suggested_price_max": None,
             "message": "No sold properties available for comparison"
-        }
+        }}
     
     print(f"[PRICE EST] Found {len(sold_properties)} total sold properties")
     
-    # Check how many properties are in the same city
-    same_city_properties = [
-        p for p in sold_properties 
-        if (p.get('city') or '').strip().lower() == city
-    ]
+    # Check how many properties are in the same city (O(1) aggregate lookup)
+    same_city_count = aggregates.city_count(city)
     
-    print(f"[PRICE EST] Properties in {city}: {len(same_city_properties)}")
+    print(f"[PRICE EST] Properties in {city}: {same_city_count}")
     
     # Determine if we need fallback
     fallback_city_info = None
     fallback_used = False
     
-    if len(same_city_properties) < MIN_SAME_CITY_PROPERTIES:
+    if same_city_count < MIN_SAME_CITY_PROPERTIES:
         print(f"[PRICE EST] Not enough data in {city}, triggering smart fallback...")
         
         # Find nearest city with sufficient data
@@ -1272,16 +1150,17 @@ def estimate_property_price(data):
             fallback_used = True
             print(f"[PRICE EST] Using fallback city: {fallback_city_info['city']} ({fallback_city_info['distance_km']}km away)")
     
-    # Score all properties
+    # Score all properties (without the size penalty)
     scored_properties = []
     
     for prop in sold_properties:
         score = 0
         is_fallback_property = False
         
-        prop_city = (prop.get('city') or '').strip().lower()
-        prop_province = (prop.get('province') or '').strip()
-        prop_type = (prop.get('type') or '').strip().lower()
+        # Stored values are canonical (city_key, Province value, lowercase type): plain equality
+        prop_city = prop.get('city_key')
+        prop_province = prop.get('province')
+        prop_type = prop.get('type')
         
         # City scoring
         if prop_city == city:
@@ -1303,23 +1182,15 @@ def estimate_property_price(data):
         if prop_type == property_type:
             score += 1
         
-        # Size similarity penalty (smaller difference = smaller penalty)
-        try:
-            prop_size = float(prop.get('size') or 0)
-            if prop_size > 0:
-                size_penalty = abs(size - prop_size) / 10
-                score -= size_penalty
-        except (ValueError, TypeError):
-            pass
-        
         # Add to scored list if it has valid price data
         try:
             final_price = float(prop.get('final_price') or 0)
             prop_size = float(prop.get('size') or 0)
             if final_price > 0 and prop_size > 0:
                 scored_properties.append({
-                    'property': prop,
-                    'score': score,
+                    'city': prop.get('city'),
+                    'base_score': score,
+                    'size': prop_size,
                     'price_per_m2': final_price / prop_size,
                     'is_fallback': is_fallback_property
                 })
@@ -1328,21 +1199,53 @@ def estimate_property_price(data):
     
     if not scored_properties:
         print("[PRICE EST] No valid properties for scoring")
-        return {
+        return {"response": {
             "success": True, 
             "suggested_price_min": None, 
             "suggested_price_max": None,
             "message": "No comparable properties found"
+        }}
+    
+    # Only keep what the response needs (not the fallback city's property list)
+    if fallback_used and fallback_city_info:
+        fallback_city_info = {
+            'city': fallback_city_info['city'],
+            'province': fallback_city_info['province'],
+            'distance_km': fallback_city_info['distance_km']
         }
+    else:
+        fallback_city_info = None
+    
+    return {
+        "comparables": scored_properties,
+        "fallback_city_info": fallback_city_info
+    }
+
+
+def _top_k_price_per_m2(comparables, size):
+    """
+    Step 6 of the estimator: apply the size penalty, select the top K and average their price per m2.
+    
+    Args:
+        comparables: 'comparables' list returned by _score_comparables()
+        size: Size of the property in m2
+    
+    Returns:
+        Average price per m2 of the K best scoring comparables
+    """
+    # Size similarity penalty (smaller difference = smaller penalty)
+    scored_properties = [
+        {**p, 'score': p['base_score'] - abs(size - p['size']) / 10}
+        for p in comparables
+    ]
     
     # Sort by score (highest first) and select top K
     scored_properties.sort(key=lambda x: x['score'], reverse=True)
-    top_k = scored_properties[:K]
+    top_k = scored_properties[:KNN_NEIGHBORS]
     
-    print(f"[PRICE EST] Top {len(top_k)} neighbors:")
+    print(f"[PRICE EST] Top {len(top_k)} neighbors for {size}m2:")
     for i, p in enumerate(top_k):
-        prop = p['property']
-        print(f"  {i+1}. {prop.get('city')}: score={p['score']:.2f}, price/m2={p['price_per_m2']:.2f}, fallback={p['is_fallback']}")
+        print(f"  {i+1}. {p['city']}: score={p['score']:.2f}, price/m2={p['price_per_m2']:.2f}, fallback={p['is_fallback']}")
     
     # Calculate average price per m2
     prices_per_m2 = [p['price_per_m2'] for p in top_k]
@@ -1350,6 +1253,24 @@ def estimate_property_price(data):
     
     print(f"[PRICE EST] Average price per m2: {avg_price_per_m2:.2f}")
     
+    return avg_price_per_m2
+
+
+def _build_price_estimate(scoring, city, size):
+    """
+    Steps 6-7 of the estimator: pick the neighbors for this size and build the rounded price range.
+    
+    Args:
+        scoring: Result of _score_comparables()
+        city: Normalized target city (used in the fallback message)
+        size: Size of the property in m2
+    """
+    if 'response' in scoring:
+        return dict(scoring['response'])
+    
+    avg_price_per_m2 = _top_k_price_per_m2(scoring['comparables'], size)
+    fallback_city_info = scoring['fallback_city_info']
+    
     # Calculate price range (+/- 20%)
     base_price = avg_price_per_m2 * size
     suggested_price_min = base_price * 0.80
@@ -1381,9 +1302,272 @@ def estimate_property_price(data):
     }
     
     # Add fallback info if used
-    if fallback_used and fallback_city_info:
+    if fallback_city_info:
         result["fallback_city"] = fallback_city_info['city'].title()
         result["fallback_distance_km"] = fallback_city_info['distance_km']
         result["fallback_message"] = f"Limited data in {city.title()}. Used nearby city {fallback_city_info['city'].title()} ({fallback_city_info['distance_km']}km away) for comparison."
     
     return result
+
+
+# =============================================================================
+# MEMOIZED PRICE ESTIMATES
+# =============================================================================
+# Owners often press "estimate" repeatedly for the same city/type while
+# tweaking the size. The expensive part (loading and scoring all sold
+# properties) is cached per (city, province, type, size bucket) in a bounded
+# LRU cache (or the shared cache backend, see cache_backends.py).
+#
+# A cache entry only keeps the comparables that can still end up in the top K
+# for some size inside its bucket, so the final selection is redone for the
+# exact size in microseconds and gives the same result as the uncached
+# estimator.
+#
+# Entries are tied to a dataset version (the generation of the cache, common
+# to all workers with a shared backend). Anything that changes the set of sold
+# properties (e.g. /api/mark-sold) must call bump_dataset_version().
+
+ESTIMATE_CACHE_SIZE = 512  # Maximum number of cached entries (per process)
+ESTIMATE_SIZE_BUCKET_RATIO = 0.05  # Sizes within ~5% of each other share a bucket
+
+estimate_cache = Cache('estimate', cache_backend(ESTIMATE_CACHE_SIZE))
+
+# Concurrent misses for the same entry share one scoring run
+_estimate_flight = SingleFlight('estimate', on_shared_error=note_shared_failure)
+
+
+def get_dataset_version() -> int:
+    """Return the current version of the sold-properties dataset"""
+    return estimate_cache.generation()
+
+
+def bump_dataset_version() -> int:
+    """Mark the sold-properties dataset as changed and drop all cached estimates (of every worker)"""
+    global _sold_snapshot_generation
+    version = estimate_cache.invalidate()
+    # This worker's snapshot already has its own changes
+    _sold_snapshot_generation = version
+    print(f"[PRICE EST CACHE] Dataset version bumped to {version}")
+    return version
+
+
+def size_bucket(size: float) -> int:
+    """Map a size in m2 to its geometric bucket number"""
+    return math.floor(math.log(size) / math.log(1 + ESTIMATE_SIZE_BUCKET_RATIO))
+
+
+def _bucket_bounds(bucket: int):
+    """
+    Return the (low, high) size range of a bucket.
+    
+    The range is widened slightly so floating point rounding can never exclude
+    a size that size_bucket() maps to this bucket.
+    """
+    low = (1 + ESTIMATE_SIZE_BUCKET_RATIO) ** bucket * (1 - 1e-9)
+    high = (1 + ESTIMATE_SIZE_BUCKET_RATIO) ** (bucket + 1) * (1 + 1e-9)
+    return low, high
+
+
+def _prune_comparables(comparables, bucket):
+    """
+    Drop the comparables that cannot be in the top K for any size in the bucket.
+    
+    For every comparable we bound its score over the bucket's size range. A
+    comparable whose best possible score is below the K-th highest worst-case
+    score is beaten by at least K others at every size, so it never matters.
+    The remaining comparables keep their original order (which decides ties).
+    """
+    if len(comparables) <= KNN_NEIGHBORS:
+        return list(comparables)
+    
+    low, high = _bucket_bounds(bucket)
+    
+    bounds = []
+    for p in comparables:
+        if p['size'] < low:
+            gap = low - p['size']
+        elif p['size'] > high:
+            gap = p['size'] - high
+        else:
+            gap = 0
+        worst = max(abs(low - p['size']), abs(high - p['size']))
+        bounds.append((p['base_score'] - gap / 10, p['base_score'] - worst / 10))
+    
+    threshold = sorted((lower for _, lower in bounds), reverse=True)[KNN_NEIGHBORS - 1]
+    return [p for p, (upper, _) in zip(comparables, bounds) if upper >= threshold]
+
+
+def estimate_property_price_cached(data):
+    """
+    Memoized version of estimate_property_price().
+    
+    Repeat estimates for the same normalized city, province, type and size
+    bucket are served from a bounded LRU cache until the dataset version changes.
+    
+    Args:
+        data: Dictionary with 'province', 'city', 'type', 'size'
+    
+    Returns:
+        Same dictionary as estimate_property_price()
+    """
+    city, province, property_type, size, error = _parse_estimate_input(data)
+    if error:
+        return error
+    
+    bucket = size_bucket(size)
+    cache_key = (city, province, property_type, bucket)
+    
+    version = estimate_cache.generation()
+    scoring = estimate_cache.get(cache_key, version)
+    
+    if scoring is not None:
+        print(f"[PRICE EST CACHE HIT] {city}, {province}, type={property_type}, size={size}m2")
+        return _build_price_estimate(scoring, city, size)
+    
+    print(f"\n[PRICE EST CACHE MISS] {city}, {province}, type={property_type}, size={size}m2")
+    # Callers that missed under an older dataset version do not wait for this run
+    scoring = _estimate_flight.do(
+        (cache_key, version),
+        lambda: _score_and_cache(cache_key, version, city, province, property_type, bucket),
+    )
+    return _build_price_estimate(scoring, city, size)
+
+
+def _score_and_cache(cache_key, version, city, province, property_type, bucket):
+    """Score the comparables of one estimate cache entry and store them when cacheable"""
+    scoring = _score_comparables(city, province, property_type, *_bucket_bounds(bucket))
+    
+    if 'comparables' in scoring:
+        scoring = {**scoring, 'comparables': _prune_comparables(scoring['comparables'], bucket)}
+    
+    # Database errors are not cached; everything else stays valid until the data changes
+    cacheable = 'comparables' in scoring or scoring['response'].get('success')
+    
+    # Stored under the version read before scoring: if the dataset changed meanwhile, it is never read
+    if cacheable:
+        estimate_cache.set(cache_key, scoring, version)
+    
+    return scoring
+
+
+# =============================================================================
+# SERVER-SIDE KNN SCORING (POSTGRES FUNCTION)
+# =============================================================================
+# migrations/0001_estimate_price_knn.sql defines estimate_price_knn() and
+# sold_city_counts(). When they exist, scoring runs inside Postgres and only the
+# few rows that can reach the top K are sent back, instead of the whole sold
+# table. The Python engine stays the fallback: if the RPC fails (function not
+# deployed, local stand-in, network error) we switch to it and only retry the
+# database after DATABASE_ENGINE_RETRY_INTERVAL seconds.
+#
+# ESTIMATE_ENGINE=python disables the database engine entirely.
+
+ESTIMATE_ENGINE = os.getenv('ESTIMATE_ENGINE', 'auto').strip().lower()
+DATABASE_ENGINE_RETRY_INTERVAL = 300  # seconds
+
+_database_engine_failed_at = None
+
+# PostgREST "function not found" and Postgres "undefined_function"
+MISSING_FUNCTION_CODES = {'PGRST202', '42883'}
+
+
+def _is_missing_function(error) -> bool:
+    """Whether an RPC failed because the database functions are not deployed"""
+    if isinstance(error, NotImplementedError):  # local data stand-in
+        return True
+    return isinstance(error, APIError) and error.code in MISSING_FUNCTION_CODES
+
+
+def _database_engine_available() -> bool:
+    if ESTIMATE_ENGINE == 'python':
+        return False
+    if _database_engine_failed_at is None:
+        return True
+    return time.time() - _database_engine_failed_at >= DATABASE_ENGINE_RETRY_INTERVAL
+
+
+def _rpc_estimate_price_knn(city, province, property_type, size_low, size_high, fallback_city=None):
+    """Call estimate_price_knn() and return its rows"""
+    response = supabase.rpc('estimate_price_knn', {
+        'p_city': city,
+        'p_province': province,
+        'p_type': property_type,
+        'p_size_low': size_low,
+        'p_size_high': size_high,
+        'p_fallback_city': fallback_city,
+        'p_k': KNN_NEIGHBORS
+    }).execute()
+    return response.data or []
+
+
+def _score_comparables_database(city, province, property_type, size_low, size_high):
+    """
+    Database engine for steps 2-5 of the estimator.
+    
+    Returns:
+        Same structure as _score_comparables_python(), or None when the
+        database functions could not be used (the caller then falls back to Python)
+    
+    Raises:
+        Supabase outages (see resilience.is_dependency_failure): the Python
+        engine would need the database as well
+    """
+    global _database_engine_failed_at
+    
+    try:
+        rows = _rpc_estimate_price_knn(city, province, property_type, size_low, size_high)
+        
+        if not rows:
+            print("[PRICE EST DB] No comparable sold properties")
+            return {"response": {
+                "success": True,
+                "suggested_price_min": None,
+                "suggested_price_max": None,
+                "message": "No comparable properties found"
+            }}
+        
+        same_city_count = rows[0]['same_city_count']
+        print(f"[PRICE EST DB] Properties in {city}: {same_city_count}")
+        
+        fallback_city_info = None
+        if same_city_count < MIN_SAME_CITY_PROPERTIES:
+            print(f"[PRICE EST DB] Not enough data in {city}, triggering smart fallback...")
+            target_coords = get_city_coordinates(city, province)
+            
+            if target_coords and target_coords.get('lat') is not None:
+                groups = supabase.rpc('sold_city_counts', {'p_min_count': MIN_SAME_CITY_PROPERTIES}).execute().data or []
+                groups = [g for g in groups if g['city'] != city]
+                fallback_city_info = nearest_city_from_groups(target_coords['lat'], target_coords['lon'], groups)
+            
+            if fallback_city_info:
+                rows = _rpc_estimate_price_knn(city, province, property_type, size_low, size_high,
+                                               fallback_city_info['city'])
+                fallback_city_info = {
+                    'city': fallback_city_info['city'],
+                    'province': fallback_city_info['province'],
+                    'distance_km': fallback_city_info['distance_km']
+                }
+    except Exception as e:
+        if is_dependency_failure(e):
+            raise
+        if _is_missing_function(e):
+            # Not deployed: only try again after DATABASE_ENGINE_RETRY_INTERVAL
+            _database_engine_failed_at = time.time()
+            print(f"[PRICE EST DB] Database engine unavailable, using Python engine: {e}")
+        else:
+            print(f"[PRICE EST DB] Database engine failed, using Python engine for this estimate: {e}")
+        return None
+    
+    _database_engine_failed_at = None
+    print(f"[PRICE EST DB] Received {len(rows)} comparables from the database")
+    
+    return {
+        "comparables": [{
+            'city': row['city'],
+            'base_score': row['base_score'],
+            'size': float(row['size']),
+            'price_per_m2': float(row['price_per_m2']),
+            'is_fallback': row['is_fallback']
+        } for row in rows],
+        "fallback_city_info": fallback_city_info
+    }
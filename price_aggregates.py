@@ -0,0 +1,210 @@
+# price_aggregates.py
+import bisect
+import threading
+import time
+
+
+# =============================================================================
+# INCREMENTAL SOLD-PRICE AGGREGATES
+# =============================================================================
+# Keeps the sold properties grouped per (city, province, type) with a count,
+# the sum of final prices and a sorted list of prices per m2. The groups are
+# updated one sale at a time, so "how many sales are there in this city?" and
+# "which cities have enough data?" no longer regroup the whole sold table.
+#
+# Rows are grouped on their stored canonical values (city_key, province, type),
+# which the app and migrations keep normalized, so no per-row string cleanup is
+# needed. Lookup arguments are still normalized.
+#
+# The store only holds data; models.py decides when to (re)load it from the
+# database (see load_sold_aggregates()).
+
+
+def normalize_city(value) -> str:
+    return (value or '').strip().lower()
+
+
+def normalize_province(value) -> str:
+    return (value or '').strip()
+
+
+def normalize_type(value) -> str:
+    return (value or '').strip().lower()
+
+
+def row_key(row):
+    """(city, province, type) group key of a stored property row"""
+    return row.get('city_key') or '', row.get('province') or '', row.get('type') or ''
+
+
+def price_per_m2(row):
+    """Return final_price / size for a sold property, or None when it cannot be computed"""
+    try:
+        final_price = float(row.get('final_price') or 0)
+        size = float(row.get('size') or 0)
+    except (ValueError, TypeError):
+        return None
+    if final_price <= 0 or size <= 0:
+        return None
+    return final_price / size
+
+
+class PriceGroup:
+    """Aggregates for one (city, province, type) combination"""
+
+    __slots__ = ('count', 'price_sum', 'prices_per_m2')
+
+    def __init__(self):
+        self.count = 0
+        self.price_sum = 0.0
+        self.prices_per_m2 = []  # kept sorted
+
+    def add(self, row):
+        self.count += 1
+        self.price_sum += float(row.get('final_price') or 0)
+        ppm2 = price_per_m2(row)
+        if ppm2 is not None:
+            bisect.insort(self.prices_per_m2, ppm2)
+
+    def remove(self, row):
+        self.count -= 1
+        self.price_sum -= float(row.get('final_price') or 0)
+        ppm2 = price_per_m2(row)
+        if ppm2 is not None:
+            index = bisect.bisect_left(self.prices_per_m2, ppm2)
+            if index < len(self.prices_per_m2) and self.prices_per_m2[index] == ppm2:
+                self.prices_per_m2.pop(index)
+
+    def median_price_per_m2(self):
+        values = self.prices_per_m2
+        if not values:
+            return None
+        middle = len(values) // 2
+        if len(values) % 2:
+            return values[middle]
+        return (values[middle - 1] + values[middle]) / 2
+
+
+class PriceAggregateStore:
+    """
+    Sold-property snapshot with per-(city, province, type) aggregates.
+
+    All lookups used by the estimator are O(1) dictionary reads:
+    - city_count(city): number of sold properties in a city
+    - city_groups(min_count): (city, province) pairs with at least min_count sales
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rows = {}            # property_id -> sold row
+        self._groups = {}          # (city, province, type) -> PriceGroup
+        self._city_counts = {}     # city -> count
+        self._city_province = {}   # (city, province) -> list of property_ids
+        self.loaded_at = None
+
+    # ----- maintenance -----
+
+    def rebuild(self, rows) -> bool:
+        """
+        Replace all aggregates with the given sold rows.
+
+        Returns:
+            Whether the rows differ from the previous snapshot
+        """
+        with self._lock:
+            previous_rows = self._rows
+            self._rows = {}
+            self._groups = {}
+            self._city_counts = {}
+            self._city_province = {}
+            for row in rows:
+                self._add(row)
+            self.loaded_at = time.time()
+            print(f"[AGGREGATES] Rebuilt from {len(self._rows)} sold properties, {len(self._groups)} groups")
+            return self._rows != previous_rows
+
+    def record_sale(self, row):
+        """Add (or replace) one sold property"""
+        if row.get('final_price') is None:
+            return
+        with self._lock:
+            self._discard(row.get('property_id'))
+            self._add(row)
+
+    def remove(self, property_id):
+        """Remove a property from the aggregates (e.g. after deletion)"""
+        with self._lock:
+            return self._discard(property_id)
+
+    def is_fresh(self, max_age_seconds):
+        return self.loaded_at is not None and time.time() - self.loaded_at < max_age_seconds
+
+    def _add(self, row):
+        key = row_key(row)
+        city, province, _ = key
+
+        self._rows[row.get('property_id')] = row
+        self._groups.setdefault(key, PriceGroup()).add(row)
+        self._city_counts[city] = self._city_counts.get(city, 0) + 1
+        self._city_province.setdefault((city, province), []).append(row.get('property_id'))
+
+    def _discard(self, property_id):
+        row = self._rows.pop(property_id, None)
+        if row is None:
+            return False
+
+        key = row_key(row)
+        city, province, _ = key
+
+        group = self._groups[key]
+        group.remove(row)
+        if group.count == 0:
+            del self._groups[key]
+
+        self._city_counts[city] -= 1
+        if self._city_counts[city] == 0:
+            del self._city_counts[city]
+
+        ids = self._city_province[(city, province)]
+        ids.remove(property_id)
+        if not ids:
+            del self._city_province[(city, province)]
+        return True
+
+    # ----- lookups -----
+
+    def rows(self):
+        """All sold rows (snapshot list)"""
+        with self._lock:
+            return list(self._rows.values())
+
+    def city_count(self, city) -> int:
+        return self._city_counts.get(normalize_city(city), 0)
+
+    def group(self, city, province, property_type):
+        """Return the PriceGroup for a (city, province, type) combination, or None"""
+        return self._groups.get((normalize_city(city), normalize_province(province), normalize_type(property_type)))
+
+    def city_groups(self, min_count=1, exclude_city=None):
+        """
+        Return the (city, province) combinations with at least min_count sales.
+
+        Returns:
+            List of dicts with 'city', 'province' and 'property_count'
+        """
+        exclude = normalize_city(exclude_city) if exclude_city else None
+        with self._lock:
+            return [
+                {'city': city, 'province': province, 'property_count': len(ids)}
+                for (city, province), ids in self._city_province.items()
+                if len(ids) >= min_count and city != exclude
+            ]
+
+    def properties_in(self, city, province):
+        """Sold rows for one (city, province) combination"""
+        with self._lock:
+            ids = self._city_province.get((normalize_city(city), normalize_province(province)), [])
+            return [self._rows[property_id] for property_id in ids]
+
+    def __len__(self):
+        return len(self._rows)
@@ -0,0 +1,121 @@
+# request_log.py
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from flask import g, request, session
+
+
+# =============================================================================
+# API REQUEST CAPTURE (for load testing with scripts/replay_requests.py)
+# =============================================================================
+# When REQUEST_LOG_PATH is set, every /api/ request is appended to that file as
+# one JSON line with its route, method, query, body, status and timing.
+# Personal data is replaced before anything is written to disk.
+#
+# Environment variables:
+#   REQUEST_LOG_PATH         File to append the JSONL records to (capture is off when unset)
+#   REQUEST_LOG_SAMPLE_RATE  Fraction of requests to record, between 0 and 1 (default: 1)
+
+# Body/query fields whose values are never written to the log
+SENSITIVE_FIELDS = {
+    'email', 'phone', 'phone_number', 'first_name', 'last_name',
+    'company_name', 'vat_number', 'VAT_number', 'password',
+}
+
+REDACTED = '[redacted]'
+
+# Long-lived streams (Server-Sent Events) cannot be replayed as single requests
+NOT_RECORDED_PATHS = {'/api/events'}
+
+_write_lock = threading.Lock()
+
+
+def sanitize(value):
+    """Recursively replace the values of sensitive fields in a JSON-like structure"""
+    if isinstance(value, dict):
+        return {
+            key: (REDACTED if key in SENSITIVE_FIELDS and item not in (None, '') else sanitize(item))
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [sanitize(item) for item in value]
+    return value
+
+
+def _session_fingerprint():
+    """Stable pseudonymous id for the current session (so replay can keep sessions apart)"""
+    user_id = session.get('user_id')
+    if user_id is None:
+        return None
+    digest = hashlib.sha256(f"{session.get('user_type')}:{user_id}".encode()).hexdigest()
+    return digest[:12]
+
+
+def _request_body():
+    """Return the sanitized request body (JSON, or form fields without files)"""
+    if request.is_json:
+        return sanitize(request.get_json(silent=True))
+    if request.form:
+        body = sanitize(request.form.to_dict())
+        if request.files:
+            body['_files'] = len(request.files)
+        return body
+    return None
+
+
+def _should_record():
+    if not request.path.startswith('/api/') or request.path in NOT_RECORDED_PATHS:
+        return False
+    sample_rate = float(os.getenv('REQUEST_LOG_SAMPLE_RATE', '1') or 1)
+    return sample_rate >= 1 or random.random() < sample_rate
+
+
+def _start_timer():
+    g.request_log_start = time.perf_counter()
+    g.request_log_record = _should_record()
+
+
+def _write_record(response):
+    if not g.get('request_log_record'):
+        return response
+
+    try:
+        duration_ms = (time.perf_counter() - g.request_log_start) * 1000
+        record = {
+            'ts': round(time.time(), 3),
+            'route': request.url_rule.rule if request.url_rule else request.path,
+            'path': request.path,
+            'method': request.method,
+            'query': sanitize(request.args.to_dict(flat=False)),
+            'body': _request_body(),
+            'user_type': session.get('user_type'),
+            'session': _session_fingerprint(),
+            'status': response.status_code,
+            'duration_ms': round(duration_ms, 2),
+        }
+        line = json.dumps(record, ensure_ascii=False, default=str)
+
+        with _write_lock:
+            with open(os.environ['REQUEST_LOG_PATH'], 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+    except Exception as e:
+        print(f"[REQUEST LOG] Could not record request: {e}")
+
+    return response
+
+
+def init_request_log(app):
+    """Register the capture hooks on the Flask app when REQUEST_LOG_PATH is set"""
+    log_path = os.getenv('REQUEST_LOG_PATH')
+    if not log_path:
+        return
+
+    log_dir = os.path.dirname(os.path.abspath(log_path))
+    os.makedirs(log_dir, exist_ok=True)
+
+    app.before_request(_start_timer)
+    app.after_request(_write_record)
+    print(f"[REQUEST LOG] Recording API requests to {log_path}")
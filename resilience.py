@@ -0,0 +1,422 @@
+# resilience.py
+import math
+import os
+import random
+import threading
+import time
+
+import httpx
+from flask import g, has_request_context, jsonify, make_response, request
+from postgrest.exceptions import APIError
+
+
+# =============================================================================
+# TIMEOUTS, RETRIES AND CIRCUIT BREAKER FOR SUPABASE
+# =============================================================================
+# Every request handler talks to Supabase through the shared client in
+# models.py. Without limits, a slow Supabase keeps each worker thread blocked
+# in execute() for the client's default timeout (two minutes for queries)
+# before the handler can answer, so a short outage ties up every worker.
+#
+# ResilientClient wraps that client:
+# - Timeouts: each query gives up after SUPABASE_TIMEOUT seconds (storage
+#   calls after SUPABASE_STORAGE_TIMEOUT), set on the client's HTTP sessions
+#   by client_options().
+# - Deadline: a request may spend REQUEST_DEADLINE seconds in total on
+#   Supabase. No call, retry or backoff starts once the budget is spent.
+# - Retries: reads (select queries and the read-only database functions) are
+#   retried up to SUPABASE_RETRIES times after a timeout, a connection error
+#   or a 5xx, with jittered exponential backoff. Writes are never retried: a
+#   write that timed out may still have been applied.
+# - Circuit breaker: after CIRCUIT_FAILURE_THRESHOLD failed calls in a row,
+#   calls fail immediately for CIRCUIT_RESET_TIMEOUT seconds. A single trial
+#   call then decides whether the circuit closes again. The database and
+#   storage have their own breaker.
+#
+# Route handlers catch exceptions broadly and answer 500. When a request
+# failed because Supabase was unavailable, init_resilience() turns that 500
+# into a 503 with a Retry-After header, so clients and load balancers can
+# tell an outage from a bug.
+#
+# Only failures that say nothing about the request itself count: timeouts,
+# connection errors, 5xx responses and the database's "try again" errors.
+# A constraint violation or an invalid filter is passed on unchanged.
+#
+# Environment variables (seconds unless noted):
+#   SUPABASE_TIMEOUT           Per query (default: 5)
+#   SUPABASE_STORAGE_TIMEOUT   Per storage call, e.g. an image upload (default: 20)
+#   REQUEST_DEADLINE           Total Supabase time per request (default: 10)
+#   SUPABASE_RETRIES           Retries of a failed read (default: 2)
+#   CIRCUIT_FAILURE_THRESHOLD  Failures in a row that open the circuit (default: 5)
+#   CIRCUIT_RESET_TIMEOUT      Time the circuit stays open (default: 30)
+
+SUPABASE_TIMEOUT = float(os.getenv('SUPABASE_TIMEOUT', '5'))
+SUPABASE_STORAGE_TIMEOUT = float(os.getenv('SUPABASE_STORAGE_TIMEOUT', '20'))
+REQUEST_DEADLINE = float(os.getenv('REQUEST_DEADLINE', '10'))
+SUPABASE_RETRIES = int(os.getenv('SUPABASE_RETRIES', '2'))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '5'))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', '30'))
+
+RETRY_BASE_DELAY = 0.1
+RETRY_MAX_DELAY = 1.0
+
+# PostgREST / Postgres error codes for "the database could not answer right now"
+TRANSIENT_ERROR_CODES = {
+    'PGRST000', 'PGRST001', 'PGRST002', 'PGRST003',  # no connection, schema cache, pool timeout
+    '57014',  # statement timeout
+    '53300',  # too many connections
+    '40001',  # serialization failure
+    '40P01',  # deadlock
+}
+
+
+class DependencyUnavailable(Exception):
+    """A Supabase call was not made or not completed because the service is unavailable"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpen(DependencyUnavailable):
+    """The circuit breaker rejected the call"""
+
+
+class DeadlineExceeded(DependencyUnavailable):
+    """The request spent its REQUEST_DEADLINE budget"""
+
+
+def _http_status(error):
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code
+    if isinstance(error, APIError):
+        # PostgREST sets the HTTP status as code when the response was not its
+        # JSON (e.g. a gateway error page); Postgres codes have five characters
+        status = error.code if len(str(error.code)) == 3 else None
+    else:
+        status = getattr(error, 'status', None)  # storage errors
+    try:
+        return int(status)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_transient(error) -> bool:
+    """
+    Whether a failed call may succeed when tried again later.
+
+    Returns:
+        True for timeouts, connection errors, 5xx responses and the codes in
+        TRANSIENT_ERROR_CODES; False for errors caused by the request itself
+    """
+    if isinstance(error, (httpx.TransportError, TimeoutError, ConnectionError)):
+        return True
+    if isinstance(error, APIError) and error.code in TRANSIENT_ERROR_CODES:
+        return True
+    status = _http_status(error)
+    return status is not None and 500 <= status <= 599
+
+
+def retry_delay(attempt: int) -> float:
+    """Backoff before retry number attempt (1-based): full jitter, capped at RETRY_MAX_DELAY"""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+
+
+# =============================================================================
+# CIRCUIT BREAKER
+# =============================================================================
+
+class CircuitBreaker:
+    """
+    Closed: calls go through and failures in a row are counted. Open: calls
+    are rejected until reset_timeout has passed. Half-open: one trial call
+    goes through; it closes the circuit on success and reopens it on failure.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+    def __init__(self, name, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_timeout=CIRCUIT_RESET_TIMEOUT,
+                 clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit lets a trial call through (0 when it does now)"""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0
+            return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def before_call(self):
+        """Raise CircuitOpen when the call may not go through"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+            if self._state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return
+            # A trial call is running: it decides within one call timeout
+            retry_after = 1.0 if self._state == self.HALF_OPEN \
+                else self._opened_at + self.reset_timeout - self._clock()
+        raise CircuitOpen(f"{self.name} is unavailable (circuit open)", retry_after=max(retry_after, 0))
+
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                print(f"[CIRCUIT] {self.name}: closed again")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    print(f"[CIRCUIT] {self.name}: open for {self.reset_timeout:.0f}s "
+                          f"after {self._failures} failures in a row")
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._trial_running = False
+
+
+# =============================================================================
+# GUARDED CALLS
+# =============================================================================
+
+def _request_deadline():
+    """Monotonic deadline of the current request, or None outside requests"""
+    return g.get('supabase_deadline') if has_request_context() else None
+
+
+def _note_failure(error):
+    # Lets the after_request hook answer 503 instead of the handler's 500
+    if has_request_context():
+        g.supabase_error = error
+
+
+def is_dependency_failure(error) -> bool:
+    """Whether error means Supabase is unavailable (circuit open, deadline, transient failure)"""
+    return isinstance(error, DependencyUnavailable) or is_transient(error)
+
+
+def note_shared_failure(error):
+    """
+    Record error on the current request when it is a Supabase failure that
+    another request ran into and handed over (see singleflight.py), so this
+    request is answered 503 as well.
+    """
+    if is_dependency_failure(error):
+        _note_failure(error)
+
+
+class CallGuard:
+    """Applies the deadline, retries and circuit breaker to calls of one service"""
+
+    def __init__(self, breaker, retries=SUPABASE_RETRIES, sleep=time.sleep, clock=time.monotonic):
+        self.breaker = breaker
+        self.retries = retries
+        self._sleep = sleep
+        self._clock = clock
+
+    def call(self, function, idempotent=False):
+        """
+        Run function() (one Supabase call) under the guard.
+
+        Args:
+            function: Makes the call and returns its result
+            idempotent: Whether the call may be retried after a transient failure
+
+        Returns:
+            The result of function()
+
+        Raises:
+            CircuitOpen or DeadlineExceeded without calling function; otherwise
+            the error of the last attempt
+        """
+        deadline = _request_deadline()
+        attempt = 0
+        while True:
+            if deadline is not None and self._clock() >= deadline:
+                error = DeadlineExceeded(f"{self.breaker.name}: request deadline exceeded",
+                                         retry_after=self.breaker.retry_after() or None)
+                _note_failure(error)
+                raise error
+            try:
+                self.breaker.before_call()
+            except CircuitOpen as error:
+                _note_failure(error)
+                raise
+
+            try:
+                result = function()
+            except Exception as error:
+                if not is_transient(error):
+                    self.breaker.record_success()  # the service answered
+                    raise
+                self.breaker.record_failure()
+                attempt += 1
+                delay = retry_delay(attempt)
+                if (not idempotent or attempt > self.retries
+                        or self.breaker.state != CircuitBreaker.CLOSED  # this failure opened it
+                        or (deadline is not None and self._clock() + delay >= deadline)):
+                    print(f"[RESILIENCE] {self.breaker.name} call failed: {type(error).__name__}: {error}")
+                    _note_failure(error)
+                    raise
+                print(f"[RESILIENCE] {self.breaker.name} call failed ({type(error).__name__}), "
+                      f"retry {attempt}/{self.retries} in {delay * 1000:.0f}ms")
+                self._sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return result
+
+
+class _GuardedQuery:
+    """A query builder whose execute() runs under the guard"""
+
+    __slots__ = ('_builder', '_guard', '_idempotent')
+
+    def __init__(self, builder, guard, idempotent):
+        self._builder = builder
+        self._guard = guard
+        self._idempotent = idempotent
+
+    def __getattr__(self, name):
+        attribute = getattr(self._builder, name)
+        if not callable(attribute):  # e.g. the not_ modifier
+            return _GuardedQuery(attribute, self._guard, self._idempotent)
+
+        def chained(*args, **kwargs):
+            return _GuardedQuery(attribute(*args, **kwargs), self._guard, self._idempotent or name == 'select')
+        return chained
+
+    def execute(self):
+        return self._guard.call(self._builder.execute, idempotent=self._idempotent)
+
+
+class _GuardedBucket:
+    """A storage bucket whose uploads and removals run under the guard"""
+
+    def __init__(self, bucket, guard):
+        self._bucket = bucket
+        self._guard = guard
+
+    def upload(self, *args, **kwargs):
+        return self._guard.call(lambda: self._bucket.upload(*args, **kwargs))
+
+    def remove(self, *args, **kwargs):
+        return self._guard.call(lambda: self._bucket.remove(*args, **kwargs))
+
+    def __getattr__(self, name):
+        # get_public_url() and the like only build URLs
+        return getattr(self._bucket, name)
+
+
+class _GuardedStorage:
+    def __init__(self, storage, guard):
+        self._storage = storage
+        self._guard = guard
+
+    def from_(self, bucket_name):
+        return _GuardedBucket(self._storage.from_(bucket_name), self._guard)
+
+    def __getattr__(self, name):
+        return getattr(self._storage, name)
+
+
+class ResilientClient:
+    """
+    Wraps a Supabase client (or the local stand-in) so that query execute()
+    calls and storage uploads/removals run under a CallGuard.
+
+    Args:
+        client: The client to wrap
+        read_only_functions: Names of database functions that only read, so
+            their rpc() calls may be retried
+    """
+
+    def __init__(self, client, read_only_functions=()):
+        self._client = client
+        self._read_only_functions = frozenset(read_only_functions)
+        self.database_guard = CallGuard(CircuitBreaker('database'))
+        self.storage_guard = CallGuard(CircuitBreaker('storage'))
+        self.storage = _GuardedStorage(client.storage, self.storage_guard)
+
+    def table(self, table_name):
+        return _GuardedQuery(self._client.table(table_name), self.database_guard, idempotent=False)
+
+    def from_(self, table_name):
+        return self.table(table_name)
+
+    def rpc(self, function_name, params=None):
+        return _GuardedQuery(self._client.rpc(function_name, params or {}), self.database_guard,
+                             idempotent=function_name in self._read_only_functions)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def client_options():
+    """ClientOptions for create_client() with the SUPABASE_TIMEOUT / SUPABASE_STORAGE_TIMEOUT timeouts"""
+    from supabase import ClientOptions
+    return ClientOptions(postgrest_client_timeout=SUPABASE_TIMEOUT,
+                         storage_client_timeout=SUPABASE_STORAGE_TIMEOUT)
+
+
+# =============================================================================
+# FLASK INTEGRATION
+# =============================================================================
+
+def _start_deadline():
+    g.supabase_deadline = time.monotonic() + REQUEST_DEADLINE
+
+
+def _retry_after_seconds(error) -> int:
+    retry_after = getattr(error, 'retry_after', None)
+    return max(1, math.ceil(retry_after)) if retry_after else 1
+
+
+def unavailable_response(error):
+    """503 response for a request that failed because Supabase is unavailable"""
+    message = "The service is temporarily unavailable. Please try again shortly."
+    if request.path.startswith('/api/'):
+        response = jsonify({"success": False, "error": message})
+    else:
+        response = make_response(message)
+        response.mimetype = 'text/plain'
+    response.status_code = 503
+    response.headers['Retry-After'] = str(_retry_after_seconds(error))
+    response.cache_control.no_store = True
+    return response
+
+
+def _replace_server_error(response):
+    """after_request hook: answer 503 instead of 500 when a Supabase call failed"""
+    error = g.get('supabase_error')
+    if error is None or response.status_code < 500 or response.status_code == 503:
+        return response
+    return unavailable_response(error)
+
+
+def init_resilience(app):
+    """Give each request its Supabase deadline and turn outage 500s into 503s"""
+    app.before_request(_start_deadline)
+    app.after_request(_replace_server_error)
+    app.register_error_handler(DependencyUnavailable, unavailable_response)
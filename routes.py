@@ -1,15 +1,46 @@
 # routes.py
-from flask import Blueprint, jsonify, request, render_template, session
+from flask import Blueprint, Response, jsonify, make_response, request, render_template, session
+from events import event_stream
+from listing_index import SIZE_BUCKETS, PRICE_BUCKETS
+from text_search import rank, SEARCH_CONFIG
+from singleflight import SingleFlight
+from resilience import note_shared_failure
 from models import (
     supabase, 
     upload_property_image, 
     generate_unique_id, 
     generate_unique_property_id,
-    estimate_property_price,
+    estimate_property_price_cached,
+    bump_dataset_version,
+    record_sold_property,
+    forget_sold_property,
     PropertyType,
     Province,
     BELGIAN_CITIES,
-    CITY_TO_PROVINCE
+    CITY_TO_PROVINCE,
+    canonical_city,
+    city_display_name,
+    normalize_property_type,
+    normalize_province,
+    LISTING_INDEX_ENABLED,
+    load_listing_index,
+    LISTING_CACHE_ENABLED,
+    listing_cache,
+    build_listing_index,
+    record_listing,
+    forget_listing,
+    parse_listing_filters,
+    SAVED_SEARCH_PARAMS,
+    SAVED_SEARCHES_PER_DEVELOPER,
+    record_saved_search,
+    forget_saved_search,
+    match_saved_searches,
+    event_bus,
+    publish_property_event,
+    publish_interest_event,
+    suggest_cities,
+    CITY_SUGGESTIONS_DEFAULT,
+    CITY_SUGGESTIONS_MAX
 )
 
 # Create blueprint for routes
@@ -39,6 +70,20 @@ def get_current_user():
         return None
 
 
+def render_page(template, initial_data, **context):
+    """
+    Render a page with initial_data embedded as JSON (see base.html).
+    
+    The page scripts start from this data (takeInitialData()) instead of
+    requesting /api/current-user and the first page of data after loading.
+    Data that could not be loaded is left out; the scripts fetch it instead.
+    """
+    response = make_response(render_template(template, initial_data=initial_data, **context))
+    # The page now contains data of the logged-in user
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
 # Page Routes
 @routes.route('/')
 def index():
@@ -47,18 +92,53 @@ def index():
 
 @routes.route('/developer')
 def developer_page():
-    return render_template('developer.html', provinces=Province)
+    user = get_current_user()
+    initial_data = {'user': user}
+    
+    if user and user['user_type'] == 'developer' and supabase:
+        try:
+            # Taken before the listings: the event stream replays what changes after this
+            initial_data['last_event_id'] = event_bus.event_id()
+            filters, _ = parse_listing_filters({})
+            # First page only: the page fetches the rest with /api/properties?offset=...
+            initial_data['listings'] = listing_results(filters, LISTING_PAGE_MAX)
+            initial_data['facets'] = facet_counts(filters)
+        except Exception as e:
+            print(f"[INITIAL DATA] Could not load listings: {e}")
+    
+    return render_page('developer.html', initial_data, provinces=Province, page_size=LISTING_PAGE_MAX)
 
 
 @routes.route('/property-owner')
 def property_owner_page():
-    return render_template('property_owner.html', property_types=PropertyType, provinces=Province)
+    user = get_current_user()
+    initial_data = {'user': user}
+    
+    if user and user['user_type'] == 'property_owner' and supabase:
+        try:
+            initial_data['last_event_id'] = event_bus.event_id()
+            initial_data['my_properties'] = owner_properties(user['user_id'])
+        except Exception as e:
+            print(f"[INITIAL DATA] Could not load the owner's properties: {e}")
+    
+    return render_page('property_owner.html', initial_data, property_types=PropertyType, provinces=Province)
 
 
 @routes.route('/property/<int:property_id>')
 def property_detail(property_id):
     """Display detailed view of a specific property"""
-    return render_template('property_detail.html', property_id=property_id)
+    user = get_current_user()
+    initial_data = {'user': user}
+    
+    if user and supabase:
+        try:
+            property_data = fetch_property(property_id)
+            if property_data:
+                initial_data['property'] = property_data
+        except Exception as e:
+            print(f"[INITIAL DATA] Could not load property {property_id}: {e}")
+    
+    return render_page('property_detail.html', initial_data, property_id=property_id)
 
 
 # API Routes
@@ -108,14 +188,13 @@ def submit_property():
                     except Exception as img_error:
                         print(f"Error uploading image {i}: {img_error}")
         
-        allowed_types = {'land', 'building'}
-        raw_type = (data.get('type') or '').strip().lower()
-        property_type = raw_type if raw_type in allowed_types else 'land'
+        property_type = normalize_property_type(data.get('type') or 'land')
+        if property_type is None:
+            return jsonify({"success": False, "error": "Invalid property type"}), 400
 
-        allowed_provinces = [p.value for p in Province]
-        province = (data.get('province') or '').strip()
-        city = (data.get('city') or '').strip()
-        if province and province not in allowed_provinces:
+        province = normalize_province(data.get('province'))
+        city_key = canonical_city(data.get('city'))
+        if (data.get('province') or '').strip() and province is None:
             return jsonify({"success": False, "error": "Invalid province"}), 400
 
         try:
@@ -134,7 +213,8 @@ def submit_property():
             "size": int(data.get("size")),
             "description": data.get("description", ""),
             "province": province,
-            "city": city,
+            "city": city_display_name(city_key),
+            "city_key": city_key,
             "propertyOwner_id": user['user_id'],
             "image_urls": image_urls,
             "type": property_type,
@@ -143,6 +223,13 @@ def submit_property():
         }
         
         response = supabase.table('Property').insert(property_data).execute()
+        if response.data:
+            record_listing(response.data[0])
+            publish_property_event('property.created', response.data[0])
+            try:
+                match_saved_searches(response.data[0])
+            except Exception as match_error:
+                print(f"[SAVED SEARCH] Matching property {property_id} failed: {match_error}")
         
         return jsonify({
             "success": True,
@@ -159,54 +246,411 @@ def submit_property():
         }), 500
 
 
+LISTING_PAGE_MAX = 100
+
+# Identical listing queries running at the same time share one database query
+_listing_query_flight = SingleFlight('listing query', on_shared_error=note_shared_failure)
+
+
+def parse_pagination(args):
+    """
+    Parse the limit / offset query parameters of /api/properties.
+    
+    Returns:
+        Tuple (limit, offset, error): limit is None when not given (all
+        results); error is a message for invalid values, otherwise None
+    """
+    try:
+        limit = int(args['limit']) if args.get('limit') else None
+        offset = int(args.get('offset') or 0)
+    except ValueError:
+        return None, 0, "Invalid limit or offset"
+    if limit is not None and not 1 <= limit <= LISTING_PAGE_MAX:
+        return None, 0, f"Limit must be between 1 and {LISTING_PAGE_MAX}"
+    if offset < 0:
+        return None, 0, "Offset cannot be negative"
+    return limit, offset, None
+
+
+def order_listings(properties, filters):
+    """
+    Put filtered listings (ordered by property_id) in their result order.
+    
+    Radius searches come nearest first with a distance_km field added; text
+    searches come most relevant first (distance, then property_id, break ties).
+    """
+    if filters['near_cities'] is not None:
+        properties = sort_by_distance(properties, filters['near_cities'])
+    if filters['search_terms'] is not None:
+        terms = filters['search_terms']
+        ranks = {prop['property_id']: rank(terms, prop) for prop in properties}
+        properties = sorted(properties, key=lambda prop: -ranks[prop['property_id']])
+    return properties
+
+
+def sort_by_distance(properties, near_cities):
+    """
+    Order radius search results by distance to the center city.
+    
+    Args:
+        properties: Property rows (ordered by property_id)
+        near_cities: Dict of city key -> distance in km
+    
+    Returns:
+        Copies of the rows with distance_km added, nearest first (ties keep
+        the property_id order)
+    """
+    results = [dict(prop, distance_km=near_cities.get(prop.get('city_key'))) for prop in properties]
+    results.sort(key=lambda prop: prop['distance_km'])
+    return results
+
+
 @routes.route('/api/properties', methods=['GET'])
 def get_properties():
-    """Get all properties with optional filtering"""
+    """
+    Get all properties with optional filtering.
+    
+    Query parameters: province, city, type, min_size, max_price,
+    near_city + radius_km (km, default NEAR_CITY_DEFAULT_RADIUS_KM) for a
+    radius search, q for a text search in names and descriptions, and
+    limit / offset for paging. Results are ordered by order_listings();
+    total is the number of matches before paging.
+    """
     
     if not supabase:
         return jsonify({"success": False, "error": "Database not connected"}), 500
     
     try:
-        province = request.args.get('province', '')
-        city = request.args.get('city', '')
-        min_size = request.args.get('min_size', '')
-        max_price = request.args.get('max_price', '')
-        prop_type = request.args.get('type', '')
-        
-        query = supabase.table('Property').select('*').eq('sold', False)
-        
-        if province:
-            query = query.eq('province', province)
-        if city:
-            query = query.ilike('city', f'%{city}%')
-        if min_size:
-            try:
-                query = query.gte('size', int(min_size))
-            except ValueError:
-                pass
-        if prop_type:
-            # Do a case-insensitive match so both 'Land' and 'land' stored values match
-            query = query.ilike('type', prop_type)
-        if max_price:
-            try:
-                query = query.lte('price_min', float(max_price))
-            except ValueError:
-                pass
+        filters, error = parse_listing_filters(request.args)
+        if not error:
+            limit, offset, error = parse_pagination(request.args)
+        if error:
+            return jsonify({"success": False, "error": error}), 400
         
-        response = query.execute()
+        return jsonify({"success": True, **listing_results(filters, limit, offset)})
         
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"Error fetching properties: {str(e)}"
+        }), 500
+
+
+def listing_results(filters, limit=None, offset=0):
+    """
+    Find the unsold properties matching parsed listing filters.
+    
+    Returns:
+        Dict with the page of properties (ordered by order_listings()) and
+        the total number of matches
+    """
+    if LISTING_CACHE_ENABLED:
+        properties = listing_cache.get(listing_filters_key(filters), lambda: matching_listings(filters))
+    else:
+        properties = matching_listings(filters)
+    
+    end = None if limit is None else offset + limit
+    return {"properties": properties[offset:end], "total": len(properties)}
+
+
+def matching_listings(filters):
+    """
+    All unsold properties matching parsed listing filters, ordered by order_listings().
+    
+    The list may be shared with other requests (listing cache): do not change it.
+    """
+    properties = None
+    if LISTING_INDEX_ENABLED:
+        try:
+            properties = load_listing_index().query(**filters)
+        except Exception as index_error:
+            print(f"[LISTING INDEX] Unavailable, querying the database: {index_error}")
+    
+    if properties is None:
+        properties = _listing_query_flight.do(listing_filters_key(filters), lambda: query_listings(filters))
+    
+    # The rows may be shared with concurrent requests: order_listings() does not change them
+    return order_listings(properties, filters)
+
+
+def listing_filters_key(filters):
+    """Hashable form of parsed listing filters (near_cities is a dict, search_terms a list)"""
+    return tuple(sorted(
+        (name, tuple(sorted(value.items())) if isinstance(value, dict)
+         else tuple(value) if isinstance(value, list) else value)
+        for name, value in filters.items()
+    ))
+
+
+def query_listings(filters):
+    """Run the listing filters as a database query (LISTING_INDEX=off or index unavailable)"""
+    query = supabase.table('Property').select('*').eq('sold', False)
+    
+    if filters['province']:
+        query = query.eq('province', filters['province'])
+    if filters['city_key']:
+        query = query.eq('city_key', filters['city_key'])
+    elif filters['city_prefix']:
+        query = query.like('city_key', f"{filters['city_prefix']}%")
+    if filters['min_size'] is not None:
+        query = query.gte('size', filters['min_size'])
+    if filters['property_type']:
+        query = query.eq('type', filters['property_type'])
+    if filters['max_price'] is not None:
+        query = query.lte('price_min', filters['max_price'])
+    if filters['near_cities'] is not None:
+        query = query.in_('city_key', list(filters['near_cities']))
+    if filters['search_terms'] is not None:
+        # search_vector is a computed field (migrations/0005_property_search.sql)
+        query = query.filter('search_vector', f"plfts({SEARCH_CONFIG})", ' '.join(filters['search_terms']))
+    
+    return query.order('property_id').execute().data
+
+
+@routes.route('/api/properties/facets', methods=['GET'])
+def get_property_facets():
+    """
+    Count the unsold properties per province, type, size bucket and price bucket.
+    
+    Takes the same filters as /api/properties. Each facet is counted with all
+    filters except its own, so e.g. the province counts show how many results
+    every province would give with the other filters kept.
+    """
+    if not supabase:
+        return jsonify({"success": False, "error": "Database not connected"}), 500
+    
+    try:
+        filters, error = parse_listing_filters(request.args)
+        if error:
+            return jsonify({"success": False, "error": error}), 400
+        
+        return jsonify({"success": True, **facet_counts(filters)})
+        
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"Error counting properties: {str(e)}"
+        }), 500
+
+
+def facet_counts(filters):
+    """Facet counts for parsed listing filters, as returned by /api/properties/facets"""
+    index = load_listing_index() if LISTING_INDEX_ENABLED else build_listing_index()
+    counts = index.facets(**filters)
+    
+    def bucket_counts(buckets, bucket_counts_by_index):
+        return [
+            {"min": low, "max": high, "count": bucket_counts_by_index.get(i, 0)}
+            for i, (low, high) in enumerate(buckets)
+        ]
+    
+    return {
+        "total": counts['total'],
+        "facets": {
+            "province": [{"value": p.value, "count": counts['province'].get(p.value, 0)} for p in Province],
+            "type": [{"value": t.name.lower(), "label": t.value, "count": counts['type'].get(t.name.lower(), 0)}
+                     for t in PropertyType],
+            "size": bucket_counts(SIZE_BUCKETS, counts['size']),
+            "price": bucket_counts(PRICE_BUCKETS, counts['price'])
+        }
+    }
+
+
+@routes.route('/api/saved-searches', methods=['GET'])
+def get_saved_searches():
+    """List the saved searches of the logged-in developer"""
+    user = get_current_user()
+    if not user or user['user_type'] != 'developer':
+        return jsonify({"success": False, "error": "Must be logged in as developer"}), 401
+    
+    if not supabase:
+        return jsonify({"success": False, "error": "Database not connected"}), 500
+    
+    try:
+        response = (supabase.table('Saved_Search').select('*')
+                    .eq('developer_id', user['user_id'])
+                    .order('saved_search_id').execute())
         return jsonify({
             "success": True,
-            "properties": response.data
+            "saved_searches": response.data
         })
         
     except Exception as e:
         return jsonify({
             "success": False,
-            "error": f"Error fetching properties: {str(e)}"
+            "error": f"Error fetching saved searches: {str(e)}"
         }), 500
 
 
+@routes.route('/api/saved-searches', methods=['POST'])
+def create_saved_search():
+    """
+    Save a set of /api/properties filters for the logged-in developer.
+    
+    Body: {"name": "...", "filters": {"province": ..., "city": ..., "type": ...,
+    "min_size": ..., "max_price": ..., "near_city": ..., "radius_km": ..., "q": ...}}.
+    New listings matching the filters show up in /api/saved-searches/inbox.
+    """
+    user = get_current_user()
+    if not user or user['user_type'] != 'developer':
+        return jsonify({"success": False, "error": "Must be logged in as developer"}), 401
+    
+    if not supabase:
+        return jsonify({"success": False, "error": "Database not connected"}), 500
+    
+    try:
+        data = request.get_json() or {}
+        name = (data.get('name') or '').strip()
+        if not name:
+            return jsonify({"success": False, "error": "Missing search name"}), 400
+        
+        params = {
+            key: str(value).strip()
+            for key, value in (data.get('filters') or {}).items()
+            if key in SAVED_SEARCH_PARAMS and value is not None and str(value).strip()
+        }
+        _, error = parse_listing_filters(params)
+        if error:
+            return jsonify({"success": False, "error": error}), 400
+        
+        existing = (supabase.table('Saved_Search').select('saved_search_id', count='exact')
+                    .eq('developer_id', user['user_id']).execute())
+        if (existing.count or 0) >= SAVED_SEARCHES_PER_DEVELOPER:
+            return jsonify({
+                "success": False,
+                "error": f"You can save at most {SAVED_SEARCHES_PER_DEVELOPER} searches"
+            }), 400
+        
+        response = supabase.table('Saved_Search').insert({
+            'developer_id': user['user_id'],
+            'name': name,
+            'filters': params
+        }).execute()
+        if response.data:
+            record_saved_search(response.data[0])
+        
+        return jsonify({
+            "success": True,
+            "saved_search": response.data[0] if response.data else None
+        })
+        
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"Error saving search: {str(e)}"
+        }), 500
+
+
+@routes.route('/api/saved-searches/<int:saved_search_id>', methods=['DELETE'])
+def delete_saved_search(saved_search_id):
+    """Delete one of the logged-in developer's saved searches (and its inbox entries)"""
+    user = get_current_user()
+    if not user or user['user_type'] != 'developer':
+        return jsonify({"success": False, "error": "Must be logged in as developer"}), 401
+    
+    if not supabase:
+        return jsonify({"success": False, "error": "Database not connected"}), 500
+    
+    try:
+        response = (supabase.table('Saved_Search').delete()
+                    .eq('saved_search_id', saved_search_id)
+                    .eq('developer_id', user['user_id']).execute())
+        if not response.data:
+            return jsonify({"success": False, "error": "Saved search not found"}), 404
+        
+        forget_saved_search(saved_search_id)
+        
+        return jsonify({
+            "success": True,
+            "message": "Saved search deleted"
+        })
+        
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"Error deleting saved search: {str(e)}"
+        }), 500
+
+
+@routes.route('/api/saved-searches/inbox', methods=['GET'])
+def get_saved_search_inbox():
+    """
+    New listings matching the logged-in developer's saved searches.
+    
+    Query parameters: since (the cursor of the previous response, 0 for
+    everything) and limit (at most LISTING_PAGE_MAX). Matches come oldest
+    first; pass the returned cursor as since to get only newer ones.
+    """
+    user = get_current_user()
+    if not user or user['user_type'] != 'developer':
+        return jsonify({"success": False, "error": "Must be logged in as developer"}), 401
+    
+    if not supabase:
+        return jsonify({"success": False, "error": "Database not connected"}), 500
+    
+    try:
+        try:
+            since = int(request.args.get('since') or 0)
+            limit = int(request.args.get('limit') or LISTING_PAGE_MAX)
+        except ValueError:
+            return jsonify({"success": False, "error": "Invalid since or limit"}), 400
+        if not 1 <= limit <= LISTING_PAGE_MAX:
+            return jsonify({"success": False, "error": f"Limit must be between 1 and {LISTING_PAGE_MAX}"}), 400
+        
+        matches = (supabase.table('Saved_Search_Match')
+                   .select('match_id, saved_search_id, property_id, created_at')
+                   .eq('developer_id', user['user_id'])
+                   .gt('match_id', since)
+                   .order('match_id')
+                   .limit(limit).execute()).data
+        
+        properties = {}
+        if matches:
+            property_response = (supabase.table('Property').select('*')
+                                 .in_('property_id', list({match['property_id'] for match in matches}))
+                                 .execute())
+            properties = {prop['property_id']: prop for prop in property_response.data}
+        
+        for match in matches:
+            match['property'] = properties.get(match['property_id'])
+        
+        return jsonify({
+            "success": True,
+            "matches": matches,
+            "cursor": matches[-1]['match_id'] if matches else since,
+            "has_more": len(matches) == limit
+        })
+        
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"Error fetching inbox: {str(e)}"
+        }), 500
+
+
+@routes.route('/api/events', methods=['GET'])
+def events():
+    """
+    Server-Sent Events stream of listing changes for the logged-in user.
+    
+    Event types: property.created / property.updated (data: the property
+    row), property.sold / property.deleted (data: {property_id}),
+    interest.created (owners only; data: property_id and developer) and
+    resync (events were missed: reload the lists). Developers receive the
+    property events, owners only those about their own properties.
+    """
+    user = get_current_user()
+    if not user:
+        return jsonify({"success": False, "error": "Must be logged in"}), 401
+    
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    return Response(
+        event_stream(event_bus, user['user_type'], user['user_id'], last_event_id),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 @routes.route('/api/contact-owner', methods=['POST'])
 def contact_owner():
     """Handle contact requests from developers to property owners"""
@@ -484,6 +928,15 @@ def mark_property_sold(property_id):
             'final_price': definite_price
         }).eq('property_id', property_id).execute()
         
+        forget_listing(property_id)
+        
+        # New comparable sale: update the price aggregates (this also invalidates cached estimates)
+        if response.data:
+            record_sold_property(response.data[0])
+        else:
+            bump_dataset_version()
+        publish_property_event('property.sold', response.data[0] if response.data else property_check.data[0])
+        
         return jsonify({
             "success": True,
             "message": "Property marked as sold successfully"
@@ -495,10 +948,15 @@ def mark_property_sold(property_id):
 
 @routes.route('/api/validate-city', methods=['POST'])
 def validate_city():
-    """Check if a city exists in the Belgian cities database and matches the province"""
+    """
+    Check if a city exists in the Belgian cities database and matches the province.
+    
+    The owner page validates against static/data/cities.json in the browser;
+    this endpoint is its fallback and serves clients without JavaScript.
+    """
     try:
         data = request.get_json()
-        city = (data.get('city') or '').strip().lower()
+        city = canonical_city(data.get('city'))
         province = (data.get('province') or '').strip()
         
         if not city:
@@ -506,10 +964,14 @@ def validate_city():
         
         # Check if city exists in pre-cached Belgian cities (case-insensitive)
         if city not in BELGIAN_CITIES:
+            suggestions = suggest_cities(data.get('city'), 3)
+            hint = (f"Did you mean {' or '.join(s['city'] for s in suggestions)}?" if suggestions
+                    else "Please check the spelling.")
             return jsonify({
                 "success": True, 
                 "valid": False, 
-                "error": f"'{data.get('city')}' is not a recognized Belgian city. Please check the spelling."
+                "error": f"'{data.get('city')}' is not a recognized Belgian city. {hint}",
+                "suggestions": suggestions
             })
         
         # Check if city is in the correct province
@@ -519,7 +981,7 @@ def validate_city():
                 return jsonify({
                     "success": True,
                     "valid": False,
-                    "error": f"'{data.get('city').title()}' is not in {province}. This city is located in {expected_province}."
+                    "error": f"'{city_display_name(city)}' is not in {province}. This city is located in {expected_province}."
                 })
         
         return jsonify({"success": True, "valid": True, "city": city})
@@ -528,6 +990,31 @@ def validate_city():
         return jsonify({"success": False, "error": f"Error validating city: {str(e)}"}), 500
 
 
+@routes.route('/api/cities/suggest', methods=['GET'])
+def cities_suggest():
+    """
+    Autocomplete for city names.
+    
+    Query parameters: q (what was typed so far, accents and hyphens
+    optional, typos tolerated) and limit (default CITY_SUGGESTIONS_DEFAULT,
+    at most CITY_SUGGESTIONS_MAX).
+    """
+    try:
+        limit = int(request.args.get('limit', CITY_SUGGESTIONS_DEFAULT))
+    except ValueError:
+        return jsonify({"success": False, "error": "Invalid limit"}), 400
+    if not 1 <= limit <= CITY_SUGGESTIONS_MAX:
+        return jsonify({"success": False, "error": f"limit must be between 1 and {CITY_SUGGESTIONS_MAX}"}), 400
+    
+    try:
+        return jsonify({
+            "success": True,
+            "suggestions": suggest_cities(request.args.get('q', ''), limit)
+        })
+    except Exception as e:
+        return jsonify({"success": False, "error": f"Error suggesting cities: {str(e)}"}), 500
+
+
 @routes.route('/api/estimate-price', methods=['POST'])
 def api_estimate_price():
     """API endpoint to estimate property price based on KNN algorithm"""
@@ -546,7 +1033,7 @@ def api_estimate_price():
                 "error": f"Missing required fields: {', '.join(missing_fields)}"
             }), 400
         
-        result = estimate_property_price(data)
+        result = estimate_property_price_cached(data)
         
         if result.get('success'):
             return jsonify(result)
@@ -565,56 +1052,59 @@ def get_my_properties():
         return jsonify({"success": False, "error": "Must be logged in as property owner"}), 401
     
     try:
-        response = supabase.table('Property').select('*').eq('propertyOwner_id', user['user_id']).execute()
-        
-        properties = response.data
-        
-        for property_data in properties:
-            property_id = property_data['property_id']
-            
-            interests_response = supabase.table('Property_Interest').select('developer_id').eq('property_id', property_id).execute()
-            print(f"Property {property_id} - Interests from DB: {interests_response.data}")
-            
-            interested_developers = []
-            if interests_response.data:
-                for interest in interests_response.data:
-                    developer_id = interest['developer_id']
-                    print(f"  Fetching developer {developer_id}")
-                    developer_response = supabase.table('Developer').select('first_name, last_name, email, phone_number, company_name').eq('developer_id', developer_id).execute()
-                    
-                    if developer_response.data:
-                        dev_data = developer_response.data[0]
-                        interested_developers.append({
-                            'first_name': dev_data['first_name'],
-                            'last_name': dev_data['last_name'],
-                            'email': dev_data['email'],
-                            'phone_number': dev_data.get('phone_number'),
-                            'company': dev_data.get('company_name')
-                        })
-            
-            print(f"Property {property_id} - Total interested developers: {len(interested_developers)}")
-            property_data['interested_developers'] = interested_developers
-            property_data['interested_developer'] = interested_developers[0] if interested_developers else None
-        
         return jsonify({
             "success": True,
-            "properties": properties
+            "properties": owner_properties(user['user_id'])
         })
         
     except Exception as e:
         return jsonify({"success": False, "error": f"Error fetching properties: {str(e)}"}), 500
 
 
+def owner_properties(owner_id):
+    """Properties of an owner, each with the developers interested in it"""
+    response = supabase.table('Property').select('*').eq('propertyOwner_id', owner_id).execute()
+    
+    properties = response.data
+    
+    for property_data in properties:
+        property_id = property_data['property_id']
+        
+        interests_response = supabase.table('Property_Interest').select('developer_id').eq('property_id', property_id).execute()
+        print(f"Property {property_id} - Interests from DB: {interests_response.data}")
+        
+        interested_developers = []
+        if interests_response.data:
+            for interest in interests_response.data:
+                developer_id = interest['developer_id']
+                print(f"  Fetching developer {developer_id}")
+                developer_response = supabase.table('Developer').select('first_name, last_name, email, phone_number, company_name').eq('developer_id', developer_id).execute()
+                
+                if developer_response.data:
+                    dev_data = developer_response.data[0]
+                    interested_developers.append({
+                        'first_name': dev_data['first_name'],
+                        'last_name': dev_data['last_name'],
+                        'email': dev_data['email'],
+                        'phone_number': dev_data.get('phone_number'),
+                        'company': dev_data.get('company_name')
+                    })
+        
+        print(f"Property {property_id} - Total interested developers: {len(interested_developers)}")
+        property_data['interested_developers'] = interested_developers
+        property_data['interested_developer'] = interested_developers[0] if interested_developers else None
+    
+    return properties
+
+
 @routes.route('/api/property/<int:property_id>', methods=['GET'])
 def get_property_details(property_id):
     """Get detailed information for a specific property"""
     try:
-        response = supabase.table('Property').select('*').eq('property_id', property_id).execute()
+        property_data = fetch_property(property_id)
         
-        if not response.data:
+        if not property_data:
             return jsonify({"success": False, "error": "Property not found"}), 404
-            
-        property_data = response.data[0]
         
         return jsonify({
             "success": True,
@@ -625,6 +1115,12 @@ def get_property_details(property_id):
         return jsonify({"success": False, "error": f"Error fetching property: {str(e)}"}), 500
 
 
+def fetch_property(property_id):
+    """The Property row with this id, or None"""
+    response = supabase.table('Property').select('*').eq('property_id', property_id).execute()
+    return response.data[0] if response.data else None
+
+
 @routes.route('/api/show-contact', methods=['POST'])
 def show_contact_info():
     """Show property owner contact info and register developer interest"""
@@ -648,18 +1144,30 @@ def show_contact_info():
         property_data = property_response.data[0]
         property_owner_id = property_data['propertyOwner_id']
         
-        existing_interest = supabase.table('Property_Interest').select('*').eq('property_id', property_id).eq('developer_id', developer_id).execute()
-        print(f"Existing interest check for property {property_id}, developer {developer_id}: {existing_interest.data}")
+        # The unique (property_id, developer_id) constraint makes this a no-op for repeat views
+        insert_result = supabase.table('Property_Interest').upsert({
+            'property_id': property_id,
+            'developer_id': developer_id
+        }, on_conflict='property_id,developer_id', ignore_duplicates=True).execute()
+        print(f"Interest registered for property {property_id}, developer {developer_id}: {insert_result.data}")
         
-        if not existing_interest.data:
-            print(f"Inserting new interest for property {property_id}, developer {developer_id}")
-            insert_result = supabase.table('Property_Interest').insert({
-                'property_id': property_id,
-                'developer_id': developer_id
-            }).execute()
-            print(f"Insert result: {insert_result.data}")
-        else:
-            print(f"Interest already exists, skipping insert")
+        # Repeat views return no row (the insert was skipped): only announce new interest
+        if insert_result.data:
+            try:
+                developer_response = (supabase.table('Developer')
+                                      .select('first_name, last_name, email, phone_number, company_name')
+                                      .eq('developer_id', developer_id).execute())
+                if developer_response.data:
+                    dev_data = developer_response.data[0]
+                    publish_interest_event(property_data, {
+                        'first_name': dev_data['first_name'],
+                        'last_name': dev_data['last_name'],
+                        'email': dev_data['email'],
+                        'phone_number': dev_data.get('phone_number'),
+                        'company': dev_data.get('company_name')
+                    })
+            except Exception as event_error:
+                print(f"[EVENTS] Could not publish interest event: {event_error}")
         
         owner_response = supabase.table('Property owner').select('email, phone_number').eq('propertyOwner_id', property_owner_id).execute()
         
@@ -717,6 +1225,12 @@ def delete_property(property_id):
                 print(f"Error deleting image {image_url}: {img_error}")
         
         supabase.table('Property').delete().eq('property_id', property_id).execute()
+        forget_listing(property_id)
+        publish_property_event('property.deleted', property_data)
+        
+        # A deleted sold property is no longer a comparable for estimates
+        if property_data.get('sold'):
+            forget_sold_property(property_id)
         
         return jsonify({
             "success": True,
@@ -754,17 +1268,22 @@ def update_property(property_id):
         
         # Validate required fields
         property_name = (data.get('property_name') or '').strip()
-        property_type = (data.get('type') or 'land').strip().lower()
-        province = (data.get('province') or '').strip()
-        city = (data.get('city') or '').strip()
+        property_type = normalize_property_type(data.get('type') or 'land')
+        province = normalize_province(data.get('province'))
+        city_key = canonical_city(data.get('city'))
         size = data.get('size')
         description = (data.get('description') or '').strip()
         price_min = data.get('price_min')
         price_max = data.get('price_max')
         
-        if not property_name or not city or not size:
+        if not property_name or not city_key or not size:
             return jsonify({"success": False, "error": "Missing required fields"}), 400
         
+        if property_type is None:
+            return jsonify({"success": False, "error": "Invalid property type"}), 400
+        if (data.get('province') or '').strip() and province is None:
+            return jsonify({"success": False, "error": "Invalid province"}), 400
+        
         # Validate prices
         try:
             price_min = float(price_min) if price_min else 0
@@ -815,7 +1334,8 @@ def update_property(property_id):
             "property_name": property_name,
             "type": property_type,
             "province": province,
-            "city": city,
+            "city": city_display_name(city_key),
+            "city_key": city_key,
             "size": size,
             "description": description,
             "price_min": price_min,
@@ -824,6 +1344,9 @@ def update_property(property_id):
         }
         
         response = supabase.table('Property').update(update_data).eq('property_id', property_id).execute()
+        if response.data:
+            record_listing(response.data[0])
+            publish_property_event('property.updated', response.data[0])
         
         return jsonify({
             "success": True,
@@ -0,0 +1,193 @@
+# saved_searches.py
+import bisect
+import threading
+import time
+
+from text_search import listing_terms
+
+
+# =============================================================================
+# SAVED SEARCH MATCH ENGINE
+# =============================================================================
+# Finds the saved searches a newly submitted listing matches, without
+# checking every saved search.
+#
+# Searches are grouped in buckets keyed on (province, type), where None means
+# "any". A listing can only match the searches in four buckets: its own
+# (province, type), (province, any), (any, type) and (any, any).
+#
+# Within a bucket the size and price filters are intervals: min_size gives
+# [min_size, inf) on the listing size, max_price gives (-inf, max_price] on
+# its minimum price. Because every interval is open on one side, an interval
+# tree reduces to one sorted array of bounds per dimension: the searches
+# containing a value are a prefix (size) or a suffix (price) of the array,
+# located with bisect. The engine walks the shorter of the two and checks the
+# remaining filters (other interval, city, radius, search terms) on those
+# searches only.
+#
+# The index only holds data; models.py loads it from the Saved_Search table
+# and stores the matches (see match_saved_searches()).
+
+_NO_LOWER_BOUND = float('-inf')
+_NO_UPPER_BOUND = float('inf')
+
+
+class _Bucket:
+    """Saved searches with the same (province, type), sorted on their size and price bounds"""
+
+    __slots__ = ('by_min_size', 'by_max_price')
+
+    def __init__(self):
+        self.by_min_size = []   # sorted (min_size or -inf, saved_search_id)
+        self.by_max_price = []  # sorted (max_price or inf, saved_search_id)
+
+    def __len__(self):
+        return len(self.by_min_size)
+
+
+class SavedSearchIndex:
+    """Saved searches indexed for matching new listings"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._searches = {}  # saved_search_id -> search
+        self._buckets = {}   # (province, type) -> _Bucket
+        self.max_id = 0      # highest saved_search_id seen (new searches have higher ids)
+        self.loaded_at = None
+
+    # ----- maintenance -----
+
+    def rebuild(self, searches):
+        """Replace the index with the given searches (see add() for their format)"""
+        with self._lock:
+            self._searches = {}
+            self._buckets = {}
+            self.max_id = 0
+            for search in searches:
+                self.add(search)
+            self.loaded_at = time.time()
+            print(f"[SAVED SEARCH] Index rebuilt with {len(self._searches)} saved searches")
+
+    def add(self, search):
+        """
+        Add or replace a saved search.
+
+        Args:
+            search: Dict with saved_search_id, developer_id and filters (the
+                dict returned by parse_listing_filters)
+        """
+        with self._lock:
+            search_id = search['saved_search_id']
+            self.remove(search_id)
+            filters = search['filters']
+            self._searches[search_id] = search
+            self.max_id = max(self.max_id, search_id)
+
+            bucket = self._buckets.setdefault(_bucket_key(filters), _Bucket())
+            bisect.insort(bucket.by_min_size, (_min_size(filters), search_id))
+            bisect.insort(bucket.by_max_price, (_max_price(filters), search_id))
+
+    def remove(self, saved_search_id):
+        """Remove a saved search; returns False when it was not indexed"""
+        with self._lock:
+            search = self._searches.pop(saved_search_id, None)
+            if search is None:
+                return False
+            filters = search['filters']
+            key = _bucket_key(filters)
+            bucket = self._buckets[key]
+            _remove_from_sorted(bucket.by_min_size, (_min_size(filters), saved_search_id))
+            _remove_from_sorted(bucket.by_max_price, (_max_price(filters), saved_search_id))
+            if not len(bucket):
+                del self._buckets[key]
+            return True
+
+    def is_fresh(self, max_age_seconds):
+        return self.loaded_at is not None and time.time() - self.loaded_at < max_age_seconds
+
+    # ----- matching -----
+
+    def match(self, row):
+        """
+        Find the saved searches a listing matches (same semantics as the
+        /api/properties filters).
+
+        Args:
+            row: Property row (unsold)
+
+        Returns:
+            List of matching searches ordered by saved_search_id
+        """
+        size = row.get('size')
+        size = _NO_LOWER_BOUND if size is None else size
+        price = row.get('price_min')
+        price = _NO_UPPER_BOUND if price is None else price
+        province, property_type = row.get('province'), row.get('type')
+        terms = None
+
+        with self._lock:
+            matches = []
+            for key in {(province, property_type), (province, None), (None, property_type), (None, None)}:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    continue
+
+                # Searches whose size interval contains the listing size: a prefix
+                size_end = bisect.bisect_right(bucket.by_min_size, (size, _NO_UPPER_BOUND))
+                # Searches whose price interval contains the listing price: a suffix
+                price_start = bisect.bisect_left(bucket.by_max_price, (price, _NO_LOWER_BOUND))
+
+                if size_end <= len(bucket.by_max_price) - price_start:
+                    candidates = (self._searches[search_id] for _, search_id in bucket.by_min_size[:size_end])
+                    candidates = (search for search in candidates if _max_price(search['filters']) >= price)
+                else:
+                    candidates = (self._searches[search_id] for _, search_id in bucket.by_max_price[price_start:])
+                    candidates = (search for search in candidates if _min_size(search['filters']) <= size)
+
+                for search in candidates:
+                    filters = search['filters']
+                    if filters['search_terms'] is not None and terms is None:
+                        terms = listing_terms(row)
+                    if _matches_location_and_text(filters, row, terms):
+                        matches.append(search)
+
+            matches.sort(key=lambda search: search['saved_search_id'])
+            return matches
+
+    def get(self, saved_search_id):
+        return self._searches.get(saved_search_id)
+
+    def __len__(self):
+        return len(self._searches)
+
+
+def _bucket_key(filters):
+    return (filters['province'], filters['property_type'])
+
+
+def _min_size(filters):
+    return _NO_LOWER_BOUND if filters['min_size'] is None else filters['min_size']
+
+
+def _max_price(filters):
+    return _NO_UPPER_BOUND if filters['max_price'] is None else filters['max_price']
+
+
+def _matches_location_and_text(filters, row, terms):
+    """The filters not covered by the buckets and intervals: city, radius and search terms"""
+    city_key = row.get('city_key') or ''
+    if filters['city_key'] is not None and city_key != filters['city_key']:
+        return False
+    if filters['city_key'] is None and filters['city_prefix'] is not None and not city_key.startswith(filters['city_prefix']):
+        return False
+    if filters['near_cities'] is not None and city_key not in filters['near_cities']:
+        return False
+    if filters['search_terms'] is not None and not terms.issuperset(filters['search_terms']):
+        return False
+    return True
+
+
+def _remove_from_sorted(array, item):
+    index = bisect.bisect_left(array, item)
+    if index < len(array) and array[index] == item:
+        array.pop(index)
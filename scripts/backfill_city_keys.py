@@ -0,0 +1,78 @@
+# scripts/backfill_city_keys.py
+"""
+Rewrite the city_key and city columns of existing properties.
+
+New and updated properties get their canonical city key and display name in
+submit_property / update_property. Rows written before that (or only given a
+plain lowercase key by migrations/0003_city_key.sql) are normalized here with
+the same canonical_city() / city_display_name() functions. Only rows whose
+values change are updated, so the script can be run again at any time.
+
+Uses the app's Supabase connection (SUPABASE_URL / SUPABASE_KEY from .env, or
+SUPABASE_LOCAL_DATA for the local stand-in).
+
+Usage (from the project root, after applying migration 0003):
+    python scripts/backfill_city_keys.py --dry-run
+    python scripts/backfill_city_keys.py --batch-size 500
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import supabase, canonical_city, city_display_name, is_known_city  # noqa: E402
+
+
+def iter_properties(batch_size):
+    """Yield (property_id, city, city_key) for all properties, in pages ordered by id"""
+    start = 0
+    while True:
+        response = (supabase.table('Property')
+                    .select('property_id, city, city_key')
+                    .order('property_id')
+                    .range(start, start + batch_size - 1)
+                    .execute())
+        rows = response.data or []
+        yield from rows
+        if len(rows) < batch_size:
+            return
+        start += batch_size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill canonical city keys on existing properties")
+    parser.add_argument('--batch-size', type=int, default=1000, help="rows fetched per page")
+    parser.add_argument('--dry-run', action='store_true', help="only report what would change")
+    args = parser.parse_args(argv)
+
+    if not supabase:
+        print("Database not connected")
+        return 1
+
+    scanned = changed = unknown = 0
+    for row in iter_properties(args.batch_size):
+        scanned += 1
+        city_key = canonical_city(row.get('city'))
+        if not city_key:
+            continue
+        if not is_known_city(city_key):
+            unknown += 1
+
+        update = {'city_key': city_key, 'city': city_display_name(city_key)}
+        if row.get('city_key') == update['city_key'] and row.get('city') == update['city']:
+            continue
+
+        changed += 1
+        print(f"[BACKFILL] {row['property_id']}: {row.get('city')!r} -> {update['city']!r} ({city_key})")
+        if not args.dry_run:
+            supabase.table('Property').update(update).eq('property_id', row['property_id']).execute()
+
+    action = "would update" if args.dry_run else "updated"
+    print(f"[BACKFILL] Scanned {scanned} properties, {action} {changed}, "
+          f"{unknown} with a city outside BELGIAN_CITIES")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,154 @@
+# scripts/build_static.py
+"""
+Prepare static/ for a deploy: generated data, precompressed siblings and the
+asset manifest.
+
+- Writes static/data/cities.json, the municipality list the owner page
+  validates cities with, from BELGIAN_CITIES / CITY_TO_PROVINCE in belgian_cities.py
+  (see city_dataset()). The file is committed, so run the script after
+  changing those tables and commit the result.
+- Writes .gz and .br siblings. The app sends static/css/styles.css.br (or
+  .gz) instead of compressing static/css/styles.css on every request when
+  the client accepts it and the sibling is not older than the file (see
+  send_static() in compression.py). Files are compressed at the highest
+  levels, since this runs once per deploy; .br files are only written when
+  the optional brotli package is installed. Siblings that would not be
+  smaller than the file are not written.
+- Writes static/manifest.json with the content hash of every static file,
+  used for the fingerprinted URLs of asset_url() (see static_assets.py), so
+  the app does not hash the files itself after a deploy.
+
+Stale output is replaced, so the script can be run again after every change.
+
+Usage (from the project root, as part of the deploy):
+    python scripts/build_static.py
+    python scripts/build_static.py --clean
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compression import COMPRESSION_MIN_SIZE, PRECOMPRESSED_SUFFIXES, brotli  # noqa: E402
+from belgian_cities import city_dataset  # noqa: E402
+from static_assets import MANIFEST_NAME, file_hash  # noqa: E402
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.json', '.svg', '.html', '.txt', '.map', '.xml'}
+
+CITY_DATA_NAME = os.path.join('data', 'cities.json')
+
+
+def write_city_data(static_dir):
+    """Write the municipality list for client-side validation; returns the number of cities"""
+    dataset = city_dataset()
+    path = os.path.join(static_dir, CITY_DATA_NAME)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(dataset, f, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+    return len(dataset['cities'])
+
+
+def iter_static_files(static_dir):
+    """Yield the paths of the static files (not the generated ones)"""
+    generated = tuple(PRECOMPRESSED_SUFFIXES.values())
+    for root, _, files in os.walk(static_dir):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            if name.endswith(generated) or os.path.relpath(path, static_dir) == MANIFEST_NAME:
+                continue
+            yield path
+
+
+def write_manifest(static_dir):
+    """Write the content hash and modification time of every static file to the manifest"""
+    files = {}
+    for path in iter_static_files(static_dir):
+        filename = os.path.relpath(path, static_dir).replace(os.sep, '/')
+        files[filename] = {'hash': file_hash(path), 'mtime': os.path.getmtime(path)}
+
+    with open(os.path.join(static_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump({'files': files}, f, indent=2, sort_keys=True)
+    return len(files)
+
+
+def compress_file(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def build(static_dir, clean=False):
+    """
+    Write (or with clean=True remove) the precompressed siblings.
+
+    Returns:
+        Tuple (files written, bytes before, bytes after) for the .gz files
+    """
+    encodings = ['gzip'] + (['br'] if brotli is not None else [])
+    written, original_total, gzip_total = 0, 0, 0
+
+    for path in iter_static_files(static_dir):
+        if os.path.splitext(path)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+            continue
+        with open(path, 'rb') as f:
+            data = f.read()
+        stat = os.stat(path)
+
+        for encoding in PRECOMPRESSED_SUFFIXES:
+            sibling = path + PRECOMPRESSED_SUFFIXES[encoding]
+            if clean or encoding not in encodings or len(data) < COMPRESSION_MIN_SIZE:
+                if os.path.exists(sibling):
+                    os.remove(sibling)
+                continue
+
+            compressed = compress_file(data, encoding)
+            if len(compressed) >= len(data):
+                if os.path.exists(sibling):
+                    os.remove(sibling)
+                continue
+
+            with open(sibling, 'wb') as f:
+                f.write(compressed)
+            # Same mtime as the source: a later edit of the source makes the sibling stale
+            os.utime(sibling, (stat.st_atime, stat.st_mtime))
+            written += 1
+            if encoding == 'gzip':
+                original_total += len(data)
+                gzip_total += len(compressed)
+            print(f"{os.path.relpath(sibling, static_dir)}: {len(data)} -> {len(compressed)} bytes")
+
+    return written, original_total, gzip_total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompress static files and write the asset manifest")
+    parser.add_argument('--static-dir', default=STATIC_DIR, help="folder to process (default: static/)")
+    parser.add_argument('--clean', action='store_true', help="remove the precompressed siblings and the manifest instead")
+    args = parser.parse_args(argv)
+
+    if not args.clean:
+        print(f"Wrote {CITY_DATA_NAME} ({write_city_data(args.static_dir)} cities)")
+
+    written, original_total, gzip_total = build(args.static_dir, clean=args.clean)
+    if args.clean:
+        manifest_path = os.path.join(args.static_dir, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        print("Removed precompressed files and the asset manifest")
+        return 0
+
+    print(f"Wrote {MANIFEST_NAME} ({write_manifest(args.static_dir)} files)")
+
+    if brotli is None:
+        print("brotli is not installed: only .gz files were written")
+    print(f"Wrote {written} files (gzip: {original_total} -> {gzip_total} bytes)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
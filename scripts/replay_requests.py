@@ -0,0 +1,215 @@
+# scripts/replay_requests.py
+"""
+Replay a captured API request log (see request_log.py) against a running instance.
+
+Requests are re-issued with the same relative timing as in the capture, sped up
+by --speed, and each captured session gets its own cookie jar. At the end a
+latency report with percentiles is printed per route.
+
+By default only read-only requests are replayed. Use --include-writes to also
+replay submissions, updates, deletions and other mutations (only do this
+against a disposable database, e.g. the local data stand-in).
+
+Usage (from the project root):
+    python scripts/replay_requests.py logs/requests.jsonl --base-url http://127.0.0.1:5000
+    python scripts/replay_requests.py logs/requests.jsonl --speed 10 --concurrency 32
+    python scripts/replay_requests.py logs/requests.jsonl --speed 0   # as fast as possible
+    python scripts/replay_requests.py logs/requests.jsonl --developer-email dev@example.com
+"""
+import argparse
+import json
+import math
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# Routes that do not change data and are safe to replay against any instance
+READ_ONLY_ROUTES = {
+    ('GET', '/api/properties'),
+    ('GET', '/api/my-properties'),
+    ('GET', '/api/property/<int:property_id>'),
+    ('GET', '/api/current-user'),
+    ('POST', '/api/validate-city'),
+    ('POST', '/api/estimate-price'),
+}
+
+# Routes that are never replayed (they would break the replay sessions)
+SKIPPED_ROUTES = {
+    ('POST', '/api/login'),
+    ('POST', '/api/logout'),
+}
+
+
+def load_records(path):
+    """Read a JSONL capture file, skipping blank or malformed lines"""
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                print(f"[REPLAY] Skipping malformed line {line_number}")
+    records.sort(key=lambda r: r.get('ts', 0))
+    return records
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, math.ceil(len(sorted_values) * pct / 100) - 1)
+    return sorted_values[rank]
+
+
+class SessionPool:
+    """
+    One requests.Session per captured session id, logged in on first use.
+
+    Captured logins cannot be replayed (emails are redacted), so sessions are
+    logged in with the accounts given on the command line instead.
+    """
+
+    def __init__(self, base_url, developer_email=None, owner_email=None):
+        self.base_url = base_url
+        self.accounts = {'developer': developer_email, 'property_owner': owner_email}
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get(self, record):
+        key = record.get('session') or 'anonymous'
+        with self._lock:
+            if key in self._sessions:
+                return self._sessions[key]
+
+            http = requests.Session()
+            email = self.accounts.get(record.get('user_type'))
+            if email:
+                http.post(f"{self.base_url}/api/login",
+                          json={'email': email, 'user_type': record['user_type']}, timeout=30)
+            self._sessions[key] = http
+            return http
+
+
+def send(pool, record, timeout):
+    """Re-issue one captured request; returns (route, latency_ms, status or error)"""
+    http = pool.get(record)
+    method = record['method']
+    url = pool.base_url + record['path']
+    body = record.get('body')
+
+    kwargs = {'params': record.get('query') or None, 'timeout': timeout}
+    if method != 'GET' and body is not None:
+        if isinstance(body, dict) and '_files' in body:
+            kwargs['data'] = {k: v for k, v in body.items() if k != '_files'}
+        else:
+            kwargs['json'] = body
+
+    start = time.perf_counter()
+    try:
+        response = http.request(method, url, **kwargs)
+        outcome = response.status_code
+    except requests.exceptions.RequestException as e:
+        outcome = type(e).__name__
+    return record['route'], (time.perf_counter() - start) * 1000, outcome
+
+
+def replay(records, speed, concurrency, timeout, pool):
+    """Dispatch records on their captured schedule and collect the results"""
+    results = []
+    results_lock = threading.Lock()
+
+    def run(record):
+        result = send(pool, record, timeout)
+        with results_lock:
+            results.append(result)
+
+    first_ts = records[0].get('ts', 0) if records else 0
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for record in records:
+            if speed > 0:
+                due = (record.get('ts', first_ts) - first_ts) / speed
+                delay = due - (time.perf_counter() - started)
+                if delay > 0:
+                    time.sleep(delay)
+            executor.submit(run, record)
+
+    return results, time.perf_counter() - started
+
+
+def print_report(results, elapsed):
+    """Print request counts, error counts and latency percentiles per route"""
+    by_route = defaultdict(list)
+    for route, latency, outcome in results:
+        by_route[route].append((latency, outcome))
+
+    header = f"{'route':<40} {'count':>6} {'errors':>6} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+    print(header)
+    print('-' * len(header))
+
+    all_latencies = []
+    for route in sorted(by_route):
+        entries = by_route[route]
+        latencies = sorted(latency for latency, _ in entries)
+        errors = sum(1 for _, outcome in entries if not isinstance(outcome, int) or outcome >= 500)
+        all_latencies.extend(latencies)
+        print(f"{route:<40} {len(entries):>6} {errors:>6} "
+              f"{percentile(latencies, 50):>8.1f} {percentile(latencies, 90):>8.1f} "
+              f"{percentile(latencies, 95):>8.1f} {percentile(latencies, 99):>8.1f} {latencies[-1]:>8.1f}")
+
+    all_latencies.sort()
+    if all_latencies:
+        print('-' * len(header))
+        print(f"{'ALL':<40} {len(all_latencies):>6} {'':>6} "
+              f"{percentile(all_latencies, 50):>8.1f} {percentile(all_latencies, 90):>8.1f} "
+              f"{percentile(all_latencies, 95):>8.1f} {percentile(all_latencies, 99):>8.1f} {all_latencies[-1]:>8.1f}")
+    print(f"\nReplayed {len(results)} requests in {elapsed:.1f}s "
+          f"({len(results) / elapsed if elapsed else 0:.1f} req/s). Latencies in ms.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a captured GroundLink API request log")
+    parser.add_argument('log', help="JSONL file written by request_log.py")
+    parser.add_argument('--base-url', default='http://127.0.0.1:5000', help="instance to replay against")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="replay speed multiplier (1 = real time, 10 = 10x faster, 0 = no delays)")
+    parser.add_argument('--concurrency', type=int, default=8, help="maximum requests in flight")
+    parser.add_argument('--timeout', type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument('--include-writes', action='store_true', help="also replay mutating requests")
+    parser.add_argument('--developer-email', help="account used for captured developer sessions")
+    parser.add_argument('--owner-email', help="account used for captured property owner sessions")
+    args = parser.parse_args(argv)
+
+    records = []
+    for record in load_records(args.log):
+        key = (record.get('method'), record.get('route'))
+        if key in SKIPPED_ROUTES:
+            continue
+        if not args.include_writes and key not in READ_ONLY_ROUTES:
+            continue
+        records.append(record)
+
+    if not records:
+        print("[REPLAY] Nothing to replay")
+        return 1
+
+    base_url = args.base_url.rstrip('/')
+    print(f"[REPLAY] {len(records)} requests against {base_url} "
+          f"(speed={args.speed}x, concurrency={args.concurrency})\n")
+
+    pool = SessionPool(base_url, args.developer_email, args.owner_email)
+    results, elapsed = replay(records, args.speed, args.concurrency, args.timeout, pool)
+    print_report(results, elapsed)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+# scripts/resp_server.py
+"""
+Minimal Redis-protocol (RESP2) server, as a local stand-in for Redis.
+
+Supports the commands the cache backend uses (GET, SET with EX/PX, INCR, DEL,
+PING, SELECT, AUTH, FLUSHALL), with everything kept in memory. It lets several
+local gunicorn workers share their caches with CACHE_BACKEND=redis (or
+memory+redis) without installing Redis. Do not use it in production.
+
+Usage (from the project root):
+    python scripts/resp_server.py --port 6379
+    CACHE_BACKEND=memory+redis CACHE_REDIS_URL=redis://127.0.0.1:6379/0 gunicorn -w 4 app:app
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+_data = {}  # (db, key) -> (value, expires_at)
+_lock = threading.Lock()
+
+
+def _get(db, key):
+    entry = _data.get((db, key))
+    if entry is None:
+        return None
+    if entry[1] is not None and entry[1] <= time.monotonic():
+        del _data[(db, key)]
+        return None
+    return entry[0]
+
+
+def _encode(reply):
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, Exception):
+        return f"-ERR {reply}\r\n".encode()
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, str):
+        return f"+{reply}\r\n".encode()
+    return b"$%d\r\n%s\r\n" % (len(reply), reply)
+
+
+def execute(db, args):
+    """
+    Run one command.
+
+    Returns:
+        (reply, db): the reply (bytes, int, status string, None or an
+        exception for an error reply) and the selected database afterwards
+    """
+    command = args[0].upper()
+    with _lock:
+        if command == b'PING':
+            return 'PONG', db
+        if command == b'SELECT':
+            return 'OK', int(args[1])
+        if command == b'AUTH':
+            return 'OK', db
+        if command == b'GET':
+            return _get(db, args[1]), db
+        if command == b'SET':
+            expires_at = None
+            options = [arg.upper() for arg in args[3:]]
+            if b'PX' in options:
+                expires_at = time.monotonic() + int(args[3 + options.index(b'PX') + 1]) / 1000
+            elif b'EX' in options:
+                expires_at = time.monotonic() + int(args[3 + options.index(b'EX') + 1])
+            _data[(db, args[1])] = (args[2], expires_at)
+            return 'OK', db
+        if command == b'INCR':
+            value = _get(db, args[1])
+            try:
+                value = int(value or 0) + 1
+            except ValueError:
+                return ValueError("value is not an integer or out of range"), db
+            _data[(db, args[1])] = (str(value).encode(), None)
+            return value, db
+        if command == b'DEL':
+            return sum(_data.pop((db, key), None) is not None for key in args[1:]), db
+        if command == b'FLUSHALL':
+            _data.clear()
+            return 'OK', db
+    return ValueError(f"unknown command '{command.decode(errors='replace')}'"), db
+
+
+class RESPHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        db = 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            if not line.startswith(b'*'):
+                # Inline command (e.g. typed in telnet)
+                args = line.split()
+            else:
+                args = []
+                for _ in range(int(line[1:])):
+                    length = int(self.rfile.readline()[1:])
+                    args.append(self.rfile.read(length + 2)[:-2])
+            if not args:
+                continue
+            reply, db = execute(db, args)
+            self.wfile.write(_encode(reply))
+
+
+class RESPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=6379)
+    args = parser.parse_args()
+
+    with RESPServer((args.host, args.port), RESPHandler) as server:
+        print(f"[RESP] Listening on {args.host}:{args.port}")
+        server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# singleflight.py
+import threading
+
+
+# =============================================================================
+# REQUEST COALESCING
+# =============================================================================
+# When several threads need the result of the same expensive operation at the
+# same time (a cold sold snapshot, a Nominatim lookup for a new city, an
+# estimate nobody has cached yet, a listing query run against the database),
+# only the first one runs it. The others wait for it and get the same result,
+# or the same exception.
+#
+# Nothing is remembered once the operation finishes: a call that starts
+# afterwards runs the operation again (or, usually, finds the result in the
+# cache the first call filled). The result object is shared between all
+# waiting callers, so they must treat it as read-only and copy it before
+# changing it.
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs each key at most once at a time; concurrent callers share the outcome"""
+
+    def __init__(self, name, on_shared_error=None):
+        """
+        Args:
+            name: Name used in log lines
+            on_shared_error: Optional function called with the exception in
+                each waiting caller that receives it (e.g. to record a
+                database failure on that caller's request as well)
+        """
+        self.name = name
+        self._on_shared_error = on_shared_error
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> _Call in flight
+        self.shared = 0   # number of calls served by another caller's run
+
+    def do(self, key, function):
+        """
+        Run function() unless the same key is already running, in which case
+        wait for that run instead.
+
+        Args:
+            key: Hashable identity of the operation
+            function: Callable without arguments
+
+        Returns:
+            The result of function(), possibly computed by another thread
+
+        Raises:
+            Whatever function() raised, in every caller that waited for it
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                if self._on_shared_error is not None:
+                    self._on_shared_error(call.error)
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+            if call.waiters:
+                print(f"[SINGLEFLIGHT] {self.name}: {call.waiters} caller(s) shared one run")
+        return call.result
+
+    def in_flight(self) -> int:
+        """Number of keys currently running"""
+        with self._lock:
+            return len(self._calls)
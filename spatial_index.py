@@ -0,0 +1,115 @@
+# spatial_index.py
+import math
+
+
+# =============================================================================
+# CITY SPATIAL INDEX
+# =============================================================================
+# Answers "which cities lie within R km of this point" for the radius search
+# on /api/properties without computing a distance to every known city.
+#
+# Cities are bucketed into a grid of cells of CELL_DEGREES x CELL_DEGREES.
+# A lookup only visits the cells overlapping the bounding box of the search
+# circle, and computes the exact haversine distance for the cities in those
+# cells in one batch, using the radians and cosines stored when the index
+# was built (so no trigonometry is repeated per city and per request).
+#
+# The index is built once from BELGIAN_CITIES in models.py (see
+# cities_within_radius()).
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+# About 11 km north-south and 7 km east-west in Belgium: a 10 km search visits
+# around a dozen cells
+CELL_DEGREES = 0.1
+
+
+def haversine_distances(lat: float, lon: float, points: list) -> list:
+    """
+    Haversine distance from one point to many (batched form of haversine_distance).
+
+    Args:
+        lat, lon: Origin in degrees
+        points: List of precomputed (lat_radians, lon_radians, cos_lat) tuples
+
+    Returns:
+        List of distances in kilometers, in the order of points
+    """
+    lat_rad = math.radians(lat)
+    lon_rad = math.radians(lon)
+    cos_lat = math.cos(lat_rad)
+    sin, asin, sqrt = math.sin, math.asin, math.sqrt
+    diameter = 2 * EARTH_RADIUS_KM
+
+    distances = []
+    for point_lat, point_lon, point_cos in points:
+        a = (sin((point_lat - lat_rad) / 2) ** 2
+             + cos_lat * point_cos * sin((point_lon - lon_rad) / 2) ** 2)
+        # asin(sqrt(a)) == atan2(sqrt(a), sqrt(1 - a)) for 0 <= a <= 1
+        distances.append(diameter * asin(sqrt(min(a, 1.0))))
+    return distances
+
+
+class CityGridIndex:
+    """Grid index over city coordinates for radius lookups"""
+
+    def __init__(self, coordinates: dict, cell_degrees: float = CELL_DEGREES):
+        """
+        Args:
+            coordinates: Dict of city key -> (lat, lon) in degrees
+            cell_degrees: Grid cell size in degrees
+        """
+        self.cell_degrees = cell_degrees
+        self._coordinates = dict(coordinates)
+        self._cells = {}  # (row, col) -> ([city keys], [(lat_rad, lon_rad, cos_lat)])
+        for city, (lat, lon) in self._coordinates.items():
+            keys, points = self._cells.setdefault(self._cell(lat, lon), ([], []))
+            lat_rad = math.radians(lat)
+            keys.append(city)
+            points.append((lat_rad, math.radians(lon), math.cos(lat_rad)))
+
+    def _cell(self, lat, lon):
+        return (math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees))
+
+    def coordinates(self, city):
+        """(lat, lon) of a city key, or None"""
+        return self._coordinates.get(city)
+
+    def within(self, lat: float, lon: float, radius_km: float) -> dict:
+        """
+        Find the cities within radius_km of a point.
+
+        Args:
+            lat, lon: Center in degrees
+            radius_km: Search radius in kilometers
+
+        Returns:
+            Dict of city key -> distance in km (rounded to 0.01), nearest first
+        """
+        lat_span = radius_km / KM_PER_DEGREE_LAT
+        # Longitude degrees shrink towards the poles; use the widest latitude of the box
+        widest_cos = math.cos(math.radians(min(abs(lat) + lat_span, 89.9)))
+        lon_span = radius_km / (KM_PER_DEGREE_LAT * widest_cos)
+
+        min_row, min_col = self._cell(lat - lat_span, lon - lon_span)
+        max_row, max_col = self._cell(lat + lat_span, lon + lon_span)
+
+        keys, points = [], []
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                cell = self._cells.get((row, col))
+                if cell:
+                    keys.extend(cell[0])
+                    points.extend(cell[1])
+
+        matches = [
+            (distance, city)
+            for city, distance in zip(keys, haversine_distances(lat, lon, points))
+            if distance <= radius_km
+        ]
+        matches.sort()
+        return {city: round(distance, 2) for distance, city in matches}
+
+    def __len__(self):
+        return len(self._coordinates)
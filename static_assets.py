@@ -0,0 +1,144 @@
+# static_assets.py
+import hashlib
+import json
+import os
+import re
+import threading
+from flask import current_app, url_for
+from werkzeug.security import safe_join
+
+from compression import send_static
+
+
+# =============================================================================
+# FINGERPRINTED STATIC ASSETS
+# =============================================================================
+# Templates link static files through asset_url('css/styles.css'), which
+# returns /static/css/styles.<hash>.css, where <hash> is taken from the file
+# contents. A fingerprinted URL always names the same bytes, so it is served
+# with "Cache-Control: public, max-age=31536000, immutable": browsers load it
+# once and never revalidate, and a deploy that changes the file changes its
+# URL, so no stale copy is used.
+#
+# The hashes come from static/manifest.json, written by
+# scripts/build_static.py at deploy time. Files missing from the manifest (or
+# changed since it was written, as happens during development) are hashed on
+# first use and again whenever their modification time changes.
+#
+# Fingerprinted names only exist as URLs: the view strips the hash and sends
+# the file itself (or its precompressed sibling, see compression.py). A URL
+# with an outdated hash, from a page cached before a deploy, still gets the
+# current file, but without the immutable caching.
+
+MANIFEST_NAME = 'manifest.json'
+HASH_LENGTH = 12
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+_FINGERPRINT_PATTERN = re.compile(r'^(?P<stem>.+)\.(?P<hash>[0-9a-f]{%d})(?P<ext>\.[^./]+)$' % HASH_LENGTH)
+
+
+def file_hash(path) -> str:
+    """Content hash used in fingerprinted names"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def fingerprinted_name(filename: str, content_hash: str) -> str:
+    """css/styles.css -> css/styles.<hash>.css"""
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}.{content_hash}{ext}"
+
+
+class AssetManifest:
+    """Content hashes of the static files, keyed by path relative to the static folder"""
+
+    def __init__(self, static_folder):
+        self.static_folder = static_folder
+        self._lock = threading.Lock()
+        self._entries = {}  # filename -> (mtime, hash)
+        self._load()
+
+    def _load(self):
+        path = os.path.join(self.static_folder, MANIFEST_NAME)
+        try:
+            with open(path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return
+        for filename, entry in manifest.get('files', {}).items():
+            self._entries[filename] = (entry['mtime'], entry['hash'])
+        print(f"[STATIC] Loaded {len(self._entries)} asset hashes from {MANIFEST_NAME}")
+
+    def hash_of(self, filename):
+        """Current content hash of a static file, or None when it does not exist"""
+        # filename comes from the request URL: never leave the static folder
+        path = safe_join(self.static_folder, filename)
+        if path is None or not os.path.isfile(path):
+            return None
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+
+        entry = self._entries.get(filename)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+
+        content_hash = file_hash(path)
+        with self._lock:
+            self._entries[filename] = (mtime, content_hash)
+        return content_hash
+
+    def resolve(self, requested):
+        """
+        Map a requested static path to the file to send.
+
+        Returns:
+            Tuple (filename, immutable): immutable is True when the request
+            names the current fingerprint of the file
+        """
+        match = _FINGERPRINT_PATTERN.match(requested)
+        if match:
+            filename = match.group('stem') + match.group('ext')
+            content_hash = self.hash_of(filename)
+            if content_hash is not None:
+                return filename, content_hash == match.group('hash')
+        return requested, False
+
+
+def asset_url(filename: str) -> str:
+    """
+    URL of a static file with its content hash in the name (template global).
+
+    Args:
+        filename: Path relative to static/, e.g. 'css/styles.css'
+
+    Returns:
+        /static/css/styles.<hash>.css, or the plain static URL when the file
+        does not exist
+    """
+    content_hash = current_app.extensions['asset_manifest'].hash_of(filename)
+    if content_hash is None:
+        return url_for('static', filename=filename)
+    return url_for('static', filename=fingerprinted_name(filename, content_hash))
+
+
+def serve_static(filename):
+    """Static file view: fingerprinted paths are cached for a year, others revalidate"""
+    filename, immutable = current_app.extensions['asset_manifest'].resolve(filename)
+    if not immutable:
+        return send_static(filename)
+
+    response = send_static(filename, max_age=IMMUTABLE_MAX_AGE)
+    response.cache_control.immutable = True
+    return response
+
+
+def init_static_assets(app):
+    """Register the asset_url() template global and the fingerprint-aware static view"""
+    app.extensions['asset_manifest'] = AssetManifest(app.static_folder)
+    app.jinja_env.globals['asset_url'] = asset_url
+    app.view_functions['static'] = serve_static
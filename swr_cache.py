@@ -0,0 +1,107 @@
+# swr_cache.py
+import threading
+import time
+
+from singleflight import SingleFlight
+
+
+# =============================================================================
+# STALE-WHILE-REVALIDATE CACHE
+# =============================================================================
+# Results are kept per key with the time they were computed:
+# - younger than soft_ttl: served as is
+# - between soft_ttl and hard_ttl: still served immediately, while a
+#   background thread computes a fresh result (one refresh per key at a time)
+# - older than hard_ttl, or missing: computed by the caller (concurrent
+#   callers of the same key share one computation)
+# A failed background refresh keeps the old result, until hard_ttl.
+#
+# The entries live in a cache_backends.Cache, so workers can share them.
+# purge() invalidates the Cache, e.g. after a write that changes the results:
+# in every worker when the backend is shared. Results of computations that
+# started before the purge are never served.
+#
+# Cached values are shared between all callers: treat them as read-only.
+
+
+class StaleWhileRevalidateCache:
+    """Cache that refreshes stale entries in the background"""
+
+    def __init__(self, store, soft_ttl, hard_ttl, clock=time.time):
+        """
+        Args:
+            store: cache_backends.Cache holding the entries; its ttl should be
+                at least hard_ttl
+            soft_ttl: Age (seconds) from which entries are refreshed in the background
+            hard_ttl: Age (seconds) from which entries are no longer served
+            clock: Wall clock (entry ages are compared across processes)
+        """
+        self.name = store.name
+        self.store = store
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._refreshing = set()  # keys with a background refresh running in this process
+        self._flight = SingleFlight(store.name)
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def get(self, key, compute):
+        """
+        Return the cached value of key, computing it when needed.
+
+        Args:
+            key: Cache key (strings, numbers and tuples of them)
+            compute: Callable without arguments that returns the value (JSON types only)
+
+        Returns:
+            The cached or freshly computed value
+
+        Raises:
+            Whatever compute() raised, when the value had to be computed inline
+        """
+        generation = self.store.generation()
+        entry = self.store.get(key, generation)  # {'value': ..., 'computed_at': ...}
+        age = None if entry is None else self._clock() - entry['computed_at']
+        usable = age is not None and age < self.hard_ttl
+        refresh = False
+        with self._lock:
+            if usable and age < self.soft_ttl:
+                self.hits += 1
+                return entry['value']
+            if usable:
+                self.stale_hits += 1
+                refresh = key not in self._refreshing
+                self._refreshing.add(key)
+            else:
+                self.misses += 1
+
+        if refresh:
+            threading.Thread(target=self._refresh, args=(key, compute, generation),
+                             name=f"{self.name}-refresh", daemon=True).start()
+        if usable:
+            return entry['value']
+
+        return self._flight.do((key, generation), lambda: self._compute(key, compute, generation))
+
+    def _compute(self, key, compute, generation):
+        computed_at = self._clock()
+        value = compute()
+        # Stored under the generation read before computing: after a purge() it is never read
+        self.store.set(key, {'value': value, 'computed_at': computed_at}, generation)
+        return value
+
+    def _refresh(self, key, compute, generation):
+        try:
+            self._compute(key, compute, generation)
+        except Exception as e:
+            print(f"[SWR CACHE] {self.name}: refresh failed, serving the stale entry: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def purge(self) -> int:
+        """Drop every entry (and the results of computations still running); returns the new generation"""
+        return self.store.invalidate()
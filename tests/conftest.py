@@ -0,0 +1,12 @@
+# tests/conftest.py
+"""
+Unit tests for the modules that work without a database (caches, request
+coalescing, saved search matching, city suggestions).
+
+Usage (from the project root):
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,17 @@
+# tests/helpers.py
+import threading
+import time
+
+
+def wait_until(condition, timeout=5.0):
+    """Poll condition() until it is true; fails the test after timeout seconds"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the condition"
+        time.sleep(0.001)
+
+
+def start_thread(target, *args):
+    thread = threading.Thread(target=target, args=args, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,173 @@
+# tests/test_cache_backends.py
+import threading
+
+import pytest
+
+import cache_backends
+from cache_backends import Cache, MemoryBackend, RedisBackend, SQLiteBackend, TieredBackend
+from resilience import CircuitBreaker
+from scripts.resp_server import RESPHandler, RESPServer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FailingBackend:
+    """A shared backend that is down"""
+
+    shared = True
+
+    def __init__(self):
+        self.breaker = CircuitBreaker('cache test', failure_threshold=2)
+
+    def _fail(self, *args):
+        self.breaker.before_call()
+        self.breaker.record_failure()
+        raise ConnectionError("connection refused")
+
+    get = set = counter = incr = _fail
+
+
+@pytest.fixture
+def sqlite_path(tmp_path):
+    return str(tmp_path / 'cache.sqlite3')
+
+
+@pytest.fixture
+def redis_url():
+    server = RESPServer(('127.0.0.1', 0), RESPHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"redis://127.0.0.1:{server.server_address[1]}/0"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def always_check_generation(monkeypatch):
+    """Workers re-read the generation of a shared backend on every call"""
+    monkeypatch.setattr(cache_backends, 'INVALIDATION_CHECK_INTERVAL', 0)
+
+
+# ----- generation-based invalidation -----
+
+def test_invalidate_makes_every_entry_miss():
+    cache = Cache('test', MemoryBackend(10))
+    cache.set('a', {'value': 1})
+    assert cache.get('a') == {'value': 1}
+
+    assert cache.invalidate() == 1
+    assert cache.get('a') is None
+    assert cache.generation() == 1
+
+
+def test_value_computed_before_an_invalidation_is_never_read():
+    cache = Cache('test', MemoryBackend(10))
+    generation = cache.generation()
+    cache.invalidate()
+    # Stored under the generation read before computing
+    cache.set('a', 'outdated', generation)
+    assert cache.get('a') is None
+
+
+def test_none_is_not_cached():
+    cache = Cache('test', MemoryBackend(10))
+    cache.set('a', None)
+    assert len(cache.backend) == 0
+
+
+@pytest.mark.usefixtures('always_check_generation')
+def test_invalidation_reaches_the_other_workers(sqlite_path):
+    # Two workers: each its own connection and Cache object on the same database
+    worker_a = Cache('test', SQLiteBackend(sqlite_path))
+    worker_b = Cache('test', SQLiteBackend(sqlite_path))
+    worker_a.set(['key', 1], [1, 2, 3])
+    assert worker_b.get(['key', 1]) == [1, 2, 3]
+
+    worker_b.invalidate()
+    assert worker_a.get(['key', 1]) is None
+    assert worker_a.generation() == worker_b.generation() == 1
+
+
+def test_generation_of_a_shared_backend_is_polled(sqlite_path, monkeypatch):
+    worker_a = Cache('test', SQLiteBackend(sqlite_path))
+    worker_b = Cache('test', SQLiteBackend(sqlite_path))
+    assert worker_a.generation() == 0
+    worker_b.invalidate()
+    # Within INVALIDATION_CHECK_INTERVAL the generation read before is used
+    assert worker_a.generation() == 0
+    monkeypatch.setattr(cache_backends, 'INVALIDATION_CHECK_INTERVAL', 0)
+    assert worker_a.generation() == 1
+
+
+@pytest.mark.usefixtures('always_check_generation')
+def test_tiered_backend_invalidates_the_local_tier(sqlite_path):
+    worker_a = Cache('test', TieredBackend(MemoryBackend(10), SQLiteBackend(sqlite_path)))
+    worker_b = Cache('test', TieredBackend(MemoryBackend(10), SQLiteBackend(sqlite_path)))
+    worker_a.set('key', 'value')
+    assert worker_b.get('key') == 'value'  # now in worker_b's local tier as well
+
+    worker_a.invalidate()
+    assert worker_b.get('key') is None
+
+
+@pytest.mark.usefixtures('always_check_generation')
+def test_redis_backend_shares_entries_and_generation(redis_url):
+    worker_a = Cache('test', RedisBackend(redis_url))
+    worker_b = Cache('test', RedisBackend(redis_url))
+    worker_a.set('key', {'name': 'Liège', 'sizes': [1.5, 2]})
+    assert worker_b.get('key') == {'name': 'Liège', 'sizes': [1.5, 2]}
+
+    assert worker_b.invalidate() == 1
+    assert worker_a.get('key') is None
+
+
+# ----- expiry and eviction -----
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(2)
+    backend.set('a', 1)
+    backend.set('b', 2)
+    backend.get('a')
+    backend.set('c', 3)
+    assert (backend.get('a'), backend.get('b'), backend.get('c')) == (1, None, 3)
+
+
+def test_entries_expire_after_their_ttl(sqlite_path):
+    clock = FakeClock()
+    for backend in (MemoryBackend(10, clock=clock), SQLiteBackend(sqlite_path, clock=clock)):
+        backend.set('key', 'value', ttl=5)
+        clock.now += 4
+        assert backend.get('key') == 'value'
+        clock.now += 1
+        assert backend.get('key') is None
+
+
+def test_shared_backends_default_to_a_ttl(sqlite_path):
+    assert Cache('test', MemoryBackend(10)).ttl is None
+    assert Cache('test', SQLiteBackend(sqlite_path)).ttl == cache_backends.DEFAULT_TTL
+    assert Cache('test', SQLiteBackend(sqlite_path), ttl=30).ttl == 30
+
+
+# ----- failures -----
+
+def test_failing_backend_never_fails_the_caller():
+    cache = Cache('test', FailingBackend())
+    cache.set('key', 'value')
+    assert cache.get('key') is None
+    assert cache.generation() == 0
+    assert cache.invalidate() == 0
+
+
+def test_open_circuit_skips_the_backend():
+    backend = FailingBackend()
+    cache = Cache('test', backend)
+    cache.get('a')
+    cache.get('b')
+    assert backend.breaker.state == CircuitBreaker.OPEN
+    # Rejected by the breaker: still a miss, without an error
+    assert cache.get('c') is None
@@ -0,0 +1,69 @@
+# tests/test_city_suggest.py
+import pytest
+
+from belgian_cities import BELGIAN_CITIES
+from city_suggest import CitySuggestIndex, fold, max_typos, prefix_edit_distance
+
+
+@pytest.fixture(scope='module')
+def index():
+    return CitySuggestIndex(BELGIAN_CITIES)
+
+
+def cities(suggestions):
+    return [city for city, _ in suggestions]
+
+
+def test_fold_ignores_case_accents_and_separators():
+    assert fold("Liège") == fold("LIEGE") == "liege"
+    assert fold("Braine-l'Alleud") == "braine l alleud"
+    assert fold("  Sint -  Niklaas ") == "sint niklaas"
+
+
+def test_prefix_edit_distance():
+    assert prefix_edit_distance("kortr", "kortrijk", 1) == 0
+    assert prefix_edit_distance("kortrjik", "kortrijk", 2) == 1  # swapped letters
+    assert prefix_edit_distance("gnet", "gent", 1) == 1
+    assert prefix_edit_distance("brxsel", "brussel", 1) == 2  # stops above the limit
+
+
+def test_max_typos_grows_with_the_query():
+    assert [max_typos(length) for length in (3, 4, 5, 8, 9, 20)] == [1, 1, 2, 2, 3, 3]
+
+
+def test_prefix_suggestions(index):
+    assert index.suggest("liege") == [("liège", 'prefix')]
+    assert index.suggest("Heist op") == [("heist-op-den-berg", 'prefix')]
+    # Shorter names first
+    assert cities(index.suggest("ant")) == ["antoing", "anthisnes", "antwerpen"]
+
+
+def test_word_prefixes_rank_after_name_prefixes():
+    index = CitySuggestIndex(["sint-niklaas", "niel", "nieuwpoort"])
+    assert cities(index.suggest("ni")) == ["niel", "nieuwpoort", "sint-niklaas"]
+    assert index.suggest("niklaas") == [("sint-niklaas", 'prefix')]
+
+
+@pytest.mark.parametrize('query, city', [
+    ("kortrjik", "kortrijk"),    # swapped letters
+    ("antwrepen", "antwerpen"),
+    ("gnet", "gent"),            # typo in the first letters of a short name
+    ("lueven", "leuven"),
+    ("oostnede", "oostende"),
+    ("mechlen", "mechelen"),     # missing letter
+    ("dendermnd", "dendermonde"),  # unfinished: compared to a prefix of the name
+])
+def test_typos_suggest_the_intended_city_first(index, query, city):
+    suggestions = index.suggest(query)
+    assert suggestions[0] == (city, 'fuzzy')
+
+
+def test_no_suggestions_for_short_or_unrelated_queries(index):
+    assert index.suggest("zz") == []
+    assert index.suggest("xyzxyz") == []
+    assert index.suggest("") == []
+
+
+def test_limit(index):
+    assert len(index.suggest("sint", limit=3)) == 3
+    assert len(index.suggest("sint", limit=1000)) <= 20
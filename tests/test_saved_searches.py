@@ -0,0 +1,97 @@
+# tests/test_saved_searches.py
+import pytest
+
+from saved_searches import SavedSearchIndex
+
+
+def search(saved_search_id, **filters):
+    """A saved search in the format of load_saved_search_index() (filters of parse_listing_filters())"""
+    parsed = {'province': None, 'property_type': None, 'city_key': None,
+              'city_prefix': None, 'min_size': None, 'max_price': None,
+              'near_cities': None, 'search_terms': None}
+    parsed.update(filters)
+    return {'saved_search_id': saved_search_id, 'developer_id': 1, 'filters': parsed}
+
+
+def listing(**fields):
+    row = {'property_id': 1, 'province': 'Antwerpen', 'type': 'land', 'city_key': 'antwerpen',
+           'size': 500, 'price_min': 100000, 'property_name': 'Bouwgrond', 'description': ''}
+    row.update(fields)
+    return row
+
+
+def matched_ids(index, row):
+    return [match['saved_search_id'] for match in index.match(row)]
+
+
+@pytest.fixture
+def index():
+    index = SavedSearchIndex()
+    index.rebuild([
+        search(1),
+        search(2, min_size=500),
+        search(3, min_size=501),
+        search(4, max_price=100000),
+        search(5, max_price=99999),
+        search(6, min_size=100, max_price=200000),
+    ])
+    return index
+
+
+def test_size_and_price_intervals_include_their_bounds(index):
+    assert matched_ids(index, listing(size=500, price_min=100000)) == [1, 2, 4, 6]
+
+
+def test_listing_outside_the_intervals(index):
+    assert matched_ids(index, listing(size=50, price_min=250000)) == [1]
+    assert matched_ids(index, listing(size=10000, price_min=1)) == [1, 2, 3, 4, 5, 6]
+
+
+def test_missing_size_or_price_only_matches_searches_without_that_filter(index):
+    assert matched_ids(index, listing(size=None, price_min=None)) == [1]
+    assert matched_ids(index, listing(size=None, price_min=1)) == [1, 4, 5]
+    assert matched_ids(index, listing(size=1000, price_min=None)) == [1, 2, 3]
+
+
+def test_province_and_type_buckets():
+    index = SavedSearchIndex()
+    index.rebuild([
+        search(1, province='Antwerpen'),
+        search(2, property_type='land'),
+        search(3, province='Antwerpen', property_type='building'),
+        search(4, province='Limburg', property_type='land'),
+        search(5),
+    ])
+    assert matched_ids(index, listing(province='Antwerpen', type='land')) == [1, 2, 5]
+    assert matched_ids(index, listing(province='Antwerpen', type='building')) == [1, 3, 5]
+    assert matched_ids(index, listing(province='Limburg', type='land')) == [2, 4, 5]
+
+
+def test_city_radius_and_search_terms():
+    index = SavedSearchIndex()
+    index.rebuild([
+        search(1, city_key='antwerpen'),
+        search(2, city_prefix='sint-'),
+        search(3, near_cities={'antwerpen': 0.0, 'mortsel': 4.2}),
+        search(4, search_terms=('bouwgrond',)),
+        search(5, search_terms=('bouwgrond', 'tuin')),
+    ])
+    assert matched_ids(index, listing(city_key='antwerpen')) == [1, 3, 4]
+    assert matched_ids(index, listing(city_key='sint-niklaas', description='Met tuin')) == [2, 4, 5]
+    assert matched_ids(index, listing(city_key='mortsel', property_name='Woning')) == [3]
+
+
+def test_add_replace_and_remove(index):
+    row = listing(size=50, price_min=250000)
+    index.add(search(7, min_size=10))
+    assert matched_ids(index, row) == [1, 7]
+
+    # Same id: the new filters replace the old ones
+    index.add(search(7, min_size=100))
+    assert matched_ids(index, row) == [1]
+    assert len(index) == 7
+
+    assert index.remove(1) is True
+    assert index.remove(1) is False
+    assert matched_ids(index, row) == []
+    assert index.max_id == 7
@@ -0,0 +1,93 @@
+# tests/test_singleflight.py
+import threading
+
+import pytest
+
+from helpers import start_thread, wait_until
+from singleflight import SingleFlight
+
+
+def run_callers(flight, key, function, callers):
+    """
+    Call flight.do(key, function) from several threads, the first one
+    leading. function must block until the test releases it.
+
+    Returns:
+        (threads, outcomes): outcomes gets ('result', value) or ('error', exception) per caller
+    """
+    outcomes = []
+
+    def call():
+        try:
+            outcomes.append(('result', flight.do(key, function)))
+        except Exception as e:
+            outcomes.append(('error', e))
+
+    threads = [start_thread(call)]
+    wait_until(lambda: flight.in_flight() == 1)
+    threads += [start_thread(call) for _ in range(callers - 1)]
+    wait_until(lambda: flight.shared == callers - 1)
+    return threads, outcomes
+
+
+def test_concurrent_callers_share_one_run():
+    flight = SingleFlight('test')
+    release = threading.Event()
+    runs = []
+
+    def work():
+        runs.append(1)
+        release.wait()
+        return {'value': 42}
+
+    threads, outcomes = run_callers(flight, 'key', work, callers=5)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(runs) == 1
+    assert len(outcomes) == 5
+    # Every caller gets the very same object
+    assert all(kind == 'result' and value is outcomes[0][1] for kind, value in outcomes)
+    assert flight.in_flight() == 0
+
+
+def test_error_is_shared_with_waiting_callers():
+    shared_errors = []
+    flight = SingleFlight('test', on_shared_error=shared_errors.append)
+    release = threading.Event()
+    error = ConnectionError("database down")
+
+    def work():
+        release.wait()
+        raise error
+
+    threads, outcomes = run_callers(flight, 'key', work, callers=3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert outcomes == [('error', error)] * 3
+    # Called in the waiting callers only, not in the one that ran it
+    assert shared_errors == [error, error]
+    assert flight.in_flight() == 0
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight('test')
+    assert flight.do('a', lambda: 1) == 1
+    assert flight.do('b', lambda: 2) == 2
+    assert flight.shared == 0
+
+
+def test_finished_runs_are_not_remembered():
+    flight = SingleFlight('test')
+    runs = []
+    for _ in range(2):
+        flight.do('key', lambda: runs.append(1))
+    assert len(runs) == 2
+
+    with pytest.raises(ValueError):
+        flight.do('key', lambda: int('x'))
+    # The failed run is not remembered either
+    assert flight.do('key', lambda: 'ok') == 'ok'
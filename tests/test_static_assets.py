@@ -0,0 +1,69 @@
+# tests/test_static_assets.py
+import pytest
+from flask import Flask
+
+import static_assets
+from static_assets import AssetManifest, file_hash, fingerprinted_name, init_static_assets
+
+
+@pytest.fixture
+def static_folder(tmp_path):
+    folder = tmp_path / 'static'
+    (folder / 'css').mkdir(parents=True)
+    (folder / 'css' / 'styles.css').write_text("body { color: black; }")
+    (tmp_path / 'secret.txt').write_text("not a static file")
+    return folder
+
+
+@pytest.fixture
+def client(static_folder):
+    app = Flask(__name__, static_folder=str(static_folder))
+    init_static_assets(app)
+    return app.test_client()
+
+
+@pytest.fixture
+def hashed_paths(monkeypatch):
+    """Paths passed to file_hash()"""
+    paths = []
+
+    def recording_file_hash(path):
+        paths.append(str(path))
+        return file_hash(path)
+    monkeypatch.setattr(static_assets, 'file_hash', recording_file_hash)
+    return paths
+
+
+def test_current_fingerprint_is_immutable(client, static_folder):
+    content_hash = file_hash(static_folder / 'css' / 'styles.css')
+    response = client.get('/static/' + fingerprinted_name('css/styles.css', content_hash))
+    assert response.status_code == 200
+    assert response.cache_control.immutable
+    response.close()
+
+
+def test_outdated_fingerprint_gets_the_current_file(client):
+    response = client.get('/static/css/styles.000000000000.css')
+    assert response.status_code == 200
+    assert not response.cache_control.immutable
+    assert response.data == b"body { color: black; }"
+    response.close()
+
+
+@pytest.mark.parametrize('url', [
+    '/static/../secret.aaaaaaaaaaaa.txt',
+    '/static/css/../../secret.aaaaaaaaaaaa.txt',
+    '/static/%2E%2E/secret.aaaaaaaaaaaa.txt',
+])
+def test_fingerprinted_url_outside_the_static_folder_is_never_read(client, hashed_paths, url):
+    assert client.get(url).status_code == 404
+    assert hashed_paths == []
+
+
+def test_hash_of_stays_inside_the_static_folder(static_folder, hashed_paths):
+    manifest = AssetManifest(str(static_folder))
+    assert manifest.hash_of('../secret.txt') is None
+    assert manifest.hash_of(str(static_folder.parent / 'secret.txt')) is None
+    assert manifest.hash_of('css') is None  # a directory
+    assert hashed_paths == []
+    assert manifest.hash_of('css/styles.css') is not None
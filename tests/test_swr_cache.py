@@ -0,0 +1,123 @@
+# tests/test_swr_cache.py
+import threading
+
+import pytest
+
+from cache_backends import Cache, MemoryBackend
+from helpers import start_thread, wait_until
+from swr_cache import StaleWhileRevalidateCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return StaleWhileRevalidateCache(Cache('test', MemoryBackend(100)), soft_ttl=10, hard_ttl=60, clock=clock)
+
+
+def counter():
+    """compute function returning 1, 2, 3, ... on successive calls"""
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+    return compute
+
+
+def wait_for_refreshes(cache):
+    wait_until(lambda: not cache._refreshing)
+
+
+def test_fresh_entries_are_served_without_computing(cache, clock):
+    compute = counter()
+    assert cache.get('key', compute) == 1
+    clock.now += 9
+    assert cache.get('key', compute) == 1
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+def test_stale_entry_is_served_while_refreshing(cache, clock):
+    compute = counter()
+    cache.get('key', compute)
+    clock.now += 30
+
+    assert cache.get('key', compute) == 1
+    wait_for_refreshes(cache)
+    assert cache.stale_hits == 1
+    assert cache.get('key', compute) == 2
+
+
+def test_expired_entry_is_computed_inline(cache, clock):
+    compute = counter()
+    cache.get('key', compute)
+    clock.now += 61
+    assert cache.get('key', compute) == 2
+    assert cache.misses == 2
+
+
+def test_failed_refresh_keeps_the_stale_entry(cache, clock):
+    cache.get('key', lambda: 'old')
+    clock.now += 30
+
+    def fail():
+        raise ConnectionError("database down")
+
+    assert cache.get('key', fail) == 'old'
+    wait_for_refreshes(cache)
+    assert cache.get('key', fail) == 'old'
+
+
+def test_purge_drops_every_entry(cache):
+    compute = counter()
+    cache.get('a', compute)
+    cache.get('b', compute)
+    cache.purge()
+    assert cache.get('a', compute) == 3
+    assert cache.get('b', compute) == 4
+
+
+def test_result_computed_before_a_purge_is_not_served(cache):
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait()
+        return 'computed before the write'
+
+    thread = start_thread(cache.get, 'key', slow)
+    started.wait()
+    # A write changes the results while the query runs
+    cache.purge()
+    release.set()
+    thread.join()
+
+    assert cache.get('key', lambda: 'computed after the write') == 'computed after the write'
+
+
+def test_concurrent_misses_share_one_computation(cache):
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait()
+        return 'value'
+
+    threads = [start_thread(cache.get, 'key', slow) for _ in range(4)]
+    wait_until(lambda: cache._flight.shared == 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
@@ -0,0 +1,74 @@
+# text_search.py
+import math
+import re
+
+
+# =============================================================================
+# LISTING TEXT SEARCH
+# =============================================================================
+# Tokenizing and ranking for the q parameter of /api/properties.
+#
+# In Postgres the search runs on the search_vector(Property) function of
+# migrations/0005_property_search.sql ('simple' configuration: lowercased
+# words, no stemming or stop words). The in-memory ListingIndex keeps an
+# inverted index (term -> property ids) built with tokenize() below, which
+# splits text the same way, so both paths match the same listings. (The
+# Postgres parser also keeps hyphenated words, e-mail addresses and URLs as
+# whole tokens, so a query like "bar-baz" can match a little more here.)
+#
+# Matching is AND: a listing matches when it contains every query term in its
+# name or description. Ranking happens in Python for both paths (rank()),
+# so the order does not depend on where the rows came from.
+
+# Same relative weights as ts_rank for the A (name) and B (description) labels
+NAME_WEIGHT = 1.0
+DESCRIPTION_WEIGHT = 0.4
+
+SEARCH_CONFIG = 'simple'
+
+_WORD_PATTERN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text) -> list:
+    """Lowercase words (letters and digits) of a text, in order"""
+    if not text:
+        return []
+    return _WORD_PATTERN.findall(str(text).lower())
+
+
+def query_terms(query: str) -> tuple:
+    """Distinct search terms of a q parameter, in order (empty tuple for no terms)"""
+    return tuple(dict.fromkeys(tokenize(query)))
+
+
+def listing_terms(row: dict) -> frozenset:
+    """All terms a listing can be found by (name and description)"""
+    return frozenset(tokenize(row.get('property_name'))) | frozenset(tokenize(row.get('description')))
+
+
+def rank(terms, row: dict) -> float:
+    """
+    Relevance of a listing for the search terms.
+
+    Every occurrence of a term counts NAME_WEIGHT in the name and
+    DESCRIPTION_WEIGHT in the description; the sum is divided by
+    1 + log(number of words), like ts_rank with normalization 1, so a short
+    listing that is about the terms ranks above a long one mentioning them.
+
+    Args:
+        terms: Search terms from query_terms()
+        row: Property row
+
+    Returns:
+        Score (higher is more relevant), 0.0 when no term occurs
+    """
+    name_tokens = tokenize(row.get('property_name'))
+    description_tokens = tokenize(row.get('description'))
+    length = len(name_tokens) + len(description_tokens)
+    if not length:
+        return 0.0
+
+    score = 0.0
+    for term in terms:
+        score += NAME_WEIGHT * name_tokens.count(term) + DESCRIPTION_WEIGHT * description_tokens.count(term)
+    return score / (1 + math.log(length))